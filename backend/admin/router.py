@@ -1,8 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 
 from backend.config import get_settings
+from backend.conversations.archive import archive_conversations, archive_stats, train_dictionary
+from backend.db.snapshots import last_snapshot, write_snapshot
+from backend.integrations.model_residency import (
+    configured_models,
+    evict_model,
+    load_stats,
+    resident_models,
+    warm_model,
+)
+from backend.integrations.model_tiers import all_tiers
 from backend.status.router import metrics
 from backend.status.router import get_uptime_seconds
 
@@ -10,6 +21,14 @@ from backend.status.router import get_uptime_seconds
 router = APIRouter(prefix="/v1/admin", tags=["admin"])
 
 
+class ModelAction(BaseModel):
+    model: str = Field(..., min_length=1)
+
+
+class ArchiveRequest(BaseModel):
+    older_than_days: int | None = Field(default=None, ge=0)
+
+
 @router.get("/info")
 def info() -> dict:
     settings = get_settings()
@@ -19,7 +38,70 @@ def info() -> dict:
         "env": settings.app_env,
         "uptime_seconds": uptime_seconds,
         "ollama_model": settings.ollama_model,
+        "model_tiers": {
+            name: {"model": tier.model, "options": tier.options}
+            for name, tier in sorted(all_tiers().items())
+        },
         "cors_origins": settings.cors_origins,
         "api_key_configured": bool(settings.api_key),
         "admin_api_key_configured": bool(settings.admin_api_key),
     }
+
+
+@router.get("/models")
+def models() -> dict:
+    return {
+        "configured": configured_models(),
+        "resident": resident_models(),
+        "load_stats": load_stats(),
+    }
+
+
+@router.post("/models/warm")
+def warm(request: ModelAction) -> dict:
+    return {"model": request.model, "nodes": warm_model(request.model)}
+
+
+@router.post("/models/evict")
+def evict(request: ModelAction) -> dict:
+    return {"model": request.model, "nodes": evict_model(request.model)}
+
+
+@router.post("/archive/train")
+def archive_train() -> dict:
+    dictionary = train_dictionary()
+    return {
+        "id": dictionary.id,
+        "owner": dictionary.owner,
+        "size": len(dictionary.zdict),
+        "sample_bytes": dictionary.sample_bytes,
+        "trained_at": dictionary.trained_at,
+    }
+
+
+@router.post("/archive/run")
+def archive_run(request: ArchiveRequest) -> dict:
+    return archive_conversations(request.older_than_days).__dict__
+
+
+@router.get("/archive/stats")
+def archive_storage() -> dict:
+    return archive_stats()
+
+
+@router.post("/snapshot")
+def snapshot_now() -> dict:
+    if not get_settings().snapshot_dir:
+        raise HTTPException(status_code=409, detail="SNAPSHOT_DIR is not configured")
+    return write_snapshot().__dict__
+
+
+@router.get("/snapshot")
+def snapshot_status() -> dict:
+    settings = get_settings()
+    last = last_snapshot()
+    return {
+        "enabled": bool(settings.snapshot_dir),
+        "interval_seconds": settings.snapshot_interval_seconds,
+        "last": last.__dict__ if last else None,
+    }
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+from backend.agents import metrics
+
 
 @dataclass
 class AgentResult:
@@ -16,6 +20,47 @@ class BaseAgent:
     name: str = "base"
     description: str = ""
     handles: List[str] = []
+    # Overrides AGENT_TIMEOUT_SECONDS for this agent when set.
+    timeout_seconds: float | None = None
 
     def run(self, payload: Dict[str, Any]) -> AgentResult:
         raise NotImplementedError()
+
+    async def arun(self, payload: Dict[str, Any]) -> AgentResult:
+        """Async entry point; the default runs the sync run() in an executor.
+
+        Agents doing their own I/O should override this with a native
+        coroutine so that cancellation actually stops the work. For the
+        executor adapter a cancelled call stops being awaited, but the worker
+        thread finishes run() in the background.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, payload)
+
+
+async def run_agent(
+    agent: BaseAgent, payload: Dict[str, Any], timeout: float | None
+) -> AgentResult:
+    """Await agent.arun with a deadline, recording per-agent counters.
+
+    Raises asyncio.TimeoutError when the deadline passes.
+    """
+    prefix = f"agents.{agent.name}"
+    metrics.incr(f"{prefix}.calls")
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(agent.arun(payload), timeout)
+    except asyncio.TimeoutError:
+        metrics.incr(f"{prefix}.timeouts")
+        raise
+    except asyncio.CancelledError:
+        metrics.incr(f"{prefix}.cancelled")
+        raise
+    except Exception:
+        metrics.incr(f"{prefix}.errors")
+        raise
+    finally:
+        metrics.incr(f"{prefix}.latency_ms_total", int((time.perf_counter() - started) * 1000))
+
+    metrics.incr(f"{prefix}.status.{result.status}")
+    return result
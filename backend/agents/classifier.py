@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+import re
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from backend.agents.base import BaseAgent
+from backend.audit.store import list_events
+
+
+ROUTE_EVENT_TYPE = "agent.route"
+# Only the newest routing events are used as training data.
+TRAINING_EVENT_LIMIT = 500
+RETRAIN_SECONDS = 300.0
+
+_HANDLE_WEIGHT = 3.0
+_DESCRIPTION_WEIGHT = 1.0
+_HISTORY_WEIGHT = 1.0
+_SMOOTHING = 0.1
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+class AgentClassifier:
+    """Multinomial naive Bayes over query words, one class per agent."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, Dict[str, float]] = {}
+        self._totals: Dict[str, float] = {}
+        self._vocab: set[str] = set()
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self._counts)
+
+    def fit(self, examples: Iterable[Tuple[str, str, float]]) -> "AgentClassifier":
+        for label, text, weight in examples:
+            counts = self._counts.setdefault(label, {})
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0.0) + weight
+                self._totals[label] = self._totals.get(label, 0.0) + weight
+                self._vocab.add(token)
+        return self
+
+    def predict(self, text: str) -> Tuple[str | None, float]:
+        """Return the most likely agent and its posterior probability.
+
+        Words never seen in training carry no evidence and are skipped; a
+        query with no known words yields (None, 0.0).
+        """
+        ranked = self.rank(text)
+        if not ranked:
+            return None, 0.0
+        return ranked[0]
+
+    def rank(self, text: str) -> List[Tuple[str, float]]:
+        """All agents with their posterior probability, most likely first."""
+        tokens = [token for token in tokenize(text) if token in self._vocab]
+        if not tokens or not self._counts:
+            return []
+
+        vocab_size = len(self._vocab)
+        scores: Dict[str, float] = {}
+        for label, counts in self._counts.items():
+            denominator = self._totals.get(label, 0.0) + _SMOOTHING * vocab_size
+            scores[label] = sum(
+                math.log((counts.get(token, 0.0) + _SMOOTHING) / denominator)
+                for token in tokens
+            )
+
+        top = max(scores.values())
+        weights = {label: math.exp(score - top) for label, score in scores.items()}
+        norm = sum(weights.values())
+        return sorted(
+            ((label, weight / norm) for label, weight in weights.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+def training_examples(
+    agents: Sequence[BaseAgent], events: Iterable[object]
+) -> List[Tuple[str, str, float]]:
+    names = {agent.name for agent in agents}
+    examples: List[Tuple[str, str, float]] = []
+    for agent in agents:
+        examples.append((agent.name, agent.name, _HANDLE_WEIGHT))
+        for handle in agent.handles:
+            examples.append((agent.name, handle, _HANDLE_WEIGHT))
+        examples.append((agent.name, agent.description, _DESCRIPTION_WEIGHT))
+
+    for event in events:
+        meta = getattr(event, "meta", {}) or {}
+        if meta.get("decision_source") != "llm":
+            continue
+        label = meta.get("agent")
+        query = meta.get("query")
+        if label in names and isinstance(query, str):
+            examples.append((label, query, _HISTORY_WEIGHT))
+    return examples
+
+
+_CLASSIFIER: AgentClassifier | None = None
+_TRAINED_AT = 0.0
+_LOCK = Lock()
+
+
+def get_classifier(agents: Sequence[BaseAgent]) -> AgentClassifier:
+    """Return the cached classifier, retraining from the audit log when stale."""
+    global _CLASSIFIER, _TRAINED_AT
+    with _LOCK:
+        if _CLASSIFIER is not None and time.monotonic() - _TRAINED_AT < RETRAIN_SECONDS:
+            return _CLASSIFIER
+
+        try:
+            events = list_events(limit=TRAINING_EVENT_LIMIT, event_type=ROUTE_EVENT_TYPE)
+        except Exception:
+            events = []
+        _CLASSIFIER = AgentClassifier().fit(training_examples(agents, events))
+        _TRAINED_AT = time.monotonic()
+        return _CLASSIFIER
+
+
+def reset_classifier() -> None:
+    global _CLASSIFIER
+    with _LOCK:
+        _CLASSIFIER = None
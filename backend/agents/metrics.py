@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import Dict
+
+
+_COUNTERS: Dict[str, int] = {}
+_LOCK = Lock()
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + amount
+
+
+def snapshot() -> Dict[str, int]:
+    with _LOCK:
+        return dict(_COUNTERS)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import Dict, Iterable, List
+
+from backend.agents.base import BaseAgent
+from backend.agents.email_agent import EmailAgent
+from backend.agents.finance_agent import FinanceAgent
+from backend.agents.health_agent import HealthAgent
+from backend.agents.schedule_agent import ScheduleAgent
+
+
+ENTRY_POINT_GROUP = "personal_ai.agents"
+
+
+class _HandleAutomaton:
+    """Aho-Corasick automaton over all handles.
+
+    Each state keeps the best (lowest) agent rank among the handles ending
+    there or at any of its suffix states, so a query is matched in one pass
+    over its characters no matter how many handles exist.
+    """
+
+    def __init__(self, handles: Dict[str, int]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._best: List[int | None] = [None]
+        for handle, rank in handles.items():
+            state = 0
+            for char in handle:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._best.append(None)
+                    self._goto[state][char] = nxt
+                state = nxt
+            if self._best[state] is None or rank < self._best[state]:
+                self._best[state] = rank
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                inherited = self._best[self._fail[nxt]]
+                if inherited is not None and (
+                    self._best[nxt] is None or inherited < self._best[nxt]
+                ):
+                    self._best[nxt] = inherited
+
+    def best_rank(self, text: str) -> int | None:
+        goto, fail, best_at = self._goto, self._fail, self._best
+        state = 0
+        best: int | None = None
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            rank = best_at[state]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+                if best == 0:
+                    break
+        return best
+
+
+class AgentRegistry:
+    """Agents indexed by name/handle, plus one compiled matcher for free text.
+
+    Exact task_type lookups are a dict hit. Free-text queries run through an
+    Aho-Corasick automaton built from every handle, so the cost depends on
+    the query length rather than on how many agents or handles are
+    registered. When several agents match, the one registered first wins, as
+    with the old linear scan.
+    """
+
+    def __init__(self, agents: Iterable[BaseAgent] = ()) -> None:
+        self._agents: List[BaseAgent] = []
+        self._by_name: Dict[str, BaseAgent] = {}
+        self._by_handle: Dict[str, BaseAgent] = {}
+        self._automaton: _HandleAutomaton | None = None
+        for agent in agents:
+            self.register(agent)
+
+    @property
+    def agents(self) -> List[BaseAgent]:
+        return list(self._agents)
+
+    def register(self, agent: BaseAgent) -> None:
+        if agent.name in self._by_name:
+            return
+        self._agents.append(agent)
+        self._by_name[agent.name] = agent
+        for handle in agent.handles:
+            self._by_handle.setdefault(handle.lower(), agent)
+        self._automaton = None
+
+    def get(self, name: str) -> BaseAgent | None:
+        return self._by_name.get(name)
+
+    def for_task_type(self, task_type: str) -> BaseAgent | None:
+        return self._by_handle.get(task_type.lower())
+
+    def match(self, query: str) -> BaseAgent | None:
+        if self._automaton is None:
+            self._automaton = self._build_automaton()
+        rank = self._automaton.best_rank(query.lower())
+        return None if rank is None else self._agents[rank]
+
+    def _build_automaton(self) -> _HandleAutomaton:
+        ranks: Dict[str, int] = {}
+        for rank, agent in enumerate(self._agents):
+            for handle in agent.handles:
+                ranks.setdefault(handle.lower(), rank)
+        return _HandleAutomaton(ranks)
+
+
+def _discover_plugins() -> List[BaseAgent]:
+    plugins: List[BaseAgent] = []
+    for entry in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry.load()
+            agent = loaded() if isinstance(loaded, type) else loaded
+        except Exception:
+            continue
+        if isinstance(agent, BaseAgent):
+            plugins.append(agent)
+    return plugins
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> AgentRegistry:
+    return AgentRegistry(
+        [
+            ScheduleAgent(),
+            EmailAgent(),
+            HealthAgent(),
+            FinanceAgent(),
+            *_discover_plugins(),
+        ]
+    )
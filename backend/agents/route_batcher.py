@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Callable, List, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.agents import metrics
+
+
+_LINE_RE = re.compile(r"^\s*(\d+)\s*[:.)-]\s*([A-Za-z_]+)")
+
+
+def build_batch_prompt(agent_names: Sequence[str], queries: Sequence[str]) -> Tuple[str, str]:
+    """Return (system, user) texts asking for one agent name per numbered task."""
+    system_text = (
+        "You route user tasks to the correct agent. "
+        f"Valid agent names: {', '.join(agent_names)}. "
+        "For each numbered task reply with one line in the form '<number>: <agent name>' "
+        "and nothing else."
+    )
+    user_text = "\n".join(f"{index}. {query}" for index, query in enumerate(queries, start=1))
+    return system_text, user_text
+
+
+def parse_batch_reply(reply: str, count: int, agent_names: Sequence[str]) -> List[str | None]:
+    """Map numbered reply lines back to items; unknown or missing items are None."""
+    valid = {name.lower() for name in agent_names}
+    picks: List[str | None] = [None] * count
+    for line in reply.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        index = int(match.group(1)) - 1
+        name = match.group(2).lower()
+        if 0 <= index < count and name in valid and picks[index] is None:
+            picks[index] = name
+    return picks
+
+
+class RoutingBatcher:
+    """Collects routing queries for a short window and resolves them together.
+
+    route_many sends all queued queries in one LLM call and returns one
+    agent name (or None) per query. Items it could not answer fall back to
+    route_one, one call each. Both run in the thread pool.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_batch: int,
+        route_many: Callable[[List[str]], List[str | None]],
+        route_one: Callable[[str], str | None],
+    ) -> None:
+        self._window = window_seconds
+        self._max_batch = max(1, max_batch)
+        self._route_many = route_many
+        self._route_one = route_one
+        self._queue: List[Tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.loop = asyncio.get_running_loop()
+
+    async def pick(self, query: str) -> str | None:
+        future: asyncio.Future = self.loop.create_future()
+        self._queue.append((query, future))
+        if len(self._queue) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self.loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if batch:
+            self.loop.create_task(self._resolve(batch))
+
+    async def _resolve(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        queries = [query for query, _ in batch]
+        try:
+            if len(batch) == 1:
+                picks = [await run_in_threadpool(self._route_one, queries[0])]
+            else:
+                metrics.incr("routing.llm_batches")
+                metrics.incr("routing.llm_batched_queries", len(batch))
+                try:
+                    picks = await run_in_threadpool(self._route_many, queries)
+                except Exception:
+                    picks = [None] * len(batch)
+                missing = [index for index, pick in enumerate(picks) if pick is None]
+                if missing:
+                    metrics.incr("routing.llm_batch_fallbacks", len(missing))
+                    singles = await asyncio.gather(
+                        *(run_in_threadpool(self._route_one, queries[index]) for index in missing),
+                        return_exceptions=True,
+                    )
+                    for index, single in zip(missing, singles):
+                        picks[index] = None if isinstance(single, BaseException) else single
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), pick in zip(batch, picks):
+            if not future.done():
+                future.set_result(pick)
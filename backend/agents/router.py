@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
 from typing import Any, Dict, List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from backend.agents.base import AgentResult, BaseAgent
-from backend.agents.email_agent import EmailAgent
-from backend.agents.finance_agent import FinanceAgent
-from backend.agents.health_agent import HealthAgent
-from backend.agents.schedule_agent import ScheduleAgent
+from backend.agents import metrics
+from backend.agents.base import AgentResult, BaseAgent, run_agent
+from backend.agents.classifier import ROUTE_EVENT_TYPE, get_classifier
+from backend.agents.registry import get_registry
+from backend.agents.route_batcher import RoutingBatcher, build_batch_prompt, parse_batch_reply
+from backend.agents.workflow import WorkflowStep, run_workflow
+from backend.audit.store import log_event
+from backend.config import get_settings
+from backend.integrations.model_tiers import ROUTER
 from backend.integrations.ollama_client import OllamaMessage, chat_ollama
 
 
+logger = logging.getLogger(__name__)
+
+
 class AgentRequest(BaseModel):
     task_type: str = Field(..., description="High-level task category")
     payload: Dict[str, Any] = Field(default_factory=dict)
@@ -25,10 +40,65 @@ class AgentResponse(BaseModel):
     data: Dict[str, Any]
 
 
+class AgentBatchRequest(BaseModel):
+    requests: List[AgentRequest] = Field(..., min_length=1)
+    item_timeout_seconds: float = Field(default=5.0, gt=0, le=60)
+
+
+class AgentBatchItem(BaseModel):
+    index: int
+    status: str
+    result: AgentResponse | None = None
+    error: str | None = None
+
+
+class AgentBatchResponse(BaseModel):
+    results: List[AgentBatchItem]
+    succeeded: int
+    failed: int
+    elapsed_ms: float
+
+
+class WorkflowStepRequest(BaseModel):
+    id: str = Field(..., min_length=1)
+    task_type: str = Field(..., description="Agent name or handle")
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list)
+    inputs: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Payload key -> '<step_id>.<summary|status|data.key>'",
+    )
+
+
+class WorkflowRequest(BaseModel):
+    steps: List[WorkflowStepRequest] = Field(..., min_length=1)
+    timeout_seconds: float | None = Field(default=None, gt=0, le=120)
+    use_cache: bool = True
+
+
+class WorkflowStepResponse(BaseModel):
+    id: str
+    agent: str
+    status: str
+    result: AgentResponse | None = None
+    cached: bool
+    elapsed_ms: float
+    error: str | None = None
+
+
+class WorkflowResponse(BaseModel):
+    status: str
+    steps: List[WorkflowStepResponse]
+    elapsed_ms: float
+
+
 class AutoRouteRequest(BaseModel):
     query: str = Field(..., min_length=3)
     payload: Dict[str, Any] = Field(default_factory=dict)
     prefer_llm: bool = True
+    fan_out: int = Field(default=1, ge=1, le=8)
+    latency_budget_ms: int | None = Field(default=None, ge=0, le=120_000)
+    timeout_seconds: float | None = Field(default=None, gt=0, le=120)
 
 
 class AutoRouteResponse(BaseModel):
@@ -37,17 +107,14 @@ class AutoRouteResponse(BaseModel):
     summary: str
     data: Dict[str, Any]
     decision_source: str
+    confidence: float = 0.0
 
 
 router = APIRouter(prefix="/v1/agents", tags=["agents"])
 
 
-AGENTS: List[BaseAgent] = [
-    ScheduleAgent(),
-    EmailAgent(),
-    HealthAgent(),
-    FinanceAgent(),
-]
+REGISTRY = get_registry()
+AGENTS: List[BaseAgent] = REGISTRY.agents
 
 
 @router.get("/list")
@@ -62,13 +129,21 @@ def list_agents() -> List[Dict[str, Any]]:
     ]
 
 
+@lru_cache(maxsize=1)
+def _batch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=get_settings().agent_batch_workers,
+        thread_name_prefix="agent-batch",
+    )
+
+
 @router.post("/route", response_model=AgentResponse)
 def route_agent(request: AgentRequest) -> AgentResponse:
     task_type = request.task_type.lower()
-    for agent in AGENTS:
-        if task_type in agent.handles:
-            result: AgentResult = agent.run(request.payload)
-            return AgentResponse(**result.__dict__)
+    agent = REGISTRY.for_task_type(task_type)
+    if agent:
+        result: AgentResult = agent.run(request.payload)
+        return AgentResponse(**result.__dict__)
 
     return AgentResponse(
         agent="router",
@@ -78,39 +153,391 @@ def route_agent(request: AgentRequest) -> AgentResponse:
     )
 
 
+class _BatchSlot:
+    """When a batch item started running on the shared pool."""
+
+    __slots__ = ("started", "began")
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.began = 0.0
+
+
+def _run_batch_item(slot: _BatchSlot, item: AgentRequest) -> AgentResponse:
+    slot.began = time.monotonic()
+    slot.started.set()
+    return route_agent(item)
+
+
+@router.post("/batch", response_model=AgentBatchResponse)
+def batch_route(request: AgentBatchRequest) -> AgentBatchResponse:
+    """Run many /route payloads concurrently and return results in order.
+
+    Items run on a shared bounded pool, and each item's timeout counts from
+    the moment a worker picks it up. Waiting in the queue is bounded
+    separately: an item still queued after ceil(items / workers) *
+    item_timeout_seconds is cancelled. Sync agents cannot be interrupted: a
+    timed-out item keeps its worker until it returns, but the batch answers
+    without it.
+    """
+    settings = get_settings()
+    if len(request.requests) > settings.agent_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.agent_batch_max_items} items",
+        )
+
+    pool = _batch_pool()
+    timeout = request.item_timeout_seconds
+    start = time.monotonic()
+    waves = -(-len(request.requests) // settings.agent_batch_workers)
+    queue_deadline = start + timeout * waves
+    slots = [_BatchSlot() for _ in request.requests]
+    futures = [
+        pool.submit(_run_batch_item, slot, item)
+        for slot, item in zip(slots, request.requests)
+    ]
+
+    results: List[AgentBatchItem] = []
+    for index, (slot, future) in enumerate(zip(slots, futures)):
+        if not slot.started.wait(timeout=max(0.0, queue_deadline - time.monotonic())):
+            if future.cancel():
+                results.append(
+                    AgentBatchItem(index=index, status="timeout", error="Agent did not start in time")
+                )
+                continue
+            slot.started.wait()
+        try:
+            response = future.result(timeout=max(0.0, slot.began + timeout - time.monotonic()))
+            results.append(
+                AgentBatchItem(index=index, status=response.status, result=response)
+            )
+        except FutureTimeout:
+            results.append(
+                AgentBatchItem(index=index, status="timeout", error="Agent timed out")
+            )
+        except Exception as exc:
+            results.append(AgentBatchItem(index=index, status="error", error=str(exc)))
+
+    succeeded = sum(1 for item in results if item.status == "ok")
+    metrics.incr("batch.requests")
+    metrics.incr("batch.items", len(results))
+    return AgentBatchResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        elapsed_ms=round((time.monotonic() - start) * 1000, 2),
+    )
+
+
+@router.post("/workflow", response_model=WorkflowResponse)
+async def workflow(request: WorkflowRequest) -> WorkflowResponse:
+    """Run a DAG of agent steps, passing outputs between them."""
+    if len(request.steps) > get_settings().agent_batch_max_items:
+        raise HTTPException(status_code=413, detail="Workflow has too many steps")
+
+    steps: List[WorkflowStep] = []
+    for item in request.steps:
+        agent = REGISTRY.get(item.task_type.lower()) or REGISTRY.for_task_type(item.task_type)
+        if not agent:
+            raise HTTPException(
+                status_code=422,
+                detail=f"No agent found for step '{item.id}' task_type='{item.task_type}'",
+            )
+        steps.append(
+            WorkflowStep(
+                id=item.id,
+                agent=agent,
+                payload=item.payload,
+                depends_on=item.depends_on,
+                inputs=item.inputs,
+            )
+        )
+
+    start = time.monotonic()
+    try:
+        outcomes = await run_workflow(
+            steps,
+            timeout_for=lambda agent: _agent_timeout(agent, request.timeout_seconds),
+            use_cache=request.use_cache,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    return WorkflowResponse(
+        status="ok" if all(item.status == "ok" for item in outcomes) else "partial",
+        steps=[
+            WorkflowStepResponse(
+                id=item.id,
+                agent=item.agent,
+                status=item.status,
+                result=AgentResponse(**item.result.__dict__) if item.result else None,
+                cached=item.cached,
+                elapsed_ms=item.elapsed_ms,
+                error=item.error,
+            )
+            for item in outcomes
+        ],
+        elapsed_ms=round((time.monotonic() - start) * 1000, 2),
+    )
+
+
 def _heuristic_pick(query: str) -> BaseAgent | None:
-    lowered = query.lower()
-    for agent in AGENTS:
-        if any(handle in lowered for handle in agent.handles):
-            return agent
-    return None
+    return REGISTRY.match(query)
+
+
+def _llm_pick(query: str) -> str | None:
+    agent_names = ", ".join(agent.name for agent in AGENTS)
+    system_text = (
+        "You route user tasks to the correct agent. "
+        "Only reply with one agent name from: "
+        f"{agent_names}."
+    )
+    metrics.incr("routing.llm_calls")
+    result = chat_ollama(
+        [
+            OllamaMessage(role="system", content=system_text),
+            OllamaMessage(role="user", content=query),
+        ],
+        tier=ROUTER,
+    )
+    reply = result.message.strip().lower()
+    return reply if REGISTRY.get(reply) else None
+
+
+def _llm_pick_many(queries: List[str]) -> List[str | None]:
+    names = [agent.name for agent in AGENTS]
+    system_text, user_text = build_batch_prompt(names, queries)
+    metrics.incr("routing.llm_calls")
+    result = chat_ollama(
+        [
+            OllamaMessage(role="system", content=system_text),
+            OllamaMessage(role="user", content=user_text),
+        ],
+        tier=ROUTER,
+        caller="router.batch",
+        # Room for one "<n>: <agent>" line per query.
+        options={"num_predict": 8 * len(queries)},
+    )
+    return parse_batch_reply(result.message, len(queries), names)
+
+
+_BATCHER: RoutingBatcher | None = None
+
+
+def _routing_batcher() -> RoutingBatcher | None:
+    global _BATCHER
+    settings = get_settings()
+    if settings.agent_route_batch_window_ms <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    if _BATCHER is None or _BATCHER.loop is not loop:
+        _BATCHER = RoutingBatcher(
+            window_seconds=settings.agent_route_batch_window_ms / 1000,
+            max_batch=settings.agent_route_batch_max,
+            route_many=_llm_pick_many,
+            route_one=_llm_pick,
+        )
+    return _BATCHER
+
+
+ROUTE_CACHE_MAX_ENTRIES = 1024
+_ROUTE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _cache_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _cached_route(query: str) -> BaseAgent | None:
+    key = _cache_key(query)
+    name = _ROUTE_CACHE.get(key)
+    if name is None:
+        return None
+    _ROUTE_CACHE.move_to_end(key)
+    return REGISTRY.get(name)
+
+
+def _remember_route(query: str, agent: BaseAgent) -> None:
+    key = _cache_key(query)
+    _ROUTE_CACHE[key] = agent.name
+    _ROUTE_CACHE.move_to_end(key)
+    while len(_ROUTE_CACHE) > ROUTE_CACHE_MAX_ENTRIES:
+        _ROUTE_CACHE.popitem(last=False)
+
+
+async def _llm_route(query: str) -> BaseAgent | None:
+    """Ask the LLM for an agent, micro-batched when AGENT_ROUTE_BATCH_WINDOW_MS > 0.
+
+    Successful answers are remembered in the routing cache, including ones
+    that arrive after the caller stopped waiting.
+    """
+    batcher = _routing_batcher()
+    if batcher is None:
+        name = await run_in_threadpool(_llm_pick, query)
+    else:
+        name = await batcher.pick(query)
+    agent = REGISTRY.get(name) if name else None
+    if agent:
+        _remember_route(query, agent)
+    return agent
+
+
+def _log_route(message: str, meta: Dict[str, Any]) -> None:
+    """Write the routing audit event off the request path."""
+    future = asyncio.get_running_loop().run_in_executor(
+        None, log_event, ROUTE_EVENT_TYPE, message, meta
+    )
+    future.add_done_callback(_report_log_failure)
+
+
+def _report_log_failure(future: asyncio.Future) -> None:
+    # Nobody awaits the write, so its errors would otherwise vanish.
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Routing audit event was not written", exc_info=future.exception())
+
+
+def _log_late_llm_decision(query: str):
+    def callback(task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+        metrics.incr("routing.llm_late_results")
+        agent = task.result()
+        _log_route(
+            f"Late LLM routing decision: {agent.name}",
+            {"query": query, "agent": agent.name, "decision_source": "llm"},
+        )
+
+    return callback
+
+
+@router.get("/metrics")
+def routing_metrics() -> Dict[str, int]:
+    return metrics.snapshot()
+
+
+def _agent_timeout(agent: BaseAgent, requested: float | None) -> float:
+    if requested is not None:
+        return requested
+    if agent.timeout_seconds is not None:
+        return agent.timeout_seconds
+    return get_settings().agent_timeout_seconds
+
+
+async def _fan_out(
+    candidates: List[BaseAgent], payload: Dict[str, Any], timeout: float | None
+) -> AgentResult | None:
+    """Run candidates in parallel; the first "ok" result wins, the rest are cancelled."""
+    tasks = [
+        asyncio.create_task(run_agent(agent, payload, _agent_timeout(agent, timeout)))
+        for agent in candidates
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            try:
+                result = await finished
+            except Exception:
+                continue
+            if result.status == "ok":
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _fan_out_candidates(query: str, k: int) -> List[BaseAgent]:
+    candidates: List[BaseAgent] = []
+    for label, _ in get_classifier(AGENTS).rank(query):
+        agent = REGISTRY.get(label)
+        if agent and agent not in candidates:
+            candidates.append(agent)
+    heuristic = _heuristic_pick(query)
+    if heuristic and heuristic not in candidates[:k]:
+        candidates.insert(0, heuristic)
+    return candidates[:k]
 
 
 @router.post("/auto", response_model=AutoRouteResponse)
-def auto_route(request: AutoRouteRequest) -> AutoRouteResponse:
+async def auto_route(request: AutoRouteRequest) -> AutoRouteResponse:
+    """Cascade: local classifier, routing cache, LLM, then keyword heuristic.
+
+    The LLM is only consulted when the classifier's confidence is below
+    AGENT_ROUTE_CONFIDENCE and the query is not cached. With a latency budget
+    the LLM is awaited only that long before falling back to the heuristic
+    (or the classifier's low-confidence guess). With fan_out > 1 the top
+    candidates run in parallel instead and the first acceptable result is
+    returned.
+    """
     decision_source = "heuristic"
     picked: BaseAgent | None = None
 
-    if request.prefer_llm:
-        try:
-            agent_names = ", ".join(agent.name for agent in AGENTS)
-            system_text = (
-                "You route user tasks to the correct agent. "
-                "Only reply with one agent name from: "
-                f"{agent_names}."
-            )
-            result = chat_ollama(
-                [
-                    OllamaMessage(role="system", content=system_text),
-                    OllamaMessage(role="user", content=request.query),
-                ]
+    classifier = await run_in_threadpool(get_classifier, AGENTS)
+    label, confidence = classifier.predict(request.query)
+
+    if request.fan_out > 1:
+        candidates = _fan_out_candidates(request.query, request.fan_out)
+        if candidates:
+            metrics.incr("routing.decisions.fanout")
+            result = await _fan_out(candidates, request.payload, request.timeout_seconds)
+            if result:
+                _log_route(
+                    f"Query routed to {result.agent}",
+                    {
+                        "query": request.query,
+                        "agent": result.agent,
+                        "decision_source": "fanout",
+                        "candidates": [agent.name for agent in candidates],
+                    },
+                )
+                return AutoRouteResponse(
+                    agent=result.agent,
+                    status=result.status,
+                    summary=result.summary,
+                    data=result.data,
+                    decision_source="fanout",
+                    confidence=round(confidence, 4),
+                )
+            return AutoRouteResponse(
+                agent="router",
+                status="no_match",
+                summary="No candidate agent returned an acceptable result",
+                data={"candidates": [agent.name for agent in candidates]},
+                decision_source="fanout",
             )
-            reply = result.message.strip().lower()
-            for agent in AGENTS:
-                if reply == agent.name:
-                    picked = agent
-                    decision_source = "llm"
-                    break
+
+    if label and confidence >= get_settings().agent_route_confidence:
+        picked = REGISTRY.get(label)
+        decision_source = "classifier"
+        if request.prefer_llm:
+            metrics.incr("routing.llm_calls_avoided")
+
+    if not picked and request.prefer_llm:
+        picked = _cached_route(request.query)
+        if picked:
+            decision_source = "cache"
+            metrics.incr("routing.llm_calls_avoided")
+
+    budget_expired = False
+    if not picked and request.prefer_llm:
+        budget_ms = request.latency_budget_ms
+        if budget_ms is None:
+            budget_ms = get_settings().agent_route_budget_ms
+        llm_task = asyncio.ensure_future(_llm_route(request.query))
+        try:
+            if budget_ms > 0:
+                picked = await asyncio.wait_for(asyncio.shield(llm_task), budget_ms / 1000)
+            else:
+                picked = await llm_task
+            if picked:
+                decision_source = "llm"
+        except asyncio.TimeoutError:
+            # Answer now from the cheaper tiers; the LLM keeps running and its
+            # answer lands in the routing cache and the audit log.
+            metrics.incr("routing.budget_expired")
+            llm_task.add_done_callback(_log_late_llm_decision(request.query))
+            budget_expired = True
+            picked = None
         except Exception:
             picked = None
 
@@ -118,16 +545,44 @@ def auto_route(request: AutoRouteRequest) -> AutoRouteResponse:
         picked = _heuristic_pick(request.query)
         decision_source = "heuristic"
 
+    if not picked and budget_expired and label:
+        picked = REGISTRY.get(label)
+        decision_source = "classifier"
+
     if picked:
-        result: AgentResult = picked.run(request.payload)
+        metrics.incr(f"routing.decisions.{decision_source}")
+        _log_route(
+            f"Query routed to {picked.name}",
+            {
+                "query": request.query,
+                "agent": picked.name,
+                "decision_source": decision_source,
+                "confidence": round(confidence, 4),
+            },
+        )
+        try:
+            result = await run_agent(
+                picked,
+                request.payload,
+                _agent_timeout(picked, request.timeout_seconds),
+            )
+        except asyncio.TimeoutError:
+            result = AgentResult(
+                agent=picked.name,
+                status="timeout",
+                summary=f"Agent '{picked.name}' timed out",
+                data={},
+            )
         return AutoRouteResponse(
             agent=result.agent,
             status=result.status,
             summary=result.summary,
             data=result.data,
             decision_source=decision_source,
+            confidence=round(confidence, 4),
         )
 
+    metrics.incr("routing.decisions.none")
     return AutoRouteResponse(
         agent="router",
         status="no_match",
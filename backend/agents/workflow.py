@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List
+
+from backend.agents import metrics
+from backend.agents.base import AgentResult, BaseAgent, run_agent
+
+
+_RESULT_FIELDS = {item.name for item in fields(AgentResult)}
+
+
+@dataclass
+class WorkflowStep:
+    id: str
+    agent: BaseAgent
+    payload: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+    # payload key -> "<step_id>.<summary|status|agent|data.key...>"
+    inputs: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StepOutcome:
+    id: str
+    agent: str
+    status: str
+    result: AgentResult | None
+    cached: bool
+    elapsed_ms: float
+    error: str | None = None
+
+
+def _memo_key(agent: BaseAgent, payload: Dict[str, Any]) -> str:
+    raw = json.dumps({"agent": agent.name, "payload": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _resolve(reference: str, results: Dict[str, AgentResult]) -> Any:
+    step_id, _, path = reference.partition(".")
+    value: Any = results[step_id]
+    for part in path.split(".") if path else []:
+        if isinstance(value, AgentResult):
+            value = getattr(value, part)
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    if isinstance(value, AgentResult):
+        return value.__dict__
+    return value
+
+
+def _dependencies(step: WorkflowStep) -> set[str]:
+    return set(step.depends_on) | {ref.partition(".")[0] for ref in step.inputs.values()}
+
+
+def validate(steps: List[WorkflowStep]) -> None:
+    """Reject duplicate ids, unknown dependencies, bad input references and cycles (ValueError)."""
+    ids = [step.id for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Duplicate step ids")
+    known = set(ids)
+    for step in steps:
+        missing = _dependencies(step) - known
+        if missing:
+            raise ValueError(f"Step '{step.id}' depends on unknown steps: {sorted(missing)}")
+        for key, reference in step.inputs.items():
+            _, _, path = reference.partition(".")
+            if path and path.split(".")[0] not in _RESULT_FIELDS:
+                raise ValueError(
+                    f"Step '{step.id}' input '{key}' references unknown field '{reference}'"
+                )
+
+    remaining = {step.id: _dependencies(step) for step in steps}
+    while remaining:
+        ready = [step_id for step_id, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Workflow has a cycle among: {sorted(remaining)}")
+        for step_id in ready:
+            remaining.pop(step_id)
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+async def run_workflow(
+    steps: List[WorkflowStep],
+    timeout_for: Callable[[BaseAgent], float],
+    use_cache: bool = True,
+) -> List[StepOutcome]:
+    """Run steps as a DAG, starting each one as soon as its dependencies succeed.
+
+    Inputs referencing an earlier step imply a dependency on it. Independent
+    steps run concurrently, so wall time tracks the critical path. Within
+    this run, a step whose agent and resolved payload already succeeded
+    reuses that result; nothing is remembered across runs, so agents with
+    side effects run again every time the workflow does. Dependents of a
+    failed step are marked "skipped".
+    """
+    validate(steps)
+    by_id = {step.id: step for step in steps}
+    deps = {step.id: _dependencies(step) for step in steps}
+    results: Dict[str, AgentResult] = {}
+    outcomes: Dict[str, StepOutcome] = {}
+    memo: Dict[str, AgentResult] = {}
+
+    async def execute(step: WorkflowStep) -> StepOutcome:
+        started = time.perf_counter()
+
+        def outcome(
+            status: str, result: AgentResult | None, error: str | None = None
+        ) -> StepOutcome:
+            return StepOutcome(
+                id=step.id,
+                agent=step.agent.name,
+                status=status,
+                result=result,
+                cached=False,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+                error=error,
+            )
+
+        payload = dict(step.payload)
+        for key, reference in step.inputs.items():
+            payload[key] = _resolve(reference, results)
+
+        key = _memo_key(step.agent, payload)
+        cached = memo.get(key) if use_cache else None
+        if cached is not None:
+            metrics.incr("workflow.memo_hits")
+            return StepOutcome(
+                id=step.id,
+                agent=step.agent.name,
+                status=cached.status,
+                result=cached,
+                cached=True,
+                elapsed_ms=0.0,
+            )
+
+        try:
+            result = await run_agent(step.agent, payload, timeout_for(step.agent))
+        except asyncio.TimeoutError:
+            return outcome("timeout", None, "Agent timed out")
+        except Exception as exc:
+            return outcome("error", None, str(exc))
+        if result.status == "ok":
+            memo[key] = result
+        return outcome(result.status, result)
+
+    running: Dict[asyncio.Task, str] = {}
+    pending = set(by_id)
+
+    def launch_ready() -> None:
+        for step_id in sorted(pending):
+            if not deps[step_id] <= set(outcomes):
+                continue
+            pending.discard(step_id)
+            failed = [dep for dep in deps[step_id] if outcomes[dep].status != "ok"]
+            if failed:
+                outcomes[step_id] = StepOutcome(
+                    id=step_id,
+                    agent=by_id[step_id].agent.name,
+                    status="skipped",
+                    result=None,
+                    cached=False,
+                    elapsed_ms=0.0,
+                    error=f"Dependency failed: {', '.join(sorted(failed))}",
+                )
+                continue
+            running[asyncio.create_task(execute(by_id[step_id]))] = step_id
+
+    metrics.incr("workflow.runs")
+    try:
+        while True:
+            before = len(outcomes)
+            launch_ready()
+            while len(outcomes) != before:
+                before = len(outcomes)
+                launch_ready()
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finished = task.result()
+                running.pop(task)
+                outcomes[finished.id] = finished
+                if finished.result is not None:
+                    results[finished.id] = finished.result
+    finally:
+        for task in running:
+            task.cancel()
+
+    return [outcomes[step.id] for step in steps]
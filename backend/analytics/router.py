@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter
 
 from backend.audit.store import list_events
+from backend.conversations.blobs import blob_stats
 from backend.conversations.store import list_conversations
 from backend.tasks.store import list_tasks
 
@@ -22,4 +23,5 @@ def summary() -> dict:
         "conversations_total": len(conversations),
         "messages_total": total_messages,
         "audit_events_sample": len(audit_events),
+        "message_bytes_deduplicated": blob_stats()["bytes_saved"],
     }
@@ -26,8 +26,8 @@ class AuditCreate(BaseModel):
 
 
 @router.get("/list", response_model=List[AuditResponse])
-def get_audit(limit: int = 50) -> List[AuditResponse]:
-    events = list_events(limit=limit)
+def get_audit(limit: int = 50, event_type: str | None = None) -> List[AuditResponse]:
+    events = list_events(limit=limit, event_type=event_type)
     return [AuditResponse(**event.__dict__) for event in events]
 
 
@@ -52,12 +52,16 @@ def log_event(event_type: str, message: str, meta: Dict[str, object]) -> AuditEv
     return event
 
 
-def list_events(limit: int = 50) -> List[AuditEvent]:
+def list_events(limit: int = 50, event_type: str | None = None) -> List[AuditEvent]:
+    query: Dict[str, object] = {}
+    if event_type:
+        query["event_type"] = event_type
+
     collection = _get_collection()
     if collection is not None:
         try:
             docs = (
-                collection.find({}, {"_id": 0})
+                collection.find(query, {"_id": 0})
                 .sort("timestamp", -1)
                 .limit(limit)
             )
@@ -65,7 +69,11 @@ def list_events(limit: int = 50) -> List[AuditEvent]:
         except PyMongoError:
             pass
 
-    events = list(_CACHE.values())
+    events = [
+        event
+        for event in _CACHE.values()
+        if not event_type or event.event_type == event_type
+    ]
     events.sort(key=lambda event: event.timestamp, reverse=True)
     return events[:limit]
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+from uuid import uuid4
+
+from backend.compression.store import (
+    CompressedConversation,
+    compressed_message_counts,
+    save_compressed_many,
+)
+from backend.config import get_settings
+from backend.conversations.store import Conversation, count_conversations, iter_conversation_batches
+from backend.utils.scaledown import compress_many
+
+
+@dataclass
+class CompressionJob:
+    id: str
+    status: str = "pending"
+    total: int = 0
+    processed: int = 0
+    compressed: int = 0
+    skipped: int = 0
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    error: str = ""
+    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    finished_at: str = ""
+
+    def snapshot(self) -> Dict[str, object]:
+        data = dict(self.__dict__)
+        data["bytes_saved"] = self.original_bytes - self.compressed_bytes
+        data["ratio"] = (
+            round(1 - self.compressed_bytes / self.original_bytes, 4) if self.original_bytes else 0.0
+        )
+        data["progress"] = round(self.processed / self.total, 4) if self.total else 1.0
+        return data
+
+
+_JOBS: Dict[str, CompressionJob] = {}
+_LOCK = threading.Lock()
+
+
+def render_conversation(conversation: Conversation) -> str:
+    return "\n".join(f"{msg.role}: {msg.content}" for msg in conversation.messages)
+
+
+def start_job() -> tuple[CompressionJob, bool]:
+    """Create a job unless one is already pending or running; returns (job, created)."""
+    with _LOCK:
+        for job in _JOBS.values():
+            if job.status in {"pending", "running"}:
+                return job, False
+        job = CompressionJob(id=str(uuid4()))
+        _JOBS[job.id] = job
+        return job, True
+
+
+def get_job(job_id: str) -> CompressionJob | None:
+    return _JOBS.get(job_id)
+
+
+def _compress_batch(job: CompressionJob, batch: List[Conversation]) -> None:
+    done = compressed_message_counts([conv.id for conv in batch])
+    pending = [
+        conv for conv in batch if conv.messages and done.get(conv.id) != len(conv.messages)
+    ]
+    texts = [render_conversation(conv) for conv in pending]
+    records = []
+    for conv, text, result in zip(pending, texts, compress_many(texts)):
+        original_size = len(text.encode("utf-8"))
+        compressed_size = len(result.compressed_text.encode("utf-8")) or result.compressed_size
+        records.append(
+            CompressedConversation(
+                conversation_id=conv.id,
+                text=result.compressed_text,
+                message_count=len(conv.messages),
+                original_size=original_size,
+                compressed_size=compressed_size,
+                backend=result.backend,
+            )
+        )
+        job.original_bytes += original_size
+        job.compressed_bytes += compressed_size
+    save_compressed_many(records)
+    job.compressed += len(records)
+    job.skipped += len(batch) - len(records)
+    job.processed += len(batch)
+
+
+def run_job(job_id: str) -> None:
+    """Compress every conversation's messages, one store batch at a time.
+
+    Only one batch of conversations is held in memory at once, and
+    conversations whose message count has not changed since their last
+    compression are skipped.
+    """
+    job = _JOBS[job_id]
+    job.status = "running"
+    job.total = count_conversations()
+    try:
+        for batch in iter_conversation_batches(get_settings().compression_job_batch):
+            _compress_batch(job, batch)
+        job.status = "done"
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+    job.total = max(job.total, job.processed)
+    job.finished_at = datetime.utcnow().isoformat()
@@ -1,27 +1,38 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 
-from backend.conversations.store import list_conversations
-from backend.utils.scaledown import compress_text
+from backend.compression.jobs import get_job, run_job, start_job
+from backend.compression.store import get_compressed
 
 
 router = APIRouter(prefix="/v1/compression", tags=["compression"])
 
 
-@router.post("/conversations")
-def compress_conversations() -> dict:
-	conversations = list_conversations()
-	raw_text = "\n".join(
-		f"{conv.title}: {len(conv.messages)} messages" for conv in conversations
-	)
-	result = compress_text(raw_text or "(no conversations)")
-
-	return {
-		"ok": result.ok,
-		"ratio": result.ratio,
-		"original_size": result.original_size,
-		"compressed_size": result.compressed_size,
-		"summary": result.summary,
-		"input_preview": raw_text[:200],
-	}
+@router.post("/conversations", status_code=202)
+def compress_conversations(background_tasks: BackgroundTasks) -> dict:
+	"""Start compressing every conversation in the background.
+
+	Returns the job right away; poll /v1/compression/jobs/{job_id} for
+	progress. If a job is already running, that job is returned instead.
+	"""
+	job, created = start_job()
+	if created:
+		background_tasks.add_task(run_job, job.id)
+	return {"ok": True, "job_id": job.id, "created": created, **job.snapshot()}
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str) -> dict:
+	job = get_job(job_id)
+	if not job:
+		raise HTTPException(status_code=404, detail="Compression job not found")
+	return job.snapshot()
+
+
+@router.get("/conversations/{conv_id}")
+def compressed_conversation(conv_id: str) -> dict:
+	record = get_compressed(conv_id)
+	if not record:
+		raise HTTPException(status_code=404, detail="Conversation not compressed yet")
+	return record.__dict__
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from backend.db.mongo import get_mongo_client
+
+
+@dataclass
+class CompressedConversation:
+    conversation_id: str
+    text: str
+    message_count: int
+    original_size: int
+    compressed_size: int
+    backend: str
+    compressed_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+_COMPRESSED: Dict[str, CompressedConversation] = {}
+
+
+def _get_collection():
+    try:
+        client = get_mongo_client()
+        db = client.get_default_database()
+        return db["compressed_conversations"]
+    except Exception:
+        return None
+
+
+def get_compressed(conv_id: str) -> CompressedConversation | None:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"conversation_id": conv_id}, {"_id": 0})
+            if doc:
+                return CompressedConversation(**doc)
+        except PyMongoError:
+            pass
+
+    return _COMPRESSED.get(conv_id)
+
+
+def compressed_message_counts(conv_ids: List[str]) -> Dict[str, int]:
+    """Message count at the last compression of each given conversation."""
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            docs = collection.find(
+                {"conversation_id": {"$in": conv_ids}},
+                {"_id": 0, "conversation_id": 1, "message_count": 1},
+            )
+            return {doc["conversation_id"]: doc["message_count"] for doc in docs}
+        except PyMongoError:
+            pass
+
+    return {
+        conv_id: _COMPRESSED[conv_id].message_count
+        for conv_id in conv_ids
+        if conv_id in _COMPRESSED
+    }
+
+
+def save_compressed_many(records: List[CompressedConversation]) -> None:
+    if not records:
+        return
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"conversation_id": record.conversation_id},
+                        {"$set": record.__dict__},
+                        upsert=True,
+                    )
+                    for record in records
+                ],
+                ordered=False,
+            )
+            return
+        except PyMongoError:
+            pass
+
+    for record in records:
+        _COMPRESSED[record.conversation_id] = record
@@ -33,7 +33,14 @@ class Settings:
 	admin_api_key: str
 	cors_origins: str
 	ollama_base_url: str
+	ollama_base_urls: str
+	ollama_health_interval_seconds: float
+	ollama_keep_alive: str | int
+	ollama_preload: bool
+	ollama_breaker_failures: int
+	ollama_breaker_reset_seconds: float
 	ollama_model: str
+	ollama_model_tiers: str
 	mongo_uri: str
 	neo4j_uri: str
 	neo4j_user: str
@@ -45,12 +52,55 @@ class Settings:
 	plaid_secret: str
 	plaid_env: str
 	scaledown_api_key: str
+	scaledown_base_url: str
+	scaledown_batch_max_bytes: int
+	scaledown_retries: int
+	compression_backend: str
+	compression_cache_size: int
+	compression_cache_dir: str
+	compression_job_batch: int
+	archive_after_days: int
+	archive_block_messages: int
+	archive_dict_bytes: int
+	message_dedup_min_bytes: int
+	message_blob_cache_size: int
+	sync_tombstone_days: int
+	snapshot_dir: str
+	snapshot_interval_seconds: int
+	compression_keep_ratio: float
+	compression_workers: int
+	summary_refresh_on_write: bool
+	llm_context_budget: int
+	agent_route_confidence: float
+	agent_batch_max_items: int
+	agent_batch_workers: int
+	agent_timeout_seconds: float
+	agent_route_batch_window_ms: int
+	agent_route_batch_max: int
+	agent_route_budget_ms: int
 
 
 def _get_env(key: str, default: str) -> str:
 	return os.getenv(key, default)
 
 
+def _get_duration(key: str, default: str) -> str | int:
+	# Ollama reads bare numbers as seconds (-1 = forever) only when they are
+	# JSON numbers; "-1" as a string is rejected as a duration.
+	raw = _get_env(key, default).strip()
+	try:
+		return int(raw)
+	except ValueError:
+		return raw
+
+
+def _get_bool(key: str, default: bool) -> bool:
+	raw = os.getenv(key)
+	if raw is None:
+		return default
+	return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
 	return Settings(
@@ -66,7 +116,18 @@ def get_settings() -> Settings:
 			"http://localhost:8501,http://127.0.0.1:8501",
 		),
 		ollama_base_url=_get_env("OLLAMA_BASE_URL", "http://localhost:11434"),
+		ollama_base_urls=_get_env("OLLAMA_BASE_URLS", ""),
+		ollama_health_interval_seconds=float(
+			_get_env("OLLAMA_HEALTH_INTERVAL_SECONDS", "15")
+		),
+		ollama_keep_alive=_get_duration("OLLAMA_KEEP_ALIVE", "30m"),
+		ollama_preload=_get_bool("OLLAMA_PRELOAD", True),
+		ollama_breaker_failures=int(_get_env("OLLAMA_BREAKER_FAILURES", "3")),
+		ollama_breaker_reset_seconds=float(
+			_get_env("OLLAMA_BREAKER_RESET_SECONDS", "30")
+		),
 		ollama_model=_get_env("OLLAMA_MODEL", "llama3.1:8b"),
+		ollama_model_tiers=_get_env("OLLAMA_MODEL_TIERS", ""),
 		mongo_uri=_get_env("MONGO_URI", "mongodb://localhost:27017/personal_ai"),
 		neo4j_uri=_get_env("NEO4J_URI", "bolt://localhost:7687"),
 		neo4j_user=_get_env("NEO4J_USER", "neo4j"),
@@ -78,4 +139,30 @@ def get_settings() -> Settings:
 		plaid_secret=_get_env("PLAID_SECRET", ""),
 		plaid_env=_get_env("PLAID_ENV", "sandbox"),
 		scaledown_api_key=_get_env("SCALEDOWN_API_KEY", ""),
+		scaledown_base_url=_get_env("SCALEDOWN_BASE_URL", "https://api.scaledown.ai"),
+		scaledown_batch_max_bytes=int(_get_env("SCALEDOWN_BATCH_MAX_BYTES", "262144")),
+		scaledown_retries=int(_get_env("SCALEDOWN_RETRIES", "3")),
+		compression_backend=_get_env("COMPRESSION_BACKEND", "local"),
+		compression_cache_size=int(_get_env("COMPRESSION_CACHE_SIZE", "1024")),
+		compression_cache_dir=_get_env("COMPRESSION_CACHE_DIR", ""),
+		compression_job_batch=int(_get_env("COMPRESSION_JOB_BATCH", "50")),
+		archive_after_days=int(_get_env("ARCHIVE_AFTER_DAYS", "90")),
+		archive_block_messages=int(_get_env("ARCHIVE_BLOCK_MESSAGES", "64")),
+		archive_dict_bytes=int(_get_env("ARCHIVE_DICT_BYTES", "32768")),
+		message_dedup_min_bytes=int(_get_env("MESSAGE_DEDUP_MIN_BYTES", "0")),
+		message_blob_cache_size=int(_get_env("MESSAGE_BLOB_CACHE_SIZE", "2048")),
+		sync_tombstone_days=int(_get_env("SYNC_TOMBSTONE_DAYS", "30")),
+		snapshot_dir=_get_env("SNAPSHOT_DIR", ""),
+		snapshot_interval_seconds=int(_get_env("SNAPSHOT_INTERVAL_SECONDS", "300")),
+		compression_keep_ratio=float(_get_env("COMPRESSION_KEEP_RATIO", "0.5")),
+		compression_workers=int(_get_env("COMPRESSION_WORKERS", "4")),
+		summary_refresh_on_write=_get_bool("SUMMARY_REFRESH_ON_WRITE", False),
+		llm_context_budget=int(_get_env("LLM_CONTEXT_BUDGET", "2048")),
+		agent_route_confidence=float(_get_env("AGENT_ROUTE_CONFIDENCE", "0.6")),
+		agent_batch_max_items=int(_get_env("AGENT_BATCH_MAX_ITEMS", "200")),
+		agent_batch_workers=int(_get_env("AGENT_BATCH_WORKERS", "8")),
+		agent_timeout_seconds=float(_get_env("AGENT_TIMEOUT_SECONDS", "10")),
+		agent_route_batch_window_ms=int(_get_env("AGENT_ROUTE_BATCH_WINDOW_MS", "0")),
+		agent_route_batch_max=int(_get_env("AGENT_ROUTE_BATCH_MAX", "16")),
+		agent_route_budget_ms=int(_get_env("AGENT_ROUTE_BUDGET_MS", "0")),
 	)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+from uuid import uuid4
+
+from pymongo.errors import PyMongoError
+
+from backend.config import get_settings
+from backend.conversations import store
+from backend.conversations.cold_storage import (
+    ArchiveDictionary,
+    ArchivedBlock,
+    build_zdict,
+    latest_dictionary,
+    list_dictionaries,
+    pack_messages,
+    save_dictionary,
+)
+from backend.conversations.store import (
+    Conversation,
+    ConversationMessage,
+    MessageHistory,
+    iter_conversation_batches,
+)
+from backend.sync.store import next_seq, stamps_changes
+
+
+DEFAULT_OWNER = "default"
+# Conversations with fewer cold messages than this are left alone; tiny
+# blocks compress poorly and are not worth the extra document churn.
+MIN_ARCHIVE_MESSAGES = 8
+
+
+@dataclass
+class ArchiveRun:
+    conversations: int = 0
+    archived_messages: int = 0
+    blocks: int = 0
+    raw_bytes: int = 0
+    packed_bytes: int = 0
+
+
+def _hot_messages(conversation: Conversation) -> List[ConversationMessage]:
+    messages = conversation.messages
+    return messages.hot if isinstance(messages, MessageHistory) else list(messages)
+
+
+def _corpus_samples() -> Iterator[str]:
+    for batch in iter_conversation_batches(get_settings().compression_job_batch):
+        for conversation in batch:
+            for msg in _hot_messages(conversation):
+                yield msg.content
+
+
+def train_dictionary(owner: str = DEFAULT_OWNER) -> ArchiveDictionary:
+    """Train a preset dictionary on the owner's hot messages and make it current."""
+    samples = list(_corpus_samples())
+    zdict = build_zdict(samples, get_settings().archive_dict_bytes)
+    dictionary = ArchiveDictionary(
+        id=str(uuid4()),
+        owner=owner,
+        zdict=zdict,
+        sample_bytes=sum(len(sample) for sample in samples),
+    )
+    return save_dictionary(dictionary)
+
+
+def _cold_prefix(conversation: Conversation, cutoff: str) -> int:
+    """Number of leading hot messages older than cutoff."""
+    count = 0
+    for msg in _hot_messages(conversation):
+        if msg.timestamp >= cutoff:
+            break
+        count += 1
+    return count
+
+
+@stamps_changes
+def _store_blocks(conversation: Conversation, count: int, blocks: List[ArchivedBlock]) -> bool:
+    """Move the first `count` hot messages into blocks, atomically per conversation.
+
+    Like any other write, this stamps the conversation with a new seq.
+    """
+    hot = _hot_messages(conversation)
+    seq = next_seq()
+    collection = store._get_collection()
+    if collection is not None:
+        try:
+            # The filter pins the last archived message, so a concurrent edit
+            # makes this a no-op instead of losing messages; appends are safe
+            # because the slice is evaluated server-side.
+            result = collection.update_one(
+                {
+                    "id": conversation.id,
+                    f"messages.{count - 1}.timestamp": hot[count - 1].timestamp,
+                },
+                [
+                    {
+                        "$set": {
+                            "messages": {"$slice": ["$messages", count, {"$size": "$messages"}]},
+                            "archived_blocks": {
+                                "$concatArrays": [
+                                    {"$ifNull": ["$archived_blocks", []]},
+                                    [block.to_doc() for block in blocks],
+                                ]
+                            },
+                            "seq": {"$max": [{"$ifNull": ["$seq", 0]}, seq]},
+                        }
+                    }
+                ],
+            )
+            return result.modified_count == 1
+        except PyMongoError:
+            pass
+
+    cached = store._CACHE.get(conversation.id)
+    if cached is None:
+        return False
+    previous_blocks = cached.messages.blocks if isinstance(cached.messages, MessageHistory) else []
+    cached.messages = MessageHistory(_hot_messages(cached)[count:], previous_blocks + blocks)
+    cached.seq = max(cached.seq, seq)
+    return True
+
+
+def archive_conversations(
+    older_than_days: int | None = None, owner: str = DEFAULT_OWNER
+) -> ArchiveRun:
+    """Pack hot messages older than the threshold into zlib blocks.
+
+    Blocks use the owner's latest preset dictionary (plain zlib before one
+    has been trained) and hold up to ARCHIVE_BLOCK_MESSAGES messages each.
+    Recent messages stay hot, so appends and reads of new turns never touch
+    the archive.
+    """
+    settings = get_settings()
+    days = settings.archive_after_days if older_than_days is None else older_than_days
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    block_size = max(1, settings.archive_block_messages)
+    dictionary = latest_dictionary(owner)
+
+    run = ArchiveRun()
+    for batch in iter_conversation_batches(settings.compression_job_batch):
+        for conversation in batch:
+            count = _cold_prefix(conversation, cutoff)
+            if count < MIN_ARCHIVE_MESSAGES:
+                continue
+            cold = [msg.__dict__ for msg in _hot_messages(conversation)[:count]]
+            blocks = [
+                pack_messages(cold[start : start + block_size], dictionary)
+                for start in range(0, count, block_size)
+            ]
+            if not _store_blocks(conversation, count, blocks):
+                continue
+            run.conversations += 1
+            run.archived_messages += count
+            run.blocks += len(blocks)
+            run.raw_bytes += sum(block.raw_size for block in blocks)
+            run.packed_bytes += sum(block.packed_size for block in blocks)
+    return run
+
+
+def archive_stats() -> Dict[str, object]:
+    """Storage used by archived blocks, summed over all conversations."""
+    totals = {
+        "conversations": 0,
+        "blocks": 0,
+        "archived_messages": 0,
+        "raw_bytes": 0,
+        "packed_bytes": 0,
+    }
+    for batch in iter_conversation_batches(get_settings().compression_job_batch):
+        for conversation in batch:
+            messages = conversation.messages
+            if not isinstance(messages, MessageHistory) or not messages.blocks:
+                continue
+            blocks = messages.blocks
+            totals["conversations"] += 1
+            totals["blocks"] += len(blocks)
+            totals["archived_messages"] += sum(block.count for block in blocks)
+            totals["raw_bytes"] += sum(block.raw_size for block in blocks)
+            totals["packed_bytes"] += sum(block.packed_size for block in blocks)
+    raw = totals["raw_bytes"]
+    return {
+        **totals,
+        "bytes_saved": raw - totals["packed_bytes"],
+        "ratio": round(1 - totals["packed_bytes"] / raw, 4) if raw else 0.0,
+        "dictionaries": list_dictionaries(),
+    }
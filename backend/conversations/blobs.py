@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from backend.config import get_settings
+from backend.db.mongo import get_mongo_client
+
+
+# Message bodies stored once, keyed by the SHA-256 of their UTF-8 bytes.
+# Messages above MESSAGE_DEDUP_MIN_BYTES keep only the hash ("content_ref");
+# reads resolve through an LRU of hot bodies before asking the collection.
+_BLOBS: Dict[str, str] = {}
+_REFS: Dict[str, int] = {}
+_HOT: OrderedDict[str, str] = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _get_collection():
+    try:
+        client = get_mongo_client()
+        db = client.get_default_database()
+        return db["message_blobs"]
+    except Exception:
+        return None
+
+
+def body_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def should_dedup(content: str) -> bool:
+    threshold = get_settings().message_dedup_min_bytes
+    return threshold > 0 and len(content.encode("utf-8")) >= threshold
+
+
+def _remember(digest: str, content: str) -> None:
+    limit = max(1, get_settings().message_blob_cache_size)
+    with _LOCK:
+        _HOT[digest] = content
+        _HOT.move_to_end(digest)
+        while len(_HOT) > limit:
+            _HOT.popitem(last=False)
+
+
+def put_body(content: str) -> str | None:
+    """Store content once in the blob collection, counting the new reference.
+
+    Returns the hash to keep in the message, or None when the collection is
+    unavailable (the caller then stores the body inline).
+    """
+    collection = _get_collection()
+    if collection is None:
+        return None
+    digest = body_hash(content)
+    try:
+        collection.update_one(
+            {"hash": digest},
+            {
+                "$setOnInsert": {
+                    "hash": digest,
+                    "content": content,
+                    "size": len(content.encode("utf-8")),
+                },
+                "$inc": {"refs": 1},
+            },
+            upsert=True,
+        )
+    except PyMongoError:
+        return None
+    _remember(digest, content)
+    return digest
+
+
+def put_bodies(contents: List[str], replaced: Iterable[str] = ()) -> Dict[str, str] | None:
+    """put_body for many bodies in one round trip; maps each body to its hash.
+
+    replaced holds the content_refs of the messages being overwritten. Only
+    the difference is counted, so importing the same conversations again
+    leaves the reference counts unchanged.
+    """
+    collection = _get_collection()
+    if collection is None:
+        return None
+    digests = {content: body_hash(content) for content in contents}
+    delta = Counter(digests[content] for content in contents)
+    delta.subtract(Counter(replaced))
+    writes = [
+        UpdateOne(
+            {"hash": digest},
+            {
+                "$setOnInsert": {
+                    "hash": digest,
+                    "content": content,
+                    "size": len(content.encode("utf-8")),
+                },
+                "$inc": {"refs": delta[digest]},
+            },
+            upsert=True,
+        )
+        for content, digest in digests.items()
+    ]
+    stored = set(digests.values())
+    writes.extend(
+        UpdateOne({"hash": digest}, {"$inc": {"refs": count}})
+        for digest, count in delta.items()
+        if digest not in stored and count
+    )
+    try:
+        if writes:
+            collection.bulk_write(writes, ordered=False)
+    except PyMongoError:
+        return None
+    for content, digest in digests.items():
+        _remember(digest, content)
+    return digests
+
+
+def intern_body(content: str) -> str:
+    """In-memory store: return the single shared copy of content."""
+    digest = body_hash(content)
+    with _LOCK:
+        shared = _BLOBS.setdefault(digest, content)
+        _REFS[digest] = _REFS.get(digest, 0) + 1
+        return shared
+
+
+def release_bodies(contents: Iterable[str]) -> None:
+    """In-memory store: drop the references held by replaced messages."""
+    with _LOCK:
+        for content in contents:
+            digest = body_hash(content)
+            if digest not in _REFS:
+                continue
+            _REFS[digest] -= 1
+            if _REFS[digest] <= 0:
+                del _REFS[digest]
+                _BLOBS.pop(digest, None)
+
+
+def resolve_bodies(digests: Iterable[str]) -> Dict[str, str]:
+    """Map hashes to bodies: hot LRU first, then one query for the rest."""
+    found: Dict[str, str] = {}
+    missing = []
+    with _LOCK:
+        for digest in set(digests):
+            if digest in _HOT:
+                _HOT.move_to_end(digest)
+                found[digest] = _HOT[digest]
+            elif digest in _BLOBS:
+                found[digest] = _BLOBS[digest]
+            else:
+                missing.append(digest)
+
+    collection = _get_collection() if missing else None
+    if collection is not None:
+        try:
+            for doc in collection.find({"hash": {"$in": missing}}, {"_id": 0, "hash": 1, "content": 1}):
+                found[doc["hash"]] = doc["content"]
+                _remember(doc["hash"], doc["content"])
+        except PyMongoError:
+            pass
+    return found
+
+
+def blob_stats() -> Dict[str, object]:
+    """Deduplication totals: bytes referenced by messages vs bytes stored."""
+    unique_bytes = 0
+    referenced_bytes = 0
+    blobs = 0
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            pipeline = [
+                {
+                    "$group": {
+                        "_id": None,
+                        "blobs": {"$sum": 1},
+                        "unique_bytes": {"$sum": "$size"},
+                        "referenced_bytes": {"$sum": {"$multiply": ["$size", "$refs"]}},
+                    }
+                }
+            ]
+            for row in collection.aggregate(pipeline):
+                blobs = row["blobs"]
+                unique_bytes = row["unique_bytes"]
+                referenced_bytes = row["referenced_bytes"]
+        except PyMongoError:
+            collection = None
+
+    if collection is None:
+        with _LOCK:
+            for digest, content in _BLOBS.items():
+                size = len(content.encode("utf-8"))
+                blobs += 1
+                unique_bytes += size
+                referenced_bytes += size * _REFS.get(digest, 1)
+
+    return {
+        "enabled": get_settings().message_dedup_min_bytes > 0,
+        "blobs": blobs,
+        "unique_bytes": unique_bytes,
+        "referenced_bytes": referenced_bytes,
+        "bytes_saved": referenced_bytes - unique_bytes,
+        "dedup_ratio": round(referenced_bytes / unique_bytes, 2) if unique_bytes else 1.0,
+    }
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from pymongo.errors import PyMongoError
+
+from backend.db.mongo import get_mongo_client
+
+
+# Decoded archive blocks kept in memory, so re-reading an old conversation
+# does not inflate it again.
+DECODED_CACHE_BLOCKS = 256
+# Phrases are word n-grams of these lengths.
+_PHRASE_LENGTHS = range(2, 7)
+_MAX_SAMPLE_BYTES = 2_000_000
+_WORDS = re.compile(r"\S+")
+# Every packed block is a JSON list of message dicts; seeding the dictionary
+# with that scaffolding pays off even before any text is shared.
+_JSON_SCAFFOLD = '[{"role": "user", "content": "", "timestamp": "20{"role": "assistant", "content": "'
+
+
+@dataclass
+class ArchiveDictionary:
+    id: str
+    owner: str
+    zdict: bytes
+    sample_bytes: int
+    trained_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+@dataclass
+class ArchivedBlock:
+    """A run of old messages packed with zlib, optionally using a preset dictionary."""
+
+    dict_id: str
+    count: int
+    raw_size: int
+    packed_size: int
+    data: bytes
+
+    def to_doc(self) -> Dict[str, object]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, object]) -> "ArchivedBlock":
+        return cls(
+            dict_id=str(doc.get("dict_id", "")),
+            count=int(doc["count"]),
+            raw_size=int(doc.get("raw_size", 0)),
+            packed_size=int(doc.get("packed_size", 0)),
+            data=bytes(doc["data"]),
+        )
+
+    def load(self) -> List[Dict[str, str]]:
+        key = hashlib.blake2b(self.data, digest_size=16).digest()
+        with _LOCK:
+            cached = _DECODED.get(key)
+            if cached is not None:
+                _DECODED.move_to_end(key)
+                return cached
+        zdict = get_dictionary(self.dict_id).zdict if self.dict_id else b""
+        inflater = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        messages = json.loads(inflater.decompress(self.data) + inflater.flush())
+        with _LOCK:
+            _DECODED[key] = messages
+            while len(_DECODED) > DECODED_CACHE_BLOCKS:
+                _DECODED.popitem(last=False)
+        return messages
+
+
+_DICTIONARIES: Dict[str, ArchiveDictionary] = {}
+_DECODED: OrderedDict[bytes, List[Dict[str, str]]] = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _get_collection():
+    try:
+        client = get_mongo_client()
+        db = client.get_default_database()
+        return db["archive_dictionaries"]
+    except Exception:
+        return None
+
+
+def pack_messages(messages: List[Dict[str, str]], dictionary: ArchiveDictionary | None) -> ArchivedBlock:
+    raw = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+    if dictionary is not None:
+        deflater = zlib.compressobj(9, zdict=dictionary.zdict)
+    else:
+        deflater = zlib.compressobj(9)
+    data = deflater.compress(raw) + deflater.flush()
+    return ArchivedBlock(
+        dict_id=dictionary.id if dictionary is not None else "",
+        count=len(messages),
+        raw_size=len(raw),
+        packed_size=len(data),
+        data=data,
+    )
+
+
+def build_zdict(samples: Iterable[str], size: int) -> bytes:
+    """Build a zlib preset dictionary from the phrases that recur in samples.
+
+    Phrases are scored by (occurrences - 1) * length, i.e. roughly the bytes
+    they would save. Deflate reaches the end of the dictionary with the
+    shortest distances, so the most valuable phrases are placed last.
+    """
+    counts: Counter[str] = Counter()
+    seen = 0
+    for sample in samples:
+        if seen >= _MAX_SAMPLE_BYTES:
+            break
+        seen += len(sample)
+        words = _WORDS.findall(sample)
+        for length in _PHRASE_LENGTHS:
+            for start in range(len(words) - length + 1):
+                counts[" ".join(words[start : start + length])] += 1
+
+    scored = sorted(
+        ((count - 1) * len(phrase), phrase) for phrase, count in counts.items() if count > 1
+    )
+    chosen: List[str] = []
+    used = len(_JSON_SCAFFOLD)
+    for _, phrase in reversed(scored):
+        if used >= size:
+            break
+        if any(phrase in kept for kept in chosen[-64:]):
+            continue
+        chosen.append(phrase)
+        used += len(phrase) + 1
+    chosen.reverse()
+    zdict = (" ".join(chosen) + " " + _JSON_SCAFFOLD).encode("utf-8")
+    return zdict[-size:]
+
+
+def save_dictionary(dictionary: ArchiveDictionary) -> ArchiveDictionary:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            collection.insert_one(dict(dictionary.__dict__))
+        except PyMongoError:
+            pass
+
+    _DICTIONARIES[dictionary.id] = dictionary
+    return dictionary
+
+
+def get_dictionary(dict_id: str) -> ArchiveDictionary:
+    """Return a dictionary by id; blocks keep referencing old ones, so they are never deleted."""
+    cached = _DICTIONARIES.get(dict_id)
+    if cached is not None:
+        return cached
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"id": dict_id}, {"_id": 0})
+            if doc:
+                doc["zdict"] = bytes(doc["zdict"])
+                dictionary = _DICTIONARIES[dict_id] = ArchiveDictionary(**doc)
+                return dictionary
+        except PyMongoError:
+            pass
+
+    raise KeyError(f"Archive dictionary {dict_id} not found")
+
+
+def latest_dictionary(owner: str) -> ArchiveDictionary | None:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"owner": owner}, {"_id": 0}, sort=[("trained_at", -1)])
+            if doc:
+                doc["zdict"] = bytes(doc["zdict"])
+                dictionary = _DICTIONARIES[doc["id"]] = ArchiveDictionary(**doc)
+                return dictionary
+        except PyMongoError:
+            pass
+
+    owned = [item for item in _DICTIONARIES.values() if item.owner == owner]
+    return max(owned, key=lambda item: item.trained_at, default=None)
+
+
+def list_dictionaries() -> List[Dict[str, object]]:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            docs = collection.find({}, {"_id": 0, "zdict": 0})
+            return list(docs)
+        except PyMongoError:
+            pass
+
+    return [
+        {key: value for key, value in item.__dict__.items() if key != "zdict"}
+        for item in _DICTIONARIES.values()
+    ]
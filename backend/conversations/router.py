@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel, Field
 
 from backend.audit.store import log_event
+from backend.config import get_settings
+from backend.conversations.blobs import blob_stats
 from backend.conversations.store import (
     Conversation,
     ConversationMessage,
@@ -14,7 +16,7 @@ from backend.conversations.store import (
     get_conversation,
     list_conversations,
 )
-from backend.integrations.ollama_client import OllamaMessage, chat_ollama
+from backend.conversations.summaries import build_summary, refresh_summary
 
 
 router = APIRouter(prefix="/v1/conversations", tags=["conversations"])
@@ -83,7 +85,8 @@ def search(query: str) -> List[ConversationResponse]:
         if lowered in conv.title.lower():
             matches.append(conv)
             continue
-        for msg in conv.messages:
+        # Newest first: archived blocks are only inflated if no hot message matches.
+        for msg in reversed(conv.messages):
             if lowered in msg.content.lower():
                 matches.append(conv)
                 break
@@ -110,6 +113,7 @@ def stats() -> dict:
         "total_conversations": len(conversations),
         "total_messages": total_messages,
         "avg_messages_per_conversation": round(avg_messages, 2),
+        "dedup": blob_stats(),
     }
 
 
@@ -127,7 +131,11 @@ def get_one(conv_id: str) -> ConversationResponse:
 
 
 @router.post("/{conv_id}/message", response_model=ConversationResponse)
-def add_message(conv_id: str, request: MessageCreate) -> ConversationResponse:
+def add_message(
+    conv_id: str,
+    request: MessageCreate,
+    background_tasks: BackgroundTasks,
+) -> ConversationResponse:
     conversation = append_message(conv_id, request.role, request.content)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -137,6 +145,8 @@ def add_message(conv_id: str, request: MessageCreate) -> ConversationResponse:
         "Message added to conversation",
         {"conversation_id": conversation.id, "role": request.role},
     )
+    if get_settings().summary_refresh_on_write:
+        background_tasks.add_task(refresh_summary, conversation.id)
 
     return ConversationResponse(
         id=conversation.id,
@@ -164,23 +174,9 @@ def get_summary(conv_id: str, prefer_llm: bool = True) -> SummaryResponse:
 
     if prefer_llm and conversation.messages:
         try:
-            joined = "\n".join(
-                f"{msg.role}: {msg.content}" for msg in conversation.messages[-12:]
-            )
-            result = chat_ollama(
-                [
-                    OllamaMessage(
-                        role="system",
-                        content=(
-                            "Summarize this conversation in 2-3 short sentences."
-                        ),
-                    ),
-                    OllamaMessage(role="user", content=joined),
-                ]
-            )
-            if result.message:
-                summary = result.message
-                method = "llm"
+            record = build_summary(conversation)
+            summary = record.summary
+            method = "llm"
         except Exception:
             method = "heuristic"
 
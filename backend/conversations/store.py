@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+from collections.abc import MutableSequence
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, MutableMapping
 from uuid import uuid4
 
-from pymongo import ReturnDocument
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
 from pymongo.errors import PyMongoError
 
+from backend.conversations.blobs import (
+    intern_body,
+    put_bodies,
+    put_body,
+    release_bodies,
+    resolve_bodies,
+    should_dedup,
+)
+from backend.conversations.cold_storage import ArchivedBlock
 from backend.db.mongo import get_mongo_client
+from backend.db.snapshot_file import LazyRecords
+from backend.sync.store import next_seq, next_seqs, stamps_changes
 
 
 @dataclass
@@ -16,16 +28,135 @@ class ConversationMessage:
     role: str
     content: str
     timestamp: str
+    seq: int = 0
+
+
+class MessageHistory(MutableSequence):
+    """A conversation's messages: archived blocks first, then hot messages.
+
+    Archived blocks are only inflated when an archived position is read, so
+    len(), the newest messages and appends never touch cold storage.
+    """
+
+    def __init__(
+        self,
+        hot: Iterable[ConversationMessage] = (),
+        blocks: Iterable[ArchivedBlock] = (),
+    ) -> None:
+        self.hot: List[ConversationMessage] = list(hot)
+        self.blocks: List[ArchivedBlock] = list(blocks)
+        self._cold: List[ConversationMessage] | None = None
+
+    @property
+    def archived_count(self) -> int:
+        return sum(block.count for block in self.blocks)
+
+    def _archived(self) -> List[ConversationMessage]:
+        if self._cold is None:
+            self._cold = [
+                ConversationMessage(**msg) for block in self.blocks for msg in block.load()
+            ]
+        return self._cold
+
+    def __len__(self) -> int:
+        return self.archived_count + len(self.hot)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        archived = self.archived_count
+        if index >= archived:
+            return self.hot[index - archived]
+        return self._archived()[index]
+
+    def __iter__(self) -> Iterator[ConversationMessage]:
+        if self.blocks:
+            yield from self._archived()
+        yield from self.hot
+
+    def _thaw(self) -> None:
+        # Edits inside the archived range turn everything back into hot messages.
+        self.hot = self._archived() + self.hot
+        self.blocks = []
+        self._cold = None
+
+    def __setitem__(self, index, value) -> None:
+        self._thaw()
+        self.hot[index] = value
+
+    def __delitem__(self, index) -> None:
+        self._thaw()
+        del self.hot[index]
+
+    def insert(self, index: int, value: ConversationMessage) -> None:
+        archived = self.archived_count
+        if index >= len(self):
+            self.hot.append(value)
+        elif index >= archived:
+            self.hot.insert(index - archived, value)
+        else:
+            self._thaw()
+            self.hot.insert(index, value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MessageHistory, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageHistory(archived={self.archived_count}, hot={self.hot!r})"
 
 
 @dataclass
 class Conversation:
     id: str
     title: str
-    messages: List[ConversationMessage]
+    messages: MessageHistory | List[ConversationMessage]
+    seq: int = 0
+
+
+def _message(doc: Dict[str, str], bodies: Dict[str, str]) -> ConversationMessage:
+    content = doc.get("content")
+    if content is None:
+        content = bodies.get(doc.get("content_ref", ""), "")
+    return ConversationMessage(
+        role=doc["role"], content=content, timestamp=doc["timestamp"], seq=doc.get("seq", 0)
+    )
 
 
-_CACHE: Dict[str, Conversation] = {}
+def _from_docs(docs: Iterable[Dict[str, object]]) -> List[Conversation]:
+    """Build conversations, resolving all content references in one lookup."""
+    docs = list(docs)
+    refs = [
+        msg["content_ref"]
+        for doc in docs
+        for msg in doc.get("messages", [])
+        if "content_ref" in msg
+    ]
+    bodies = resolve_bodies(refs) if refs else {}
+    return [
+        Conversation(
+            id=doc["id"],
+            title=doc["title"],
+            messages=MessageHistory(
+                (_message(msg, bodies) for msg in doc.get("messages", [])),
+                (ArchivedBlock.from_doc(block) for block in doc.get("archived_blocks", [])),
+            ),
+            seq=doc.get("seq", 0),
+        )
+        for doc in docs
+    ]
+
+
+def _from_doc(doc: Dict[str, object]) -> Conversation:
+    return _from_docs([doc])[0]
+
+
+_CACHE: MutableMapping[str, Conversation] = LazyRecords()
 
 
 def _get_collection():
@@ -37,9 +168,10 @@ def _get_collection():
         return None
 
 
+@stamps_changes
 def create_conversation(title: str) -> Conversation:
     conv_id = str(uuid4())
-    conversation = Conversation(id=conv_id, title=title, messages=[])
+    conversation = Conversation(id=conv_id, title=title, messages=[], seq=next_seq())
 
     collection = _get_collection()
     if collection is not None:
@@ -49,6 +181,7 @@ def create_conversation(title: str) -> Conversation:
                     "id": conversation.id,
                     "title": conversation.title,
                     "messages": [],
+                    "seq": conversation.seq,
                 }
             )
             return conversation
@@ -59,22 +192,75 @@ def create_conversation(title: str) -> Conversation:
     return conversation
 
 
-def list_conversations() -> List[Conversation]:
+@stamps_changes
+def upsert_conversations(conversations: List[Conversation]) -> None:
+    """Insert or replace whole conversations by id in a single bulk write."""
+    if not conversations:
+        return
+    for conversation, seq in zip(conversations, next_seqs(len(conversations))):
+        conversation.seq = seq
+        for msg in conversation.messages:
+            msg.seq = seq
+    shared = [
+        msg.content
+        for conversation in conversations
+        for msg in conversation.messages
+        if should_dedup(msg.content)
+    ]
+
     collection = _get_collection()
     if collection is not None:
         try:
-            docs = collection.find({}, {"_id": 0})
-            return [
-                Conversation(
-                    id=doc["id"],
-                    title=doc["title"],
-                    messages=[
-                        ConversationMessage(**msg)
-                        for msg in doc.get("messages", [])
-                    ],
+            replaced = [
+                msg["content_ref"]
+                for doc in collection.find(
+                    {"id": {"$in": [conversation.id for conversation in conversations]}},
+                    {"_id": 0, "messages.content_ref": 1},
                 )
-                for doc in docs
+                for msg in doc.get("messages", [])
+                if "content_ref" in msg
             ]
+            digests = (put_bodies(shared, replaced) if shared or replaced else None) or {}
+            docs = []
+            for conversation in conversations:
+                messages = []
+                for msg in conversation.messages:
+                    stored: Dict[str, object] = dict(msg.__dict__)
+                    if msg.content in digests:
+                        del stored["content"]
+                        stored["content_ref"] = digests[msg.content]
+                    messages.append(stored)
+                docs.append(
+                    {
+                        "id": conversation.id,
+                        "title": conversation.title,
+                        "messages": messages,
+                        "seq": conversation.seq,
+                    }
+                )
+            collection.bulk_write(
+                [ReplaceOne({"id": doc["id"]}, doc, upsert=True) for doc in docs],
+                ordered=False,
+            )
+            return
+        except PyMongoError:
+            pass
+
+    for conversation in conversations:
+        previous = _CACHE.get(conversation.id)
+        if previous is not None:
+            release_bodies(msg.content for msg in previous.messages if should_dedup(msg.content))
+        for msg in conversation.messages:
+            if should_dedup(msg.content):
+                msg.content = intern_body(msg.content)
+        _CACHE[conversation.id] = conversation
+
+
+def list_conversations() -> List[Conversation]:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            return _from_docs(collection.find({}, {"_id": 0}))
         except PyMongoError:
             pass
 
@@ -87,47 +273,158 @@ def get_conversation(conv_id: str) -> Conversation | None:
         try:
             doc = collection.find_one({"id": conv_id}, {"_id": 0})
             if doc:
-                return Conversation(
-                    id=doc["id"],
-                    title=doc["title"],
-                    messages=[
-                        ConversationMessage(**msg)
-                        for msg in doc.get("messages", [])
-                    ],
-                )
+                return _from_doc(doc)
         except PyMongoError:
             pass
 
     return _CACHE.get(conv_id)
 
 
+@stamps_changes
 def append_message(conv_id: str, role: str, content: str) -> Conversation | None:
     timestamp = datetime.utcnow().isoformat() + "Z"
-    message = ConversationMessage(role=role, content=content, timestamp=timestamp)
+    seq = next_seq()
+    message = ConversationMessage(role=role, content=content, timestamp=timestamp, seq=seq)
+    dedup = should_dedup(content)
 
     collection = _get_collection()
-    if collection is not None is not None:
+    if collection is not None:
         try:
+            stored: Dict[str, str] = message.__dict__
+            digest = put_body(content) if dedup else None
+            if digest is not None:
+                stored = {"role": role, "content_ref": digest, "timestamp": timestamp, "seq": seq}
             result = collection.find_one_and_update(
                 {"id": conv_id},
-                {"$push": {"messages": message.__dict__}},
+                # $max: a concurrent append may land before this one.
+                {"$push": {"messages": stored}, "$max": {"seq": seq}},
                 projection={"_id": 0},
                 return_document=ReturnDocument.AFTER,
             )
             if result:
-                return Conversation(
-                    id=result["id"],
-                    title=result["title"],
-                    messages=[
-                        ConversationMessage(**msg)
-                        for msg in result.get("messages", [])
-                    ],
-                )
+                return _from_doc(result)
         except PyMongoError:
             pass
 
     conversation = _CACHE.get(conv_id)
     if not conversation:
         return None
+    if dedup:
+        message.content = intern_body(content)
     conversation.messages.append(message)
+    conversation.seq = max(conversation.seq, seq)
     return conversation
+
+
+def hot_messages(conversation: Conversation) -> List[ConversationMessage]:
+    messages = conversation.messages
+    return messages.hot if isinstance(messages, MessageHistory) else list(messages)
+
+
+def conversations_changed_between(after: int, until: int) -> List[Conversation]:
+    """Conversations with a change in after < seq <= until.
+
+    Besides those last written inside the window, this includes ones written
+    again since then that hold a message from the window. Results are not
+    limited or ordered, because a conversation's place in a sync page
+    depends on its messages as well as its own seq.
+    """
+    window = {"$gt": after, "$lte": until}
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            docs = collection.find(
+                {
+                    "$or": [
+                        {"seq": window},
+                        {"seq": {"$gt": until}, "messages": {"$elemMatch": {"seq": window}}},
+                    ]
+                },
+                {"_id": 0},
+            )
+            return _from_docs(docs)
+        except PyMongoError:
+            pass
+
+    changed = []
+    for conversation in list(_CACHE.values()):
+        if after < conversation.seq <= until or (
+            conversation.seq > until
+            and any(after < msg.seq <= until for msg in hot_messages(conversation))
+        ):
+            changed.append(conversation)
+    return changed
+
+
+@stamps_changes
+def backfill_conversation_seqs() -> int:
+    """Stamp conversations written before change tracking, and their messages.
+
+    Without a seq they never match a sync window, not even a resync from 0.
+    Only MongoDB can hold such conversations.
+    """
+    collection = _get_collection()
+    if collection is None:
+        return 0
+    unstamped = {"$in": [None, 0]}
+    try:
+        ids = [doc["id"] for doc in collection.find({"seq": unstamped}, {"_id": 0, "id": 1})]
+        if ids:
+            collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"id": conv_id, "seq": unstamped},
+                        {"$set": {"seq": seq, "messages.$[legacy].seq": seq}},
+                        array_filters=[{"legacy.seq": unstamped}],
+                    )
+                    for conv_id, seq in zip(ids, next_seqs(len(ids)))
+                ],
+                ordered=False,
+            )
+        return len(ids)
+    except PyMongoError:
+        return 0
+
+
+def iter_conversation_batches(batch_size: int) -> Iterator[List[Conversation]]:
+    """Yield every conversation in batches, without loading the whole corpus."""
+    batch_size = max(1, batch_size)
+    collection = _get_collection()
+    if collection is not None:
+        yielded = False
+        try:
+            docs: List[Dict[str, object]] = []
+            for doc in collection.find({}, {"_id": 0}).batch_size(batch_size):
+                docs.append(doc)
+                if len(docs) == batch_size:
+                    yielded = True
+                    yield _from_docs(docs)
+                    docs = []
+            if docs:
+                yield _from_docs(docs)
+            return
+        except PyMongoError:
+            # Falling back halfway through would mix two corpora.
+            if yielded:
+                raise
+
+    conv_ids = list(_CACHE)
+    for start in range(0, len(conv_ids), batch_size):
+        batch = [
+            _CACHE[conv_id]
+            for conv_id in conv_ids[start : start + batch_size]
+            if conv_id in _CACHE
+        ]
+        if batch:
+            yield batch
+
+
+def count_conversations() -> int:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            return collection.count_documents({})
+        except PyMongoError:
+            pass
+
+    return len(_CACHE)
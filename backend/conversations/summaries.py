@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo.errors import PyMongoError
+
+from backend.config import get_settings
+from backend.conversations.store import Conversation, ConversationMessage, get_conversation
+from backend.db.mongo import get_mongo_client
+from backend.integrations.context import estimate_tokens, truncate_to_tokens
+from backend.integrations.model_tiers import SUMMARIZER
+from backend.integrations.ollama_client import OllamaMessage, chat_ollama
+
+
+# Upper bound on messages folded into the running summary per LLM call; the
+# token budget usually cuts a chunk shorter.
+FOLD_CHUNK_SIZE = 12
+# Headroom for the fold instructions and chat template tokens.
+_FOLD_PROMPT_TOKENS = 64
+
+
+@dataclass
+class ConversationSummary:
+    conversation_id: str
+    summary: str
+    message_count: int
+    updated_at: str
+
+
+_SUMMARIES: Dict[str, ConversationSummary] = {}
+
+
+def _get_collection():
+    try:
+        client = get_mongo_client()
+        db = client.get_default_database()
+        return db["conversation_summaries"]
+    except Exception:
+        return None
+
+
+def get_stored_summary(conv_id: str) -> ConversationSummary | None:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"conversation_id": conv_id}, {"_id": 0})
+            if doc:
+                return ConversationSummary(**doc)
+        except PyMongoError:
+            pass
+
+    return _SUMMARIES.get(conv_id)
+
+
+def save_summary(record: ConversationSummary) -> ConversationSummary:
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            collection.update_one(
+                {"conversation_id": record.conversation_id},
+                {"$set": record.__dict__},
+                upsert=True,
+            )
+            return record
+        except PyMongoError:
+            pass
+
+    _SUMMARIES[record.conversation_id] = record
+    return record
+
+
+def _next_chunk(
+    messages: List[ConversationMessage], start: int, budget: int
+) -> List[str]:
+    lines: List[str] = []
+    used = 0
+    for msg in messages[start : start + FOLD_CHUNK_SIZE]:
+        line = f"{msg.role}: {msg.content}"
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            if not lines:
+                lines.append(truncate_to_tokens(line, max(1, budget)))
+            break
+        lines.append(line)
+        used += cost
+    return lines
+
+
+def _fold(previous: str, lines: List[str]) -> str:
+    joined = "\n".join(lines)
+    if previous:
+        system_text = (
+            "Update the running summary of a conversation with the new messages. "
+            "Reply with the updated summary in 2-3 short sentences."
+        )
+        user_text = f"Summary so far:\n{previous}\n\nNew messages:\n{joined}"
+    else:
+        system_text = "Summarize this conversation in 2-3 short sentences."
+        user_text = joined
+
+    result = chat_ollama(
+        [
+            OllamaMessage(role="system", content=system_text),
+            OllamaMessage(role="user", content=user_text),
+        ],
+        tier=SUMMARIZER,
+    )
+    return result.message.strip()
+
+
+def build_summary(conversation: Conversation) -> ConversationSummary:
+    """Return an LLM summary covering every message, folding in only new ones.
+
+    A stored summary whose message_count matches the conversation is returned
+    without calling the LLM. Otherwise the messages appended since the stored
+    version are folded in chunks that fit the LLM context budget, persisting
+    after each fold so a failure part-way keeps the progress made so far.
+    """
+    total = len(conversation.messages)
+    stored = get_stored_summary(conversation.id)
+    if stored and stored.message_count == total:
+        return stored
+
+    summary = ""
+    covered = 0
+    if stored and stored.message_count < total:
+        summary = stored.summary
+        covered = stored.message_count
+
+    budget = get_settings().llm_context_budget - _FOLD_PROMPT_TOKENS
+    # The running summary may use at most half the budget, so a long summary
+    # cannot squeeze the new messages down to nothing.
+    summary_budget = budget // 2
+    record = stored
+    while covered < total:
+        summary = truncate_to_tokens(summary, summary_budget)
+        chunk = _next_chunk(
+            conversation.messages, covered, budget - estimate_tokens(summary)
+        )
+        folded = _fold(summary, chunk)
+        if not folded:
+            raise ValueError("Empty summary from LLM")
+        summary = folded
+        covered += len(chunk)
+        record = save_summary(
+            ConversationSummary(
+                conversation_id=conversation.id,
+                summary=summary,
+                message_count=covered,
+                updated_at=datetime.utcnow().isoformat() + "Z",
+            )
+        )
+
+    return record
+
+
+def refresh_summary(conv_id: str) -> None:
+    """Background hook run after a message is appended."""
+    conversation = get_conversation(conv_id)
+    if not conversation or not conversation.messages:
+        return
+    try:
+        build_summary(conversation)
+    except Exception:
+        pass
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+
+# Snapshot layout, one generation per pair of files:
+#   <name>.dat  magic, then records: u32 length, u8 kind, payload
+#   <name>.idx  magic, u64 count, count * (u8 kind, u64 offset, u32 length,
+#               u32 id length), then every id concatenated as UTF-8
+# Offsets point at payloads, so a record is one slice of the mapped file.
+DATA_MAGIC = b"PAESDAT1"
+INDEX_MAGIC = b"PAESIDX1"
+_RECORD = struct.Struct("<IB")
+_COUNT = struct.Struct("<Q")
+_ENTRY = struct.Struct("<BQII")
+
+
+class SnapshotFormatError(ValueError):
+    pass
+
+
+class SnapshotReader:
+    """A memory-mapped snapshot; payloads are sliced out on demand."""
+
+    def __init__(self, data_path: str, index_path: str) -> None:
+        with open(data_path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            self._map = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        if self._map[: len(DATA_MAGIC)] != DATA_MAGIC:
+            raise SnapshotFormatError(f"{data_path} is not a snapshot data file")
+        with open(index_path, "rb") as handle:
+            self._index = handle.read()
+        if self._index[: len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise SnapshotFormatError(f"{index_path} is not a snapshot index")
+
+    def entries(self) -> Iterator[Tuple[int, str, int, int]]:
+        """Yield (kind, id, offset, length) for every record, in file order."""
+        (count,) = _COUNT.unpack_from(self._index, len(INDEX_MAGIC))
+        start = len(INDEX_MAGIC) + _COUNT.size
+        end = start + count * _ENTRY.size
+        ids = self._index[end:]
+        # Lengths are in bytes, which equal characters for ASCII ids (uuids).
+        text = ids.decode("ascii") if ids.isascii() else None
+        position = 0
+        for kind, offset, length, id_length in _ENTRY.iter_unpack(self._index[start:end]):
+            if text is not None:
+                record_id = text[position : position + id_length]
+            else:
+                record_id = ids[position : position + id_length].decode("utf-8")
+            yield kind, record_id, offset, length
+            position += id_length
+
+    def payload(self, offset: int, length: int) -> bytes:
+        return self._map[offset : offset + length]
+
+
+def write_snapshot_files(
+    data_path: str, index_path: str, records: Iterable[Tuple[int, str, bytes]]
+) -> int:
+    """Write (kind, id, payload) records and their index; returns the record count.
+
+    Both files are fsynced before returning.
+    """
+    entries: List[Tuple[int, int, int, int]] = []
+    ids: List[bytes] = []
+    with open(data_path, "wb") as data:
+        data.write(DATA_MAGIC)
+        offset = len(DATA_MAGIC)
+        for kind, record_id, payload in records:
+            data.write(_RECORD.pack(len(payload), kind))
+            data.write(payload)
+            offset += _RECORD.size
+            encoded_id = record_id.encode("utf-8")
+            entries.append((kind, offset, len(payload), len(encoded_id)))
+            ids.append(encoded_id)
+            offset += len(payload)
+        data.flush()
+        os.fsync(data.fileno())
+
+    with open(index_path, "wb") as index:
+        index.write(INDEX_MAGIC)
+        index.write(_COUNT.pack(len(entries)))
+        index.write(b"".join(_ENTRY.pack(*entry) for entry in entries))
+        index.write(b"".join(ids))
+        index.flush()
+        os.fsync(index.fileno())
+    return len(entries)
+
+
+class _Segment:
+    """Where a batch of attached records lives and how to decode them."""
+
+    __slots__ = ("reader", "decode")
+
+    def __init__(self, reader: SnapshotReader, decode: Callable) -> None:
+        self.reader = reader
+        self.decode = decode
+
+
+class LazyRecords(MutableMapping):
+    """The in-memory store's id -> record dict, restorable from a snapshot.
+
+    Restored entries stay as offsets into the mapped snapshot until they are
+    first read, so startup cost does not depend on record size and records
+    nobody asks for are never decoded. Key order is kept like a dict's.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, reader: SnapshotReader, entries: Iterable[Tuple[str, int, int]], decode: Callable) -> int:
+        """Add (id, offset, length) records from a snapshot without decoding them."""
+        segment = _Segment(reader, decode)
+        setdefault = self._entries.setdefault
+        count = 0
+        # Undecoded entries are (segment, offset, length) tuples; records never are.
+        for record_id, offset, length in entries:
+            setdefault(record_id, (segment, offset, length))
+            count += 1
+        return count
+
+    def __getitem__(self, key: str):
+        value = self._entries[key]
+        if type(value) is not tuple:
+            return value
+        with self._lock:
+            # Decode once, so every reader mutates the same record object.
+            value = self._entries[key]
+            if type(value) is tuple:
+                segment, offset, length = value
+                value = self._entries[key] = segment.decode(segment.reader.payload(offset, length))
+            return value
+
+    def __setitem__(self, key: str, value) -> None:
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def encoded_count(self) -> int:
+        return sum(1 for value in list(self._entries.values()) if type(value) is tuple)
+
+    def snapshot_items(self) -> List[Tuple[str, object, bytes | None]]:
+        """Point-in-time (id, record, raw payload) list; raw is set for undecoded entries."""
+        items = []
+        for key, value in list(self._entries.items()):
+            if type(value) is tuple:
+                segment, offset, length = value
+                items.append((key, None, segment.reader.payload(offset, length)))
+            else:
+                items.append((key, value, None))
+        return items
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+from backend.config import get_settings
+from backend.conversations import cold_storage
+from backend.conversations import store as conversation_store
+from backend.conversations.cold_storage import ArchiveDictionary
+from backend.conversations.store import Conversation, MessageHistory
+from backend.db.snapshot_file import LazyRecords, SnapshotReader, write_snapshot_files
+from backend.profiles import store as profile_store
+from backend.profiles.store import Profile
+from backend.sync import store as sync_store
+from backend.sync.store import Tombstone
+from backend.tasks import store as task_store
+from backend.tasks.store import TaskItem
+
+
+# Point-in-time copies of the in-memory fallback stores, so a restart without
+# MongoDB does not lose data. Records are compact JSON payloads in the binary
+# layout of backend/db/snapshot_file.py; CURRENT names the live generation and
+# is swapped atomically once both of its files are on disk.
+KIND_TASK = 1
+KIND_CONVERSATION = 2
+KIND_PROFILE = 3
+KIND_TOMBSTONE = 4
+KIND_COUNTERS = 5
+# Preset dictionaries of archived blocks; without them the blocks cannot be read.
+KIND_DICTIONARY = 6
+_POINTER = "CURRENT"
+_PREFIX = "snapshot-"
+
+
+@dataclass
+class SnapshotInfo:
+    generation: str
+    records: int
+    bytes: int
+    elapsed_ms: float
+
+
+_LOCK = threading.Lock()
+_STATE: Dict[str, object] = {"last_seq": None, "last_profile": None, "last": None}
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _dumps(value: object) -> bytes:
+    return _ENCODER.encode(value).encode("utf-8")
+
+
+def _conversation_doc(conversation: Conversation) -> Dict[str, object]:
+    messages = conversation.messages
+    hot = messages.hot if isinstance(messages, MessageHistory) else list(messages)
+    blocks = messages.blocks if isinstance(messages, MessageHistory) else []
+    return {
+        "id": conversation.id,
+        "title": conversation.title,
+        "seq": conversation.seq,
+        "messages": [msg.__dict__ for msg in hot],
+        "archived_blocks": [
+            {**block.to_doc(), "data": base64.b64encode(block.data).decode("ascii")}
+            for block in blocks
+        ],
+    }
+
+
+def _dictionary_doc(dictionary: ArchiveDictionary) -> Dict[str, object]:
+    return {**dictionary.__dict__, "zdict": base64.b64encode(dictionary.zdict).decode("ascii")}
+
+
+def _decode_dictionary(payload: bytes) -> ArchiveDictionary:
+    doc = json.loads(payload)
+    doc["zdict"] = base64.b64decode(doc["zdict"])
+    return ArchiveDictionary(**doc)
+
+
+def _decode_task(payload: bytes) -> TaskItem:
+    return TaskItem(**json.loads(payload))
+
+
+def _decode_conversation(payload: bytes) -> Conversation:
+    doc = json.loads(payload)
+    for block in doc.get("archived_blocks", []):
+        block["data"] = base64.b64decode(block["data"])
+    return conversation_store._from_doc(doc)
+
+
+def _lazy_records(mapping, kind: int, encode) -> Iterator[Tuple[int, str, bytes]]:
+    if isinstance(mapping, LazyRecords):
+        items = mapping.snapshot_items()
+    else:
+        items = [(key, value, None) for key, value in list(mapping.items())]
+    for key, value, raw in items:
+        # Records never read since the last restore are copied without decoding.
+        yield kind, key, raw if raw is not None else _dumps(encode(value))
+
+
+def _records() -> Iterator[Tuple[int, str, bytes]]:
+    yield KIND_COUNTERS, "counters", _dumps(dict(sync_store._COUNTERS))
+    yield KIND_PROFILE, "default", _dumps(profile_store._PROFILE_CACHE["default"].__dict__)
+    for key, tombstone in list(sync_store._TOMBSTONES.items()):
+        yield KIND_TOMBSTONE, key, _dumps(tombstone.__dict__)
+    for key, dictionary in list(cold_storage._DICTIONARIES.items()):
+        yield KIND_DICTIONARY, key, _dumps(_dictionary_doc(dictionary))
+    yield from _lazy_records(task_store._TASKS, KIND_TASK, lambda task: task.__dict__)
+    yield from _lazy_records(conversation_store._CACHE, KIND_CONVERSATION, _conversation_doc)
+
+
+def _generations(directory: str) -> List[str]:
+    return sorted(
+        name[: -len(".dat")]
+        for name in os.listdir(directory)
+        if name.startswith(_PREFIX) and name.endswith(".dat")
+    )
+
+
+def current_generation(directory: str) -> str | None:
+    try:
+        with open(os.path.join(directory, _POINTER), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(directory: str | None = None) -> SnapshotInfo:
+    """Write a new snapshot generation and make it current.
+
+    Store dicts are copied entry by entry without a global lock, so requests
+    keep running; each record is consistent, and the set of records is the
+    one present when the copy reached it.
+    """
+    directory = directory or get_settings().snapshot_dir
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    with _LOCK:
+        generation = f"{_PREFIX}{time.time_ns()}"
+        base = os.path.join(directory, generation)
+        records = write_snapshot_files(f"{base}.dat", f"{base}.idx", _records())
+
+        pointer = os.path.join(directory, f"{_POINTER}.tmp")
+        with open(pointer, "w", encoding="utf-8") as handle:
+            handle.write(generation)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(pointer, os.path.join(directory, _POINTER))
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+        # Old generations can go: mapped files stay readable after unlink.
+        for old in _generations(directory):
+            if old != generation:
+                for suffix in (".dat", ".idx"):
+                    try:
+                        os.remove(os.path.join(directory, old + suffix))
+                    except FileNotFoundError:
+                        pass
+
+    info = SnapshotInfo(
+        generation=generation,
+        records=records,
+        bytes=os.path.getsize(f"{base}.dat") + os.path.getsize(f"{base}.idx"),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    _STATE["last"] = info
+    return info
+
+
+def restore_snapshot(directory: str | None = None) -> Dict[str, int]:
+    """Load the current snapshot into the in-memory stores.
+
+    Tasks and conversations are attached as offsets into the mapped file and
+    decoded on first access; ids already present in a store are kept.
+    """
+    directory = directory or get_settings().snapshot_dir
+    generation = current_generation(directory) if directory else None
+    if not generation:
+        return {"tasks": 0, "conversations": 0, "tombstones": 0, "dictionaries": 0}
+
+    base = os.path.join(directory, generation)
+    reader = SnapshotReader(f"{base}.dat", f"{base}.idx")
+    tasks: List[Tuple[str, int, int]] = []
+    conversations: List[Tuple[str, int, int]] = []
+    tombstones = 0
+    dictionaries = 0
+    for kind, record_id, offset, length in reader.entries():
+        if kind == KIND_TASK:
+            tasks.append((record_id, offset, length))
+        elif kind == KIND_CONVERSATION:
+            conversations.append((record_id, offset, length))
+        elif kind == KIND_TOMBSTONE:
+            sync_store._TOMBSTONES.setdefault(record_id, Tombstone(**json.loads(reader.payload(offset, length))))
+            tombstones += 1
+        elif kind == KIND_DICTIONARY:
+            cold_storage._DICTIONARIES.setdefault(record_id, _decode_dictionary(reader.payload(offset, length)))
+            dictionaries += 1
+        elif kind == KIND_PROFILE:
+            profile_store._PROFILE_CACHE["default"] = Profile(**json.loads(reader.payload(offset, length)))
+        elif kind == KIND_COUNTERS:
+            for key, value in json.loads(reader.payload(offset, length)).items():
+                sync_store._COUNTERS[key] = max(sync_store._COUNTERS.get(key, 0), int(value))
+
+    restored = {
+        "tasks": _attach(task_store._TASKS, reader, tasks, _decode_task),
+        "conversations": _attach(conversation_store._CACHE, reader, conversations, _decode_conversation),
+        "tombstones": tombstones,
+        "dictionaries": dictionaries,
+    }
+    # What was just restored is already on disk; the next tick need not rewrite it.
+    _STATE["last_seq"] = sync_store._COUNTERS["changes"]
+    _STATE["last_profile"] = dict(profile_store._PROFILE_CACHE["default"].__dict__)
+    return restored
+
+
+def _attach(mapping, reader: SnapshotReader, entries: List[Tuple[str, int, int]], decode) -> int:
+    if isinstance(mapping, LazyRecords):
+        return mapping.attach(reader, entries, decode)
+    for record_id, offset, length in entries:
+        mapping.setdefault(record_id, decode(reader.payload(offset, length)))
+    return len(entries)
+
+
+def snapshot_if_changed() -> SnapshotInfo | None:
+    """Write a snapshot unless nothing was written to the stores since the last one."""
+    seq = sync_store._COUNTERS["changes"]
+    profile = dict(profile_store._PROFILE_CACHE["default"].__dict__)
+    if seq == _STATE["last_seq"] and profile == _STATE["last_profile"]:
+        return None
+    info = write_snapshot()
+    _STATE["last_seq"] = seq
+    _STATE["last_profile"] = profile
+    return info
+
+
+def last_snapshot() -> SnapshotInfo | None:
+    return _STATE["last"]
+
+
+def start_snapshots() -> threading.Thread | None:
+    """Start the daemon thread that snapshots the in-memory stores periodically."""
+    if not get_settings().snapshot_dir:
+        return None
+
+    def loop() -> None:
+        while True:
+            time.sleep(max(1.0, get_settings().snapshot_interval_seconds))
+            try:
+                snapshot_if_changed()
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=loop, name="store-snapshots", daemon=True)
+    thread.start()
+    return thread
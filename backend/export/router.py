@@ -1,30 +1,38 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import List
 
-from backend.conversations.store import list_conversations
-from backend.profiles.store import get_profile
-from backend.tasks.store import list_tasks
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from backend.export.stream import COLLECTIONS, FORMATS, export_stream
 
 
 router = APIRouter(prefix="/v1/export", tags=["export"])
 
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
 
 @router.get("/all")
-def export_all() -> dict:
-	profile = get_profile()
-	tasks = list_tasks()
-	conversations = list_conversations()
-
-	return {
-		"profile": profile.__dict__,
-		"tasks": [task.__dict__ for task in tasks],
-		"conversations": [
-			{
-				"id": conv.id,
-				"title": conv.title,
-				"messages": [msg.__dict__ for msg in conv.messages],
-			}
-			for conv in conversations
-		],
-	}
+def export_all(
+	format: str = "json",
+	collection: List[str] = Query(None),
+	gzip: bool = False,
+) -> StreamingResponse:
+	"""Stream the export; memory use does not grow with the amount of data."""
+	if format not in FORMATS:
+		raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(FORMATS)}")
+	selected = collection or list(COLLECTIONS)
+	unknown = sorted(set(selected) - set(COLLECTIONS))
+	if unknown:
+		raise HTTPException(status_code=422, detail=f"Unknown collection: {', '.join(unknown)}")
+	ordered = [name for name in COLLECTIONS if name in selected]
+
+	headers = {"Content-Disposition": f'attachment; filename="export.{format}"'}
+	if gzip:
+		headers["Content-Encoding"] = "gzip"
+	return StreamingResponse(
+		export_stream(format, ordered, gzip=gzip),
+		media_type=MEDIA_TYPES[format],
+		headers=headers,
+	)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, List
+
+from backend.conversations.store import Conversation, iter_conversation_batches
+from backend.profiles.store import get_profile
+from backend.tasks.store import iter_task_batches
+
+
+COLLECTIONS = ("profile", "tasks", "conversations")
+FORMATS = ("json", "ndjson")
+# Records are read from the stores this many at a time.
+EXPORT_BATCH = 100
+# Output is flushed in chunks of roughly this size rather than per record.
+CHUNK_BYTES = 64 * 1024
+
+
+def _conversation_doc(conversation: Conversation) -> Dict[str, object]:
+    return {
+        "id": conversation.id,
+        "title": conversation.title,
+        "messages": [msg.__dict__ for msg in conversation.messages],
+    }
+
+
+def iter_records(collection: str) -> Iterator[Dict[str, object]]:
+    if collection == "profile":
+        yield get_profile().__dict__
+    elif collection == "tasks":
+        for batch in iter_task_batches(EXPORT_BATCH):
+            for task in batch:
+                yield task.__dict__
+    elif collection == "conversations":
+        for batch in iter_conversation_batches(EXPORT_BATCH):
+            for conversation in batch:
+                yield _conversation_doc(conversation)
+
+
+def ndjson_lines(collections: Iterable[str]) -> Iterator[str]:
+    """One {"type": ..., "data": ...} object per line; the format /v1/import reads back."""
+    for collection in collections:
+        for record in iter_records(collection):
+            yield json.dumps({"type": collection, "data": record}, ensure_ascii=False) + "\n"
+
+
+def json_chunks(collections: Iterable[str]) -> Iterator[str]:
+    """The /v1/export/all document, written one record at a time."""
+    yield "{"
+    for index, collection in enumerate(collections):
+        yield ("," if index else "") + json.dumps(collection) + ":"
+        if collection == "profile":
+            yield json.dumps(get_profile().__dict__, ensure_ascii=False)
+            continue
+        yield "["
+        for position, record in enumerate(iter_records(collection)):
+            yield ("," if position else "") + json.dumps(record, ensure_ascii=False)
+        yield "]"
+    yield "}"
+
+
+def buffered(parts: Iterable[str], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    pending: List[bytes] = []
+    pending_bytes = 0
+    for part in parts:
+        data = part.encode("utf-8")
+        pending.append(data)
+        pending_bytes += len(data)
+        if pending_bytes >= size:
+            yield b"".join(pending)
+            pending = []
+            pending_bytes = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    deflater = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = deflater.compress(chunk)
+        if data:
+            yield data
+    yield deflater.flush()
+
+
+def export_stream(fmt: str, collections: List[str], gzip: bool = False) -> Iterator[bytes]:
+    parts = ndjson_lines(collections) if fmt == "ndjson" else json_chunks(collections)
+    chunks = buffered(parts)
+    return gzipped(chunks) if gzip else chunks
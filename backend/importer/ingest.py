@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel, Field, ValidationError
+
+from backend.conversations.store import Conversation, ConversationMessage, upsert_conversations
+from backend.profiles.store import update_profile
+from backend.tasks.store import TaskItem, upsert_tasks
+
+
+# Records are written with one bulk write per collection per batch.
+IMPORT_BATCH = 500
+# Only the first few invalid records are described in the summary.
+MAX_REPORTED_ERRORS = 20
+
+
+class TaskRecord(BaseModel):
+    id: str = Field(..., min_length=1)
+    title: str = Field(..., min_length=1)
+    details: str = Field(default="")
+    priority: str = Field(default="medium", pattern="^(low|medium|high)$")
+    status: str = Field(default="pending", pattern="^(pending|in_progress|done)$")
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+class MessageRecord(BaseModel):
+    role: str = Field(..., pattern="^(user|assistant|system)$")
+    content: str
+    timestamp: str
+
+
+class ConversationRecord(BaseModel):
+    id: str = Field(..., min_length=1)
+    title: str = Field(..., min_length=1)
+    messages: List[MessageRecord] = Field(default_factory=list)
+
+
+class ProfileRecord(BaseModel):
+    display_name: str | None = Field(default=None, min_length=1)
+    timezone: str | None = Field(default=None, min_length=1)
+    privacy_mode: str | None = Field(default=None, pattern="^(strict|balanced|open)$")
+    data_retention_days: int | None = Field(default=None, ge=1, le=3650)
+    local_only: bool | None = None
+
+
+@dataclass
+class ImportSummary:
+    tasks: int = 0
+    conversations: int = 0
+    messages: int = 0
+    profile: int = 0
+    invalid: int = 0
+    errors: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def snapshot(self) -> Dict[str, object]:
+        elapsed = time.perf_counter() - self.started
+        records = self.tasks + self.conversations + self.profile
+        return {
+            "tasks": self.tasks,
+            "conversations": self.conversations,
+            "messages": self.messages,
+            "profile": self.profile,
+            "invalid": self.invalid,
+            "errors": self.errors,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "records_per_second": round(records / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+class Importer:
+    """Validates records as they arrive and upserts them by id in batches.
+
+    Duplicate ids within a batch keep the last record, so importing the same
+    export twice leaves the stores unchanged apart from new change sequences.
+    """
+
+    def __init__(self, batch_size: int = IMPORT_BATCH) -> None:
+        self.batch_size = max(1, batch_size)
+        self.summary = ImportSummary()
+        self._tasks: Dict[str, TaskItem] = {}
+        self._conversations: Dict[str, Conversation] = {}
+
+    def _reject(self, where: str, reason: str) -> None:
+        self.summary.invalid += 1
+        if len(self.summary.errors) < MAX_REPORTED_ERRORS:
+            self.summary.errors.append(f"{where}: {reason}")
+
+    def add(self, collection: str, data: object, position: int = 0) -> None:
+        where = f"{collection or 'record'}[{position}]" if position else collection or "record"
+        if not collection:
+            self._reject(where, str(data))
+            return
+        try:
+            if collection == "tasks":
+                self._add_task(TaskRecord.model_validate(data))
+            elif collection == "conversations":
+                self._add_conversation(ConversationRecord.model_validate(data))
+            elif collection == "profile":
+                record = ProfileRecord.model_validate(data)
+                update_profile(record.model_dump(exclude_none=True))
+                self.summary.profile += 1
+            else:
+                self._reject(where, f"unknown collection '{collection}'")
+        except ValidationError as exc:
+            errors = exc.errors()
+            location = ".".join(str(part) for part in errors[0]["loc"]) if errors else ""
+            self._reject(where, f"{location}: {errors[0]['msg']}" if errors else str(exc))
+
+    def _add_task(self, record: TaskRecord) -> None:
+        now = datetime.utcnow().isoformat()
+        self._tasks[record.id] = TaskItem(
+            id=record.id,
+            title=record.title,
+            details=record.details,
+            priority=record.priority,
+            status=record.status,
+            created_at=record.created_at or now,
+            updated_at=record.updated_at or now,
+        )
+
+    def _add_conversation(self, record: ConversationRecord) -> None:
+        self._conversations[record.id] = Conversation(
+            id=record.id,
+            title=record.title,
+            messages=[
+                ConversationMessage(role=msg.role, content=msg.content, timestamp=msg.timestamp)
+                for msg in record.messages
+            ],
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks) + len(self._conversations)
+
+    def flush(self) -> None:
+        tasks = list(self._tasks.values())
+        conversations = list(self._conversations.values())
+        self._tasks = {}
+        self._conversations = {}
+        upsert_tasks(tasks)
+        upsert_conversations(conversations)
+        self.summary.tasks += len(tasks)
+        self.summary.conversations += len(conversations)
+        self.summary.messages += sum(len(conv.messages) for conv in conversations)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Iterator, List, Tuple
+
+
+# A record that is still incomplete after this many characters is treated
+# as malformed rather than buffered forever.
+MAX_RECORD_CHARS = 16 * 1024 * 1024
+
+# (collection, record or an error message, position for error reports)
+Item = Tuple[str, object, int]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class NdjsonReader:
+    """Reads the /v1/export/all?format=ndjson layout one line at a time.
+
+    A malformed line is reported as an error item and reading continues.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._partial = ""
+        self._line = 0
+
+    def feed(self, data: bytes) -> Iterator[Item]:
+        try:
+            text = self._partial + self._decoder.decode(data)
+        except UnicodeDecodeError as exc:
+            line = self._line + 1 + data[: exc.start].count(b"\n")
+            raise ImportFormatError(f"Line {line} is not valid UTF-8") from exc
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        if len(self._partial) > MAX_RECORD_CHARS:
+            raise ImportFormatError(f"Line {self._line + 1} exceeds {MAX_RECORD_CHARS} characters")
+        for line in lines:
+            yield from self._parse(line)
+
+    def finish(self) -> Iterator[Item]:
+        try:
+            tail = self._partial + self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            raise ImportFormatError(f"Line {self._line + 1} is not valid UTF-8") from exc
+        self._partial = ""
+        yield from self._parse(tail)
+
+    def _parse(self, line: str) -> Iterator[Item]:
+        self._line += 1
+        if not line.strip():
+            return
+        try:
+            item = json.loads(line)
+            yield str(item["type"]), item["data"], self._line
+        except (ValueError, KeyError, TypeError) as exc:
+            yield "", f"invalid line: {exc}", self._line
+
+
+class DocumentReader:
+    """Reads the /v1/export/all JSON document without holding all of it.
+
+    Each top-level key is either one record (the profile) or an array whose
+    elements are decoded and handed out as soon as they are complete.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+        self._key = ""
+        self._index = 0
+
+    def feed(self, data: bytes) -> Iterator[Item]:
+        self._buffer += self._decode(data)
+        items = self._drain()
+        if len(self._buffer) > MAX_RECORD_CHARS:
+            raise ImportFormatError(f"Record in '{self._key}' exceeds {MAX_RECORD_CHARS} characters")
+        return iter(items)
+
+    def finish(self) -> Iterator[Item]:
+        self._buffer += self._decode(b"", final=True)
+        items = self._drain()
+        if self._state != "end" or self._buffer.strip():
+            raise ImportFormatError("Truncated or malformed JSON document")
+        return iter(items)
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final=final)
+        except UnicodeDecodeError as exc:
+            where = f"'{self._key}'" if self._key else "the document"
+            raise ImportFormatError(f"Invalid UTF-8 in {where}") from exc
+
+    def _drain(self) -> List[Item]:
+        items: List[Item] = []
+        text = self._buffer
+        pos = 0
+        while True:
+            while pos < len(text) and text[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(text):
+                break
+            char = text[pos]
+            if self._state == "start":
+                if char != "{":
+                    raise ImportFormatError("Expected a JSON object")
+                pos += 1
+                self._state = "key"
+            elif self._state == "key":
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "}":
+                    pos += 1
+                    self._state = "end"
+                    continue
+                try:
+                    self._key, end = self._json.raw_decode(text, pos)
+                except ValueError:
+                    break
+                pos = end
+                self._state = "colon"
+            elif self._state == "colon":
+                if char != ":":
+                    raise ImportFormatError(f"Expected ':' after '{self._key}'")
+                pos += 1
+                self._state = "value"
+            elif self._state == "value":
+                if char == "[":
+                    pos += 1
+                    self._index = 0
+                    self._state = "items"
+                    continue
+                try:
+                    value, end = self._json.raw_decode(text, pos)
+                except ValueError:
+                    break
+                items.append((self._key, value, 0))
+                pos = end
+                self._state = "key"
+            elif self._state == "items":
+                if char == ",":
+                    pos += 1
+                    continue
+                if char == "]":
+                    pos += 1
+                    self._state = "key"
+                    continue
+                try:
+                    value, end = self._json.raw_decode(text, pos)
+                except ValueError:
+                    break
+                self._index += 1
+                items.append((self._key, value, self._index))
+                pos = end
+            else:
+                raise ImportFormatError("Unexpected data after the JSON document")
+        self._buffer = text[pos:]
+        return items
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Iterable, Iterator
+
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from backend.audit.store import log_event
+from backend.importer.ingest import Importer
+from backend.importer.parse import DocumentReader, ImportFormatError, Item, NdjsonReader
+
+
+router = APIRouter(prefix="/v1/import", tags=["import"])
+
+# Gzip bodies are inflated at most this many bytes at a time, so a small
+# request cannot expand into one huge buffer.
+INFLATE_CHUNK = 1024 * 1024
+
+
+def _inflate(inflater, chunk: bytes) -> Iterator[bytes]:
+	data = inflater.decompress(chunk, INFLATE_CHUNK)
+	while True:
+		if data:
+			yield data
+		if not inflater.unconsumed_tail and len(data) < INFLATE_CHUNK:
+			return
+		data = inflater.decompress(inflater.unconsumed_tail, INFLATE_CHUNK)
+
+
+def _ingest(importer: Importer, read: Callable[..., Iterable[Item]], *args: bytes) -> None:
+	# Runs in the threadpool: parsing is CPU work and profile records are
+	# written straight to the (blocking) store.
+	for collection, data, position in read(*args):
+		importer.add(collection, data, position)
+	if importer.pending >= importer.batch_size:
+		importer.flush()
+
+
+@router.post("")
+async def import_data(request: Request, format: str | None = None) -> dict:
+	"""Restore an export: tasks and conversations are upserted by id.
+
+	The body is parsed as it streams in (gzip allowed via Content-Encoding),
+	invalid records are counted and skipped, and each batch is written with
+	one bulk write per collection.
+	"""
+	fmt = format or ("ndjson" if "ndjson" in request.headers.get("content-type", "") else "json")
+	if fmt not in {"json", "ndjson"}:
+		raise HTTPException(status_code=422, detail="format must be one of json, ndjson")
+	reader = NdjsonReader() if fmt == "ndjson" else DocumentReader()
+	inflater = None
+	if request.headers.get("content-encoding", "").lower() == "gzip":
+		inflater = zlib.decompressobj(47)
+
+	importer = Importer()
+	try:
+		async for chunk in request.stream():
+			pieces = _inflate(inflater, chunk) if inflater is not None else [chunk]
+			for piece in pieces:
+				await run_in_threadpool(_ingest, importer, reader.feed, piece)
+		if inflater is not None:
+			await run_in_threadpool(_ingest, importer, reader.feed, inflater.flush())
+		await run_in_threadpool(_ingest, importer, reader.finish)
+		await run_in_threadpool(importer.flush)
+	except (ImportFormatError, zlib.error) as exc:
+		# Batches already written stay; re-running the import is safe.
+		await run_in_threadpool(importer.flush)
+		summary = importer.summary.snapshot()
+		await run_in_threadpool(log_event, "data.import", f"Import aborted: {exc}", summary)
+		raise HTTPException(status_code=400, detail={"error": str(exc), "summary": summary}) from exc
+
+	summary = importer.summary.snapshot()
+	await run_in_threadpool(
+		log_event,
+		"data.import",
+		f"Imported {summary['tasks']} tasks, {summary['conversations']} conversations",
+		summary,
+	)
+	return summary
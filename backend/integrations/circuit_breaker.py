@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency the breaker considers down."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a probe before half-opening.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    every call fails fast with CircuitOpenError. Once `reset_seconds` have
+    passed, the next caller runs `probe()`. If the probe succeeds, that
+    caller's request goes through as the single half-open trial; otherwise
+    the breaker stays open for another period. The trial's outcome closes
+    or reopens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        probe: Callable[[], bool],
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._probe = probe
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.short_circuited = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            waited = time.monotonic() - self.opened_at
+            if self.state == HALF_OPEN or self._trial_in_flight or waited < self.reset_seconds:
+                self.short_circuited += 1
+                raise CircuitOpenError("Ollama circuit breaker is open")
+            self._trial_in_flight = True
+
+        healthy = False
+        try:
+            healthy = self._probe()
+        finally:
+            with self._lock:
+                if healthy:
+                    self.state = HALF_OPEN
+                else:
+                    self._trial_in_flight = False
+                    self.opened_at = time.monotonic()
+                    self.short_circuited += 1
+        if not healthy:
+            raise CircuitOpenError("Ollama circuit breaker is open (probe failed)")
+
+    def record_success(self) -> None:
+        with self._lock:
+            # A call admitted before the breaker opened proves nothing about
+            # now; only the half-open trial (or a closed breaker) counts.
+            if self.state == OPEN:
+                return
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.trips += 1
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(retry_in, 1),
+            }
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from backend.config import get_settings
+from backend.integrations.ollama_client import OllamaMessage
+
+
+# Chat templates wrap every message in a few role/separator tokens.
+MESSAGE_OVERHEAD_TOKENS = 4
+# Older turns that no longer fit are condensed to this many characters each.
+CONDENSED_TURN_CHARS = 120
+# Share of an overflowing budget held back for the condensed digest.
+CONDENSED_BUDGET_SHARE = 8
+# Old turns leave the recent window in blocks of 1/WINDOW_GRAIN_SHARE of the budget.
+WINDOW_GRAIN_SHARE = 3
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass
+class BuiltContext:
+    messages: List[OllamaMessage]
+    prompt_tokens: int
+    kept_turns: int
+    condensed_turns: int
+    dropped_turns: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap BPE approximation: one token per ~4 characters of each word piece."""
+    return sum(1 + (len(piece) - 1) // 4 for piece in _TOKEN_RE.findall(text))
+
+
+def message_tokens(message: OllamaMessage) -> int:
+    return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.content)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head of text within max_tokens, marking the cut with an ellipsis."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    used = 0
+    cut = 0
+    for match in _TOKEN_RE.finditer(text):
+        piece = match.group(0)
+        cost = 1 + (len(piece) - 1) // 4
+        if used + cost > max_tokens - 1:
+            break
+        used += cost
+        cut = match.end()
+    return text[:cut].rstrip() + " …"
+
+
+def _condense(messages: Sequence[OllamaMessage], budget: int) -> tuple[OllamaMessage | None, int]:
+    """Squeeze older turns into one system note, newest first, within budget."""
+    header = "Earlier turns (condensed):"
+    used = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(header)
+    lines: List[str] = []
+    for msg in reversed(messages):
+        snippet = " ".join(msg.content.split())[:CONDENSED_TURN_CHARS]
+        line = f"- {msg.role}: {snippet}"
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+
+    if not lines:
+        return None, 0
+    lines.reverse()
+    content = "\n".join([header, *lines])
+    return OllamaMessage(role="system", content=content), len(lines)
+
+
+def _window_start(costs: Sequence[int], room: int, grain: int) -> int:
+    """First history index whose suffix fits in room, preferring block starts.
+
+    History is cut into blocks of roughly `grain` tokens counted from the
+    first message, so the block boundaries never move as turns are appended.
+    Starting the window on a boundary keeps it fixed for several turns after
+    each jump; consecutive prompts then share a byte-identical prefix and
+    Ollama can reuse its KV cache instead of re-evaluating the history.
+    """
+    suffix = [0] * (len(costs) + 1)
+    for index in range(len(costs) - 1, -1, -1):
+        suffix[index] = suffix[index + 1] + costs[index]
+    grain = max(1, grain)
+    total = suffix[0]
+    for start in range(len(costs)):
+        block = (total - suffix[start]) // grain
+        previous = (total - suffix[start - 1]) // grain if start else -1
+        if block != previous and suffix[start] <= room:
+            return start
+    for start in range(len(costs)):
+        if suffix[start] <= room:
+            return start
+    return len(costs)
+
+
+def build_context(
+    history: Sequence[OllamaMessage],
+    system_prompt: str | None = None,
+    summary: str | None = None,
+    budget: int | None = None,
+    window_grain: int | None = None,
+) -> BuiltContext:
+    """Pack system prompt, rolling summary and recent turns into a token budget.
+
+    The system prompt and the newest turn are always kept (the latter truncated
+    if it alone exceeds the budget). When the history overflows, a slice of the
+    budget is held back to condense the oldest turns into a short digest, and
+    the recent window advances in blocks of `window_grain` tokens (a fraction
+    of the budget by default) so that the prompt prefix stays stable from turn
+    to turn; whatever does not fit even in the digest is dropped.
+    """
+    limit = budget if budget is not None else get_settings().llm_context_budget
+
+    head: List[OllamaMessage] = []
+    if system_prompt:
+        head.append(OllamaMessage(role="system", content=system_prompt.strip()))
+    if summary:
+        head.append(
+            OllamaMessage(role="system", content=f"Conversation summary so far: {summary}")
+        )
+    used = sum(message_tokens(msg) for msg in head)
+
+    costs = [message_tokens(msg) for msg in history]
+    digest_budget = 0
+    if used + sum(costs) > limit:
+        digest_budget = limit // CONDENSED_BUDGET_SHARE
+    grain = window_grain if window_grain is not None else limit // WINDOW_GRAIN_SHARE
+    start = _window_start(costs, limit - digest_budget - used, grain)
+
+    recent = list(history[start:])
+    if not recent and history:
+        # Even the newest turn alone is too large: keep a truncated copy.
+        start = len(history) - 1
+        msg = history[start]
+        room = max(1, limit - digest_budget - used - MESSAGE_OVERHEAD_TOKENS)
+        recent = [OllamaMessage(role=msg.role, content=truncate_to_tokens(msg.content, room))]
+    used += sum(message_tokens(msg) for msg in recent)
+
+    older = list(history[:start])
+    condensed_turns = 0
+    if older:
+        # The digest only depends on the turns before the window (not on how
+        # full the window is), so it stays stable along with the window start.
+        digest, condensed_turns = _condense(older, digest_budget)
+        if digest:
+            head.append(digest)
+            used += message_tokens(digest)
+
+    return BuiltContext(
+        messages=head + recent,
+        prompt_tokens=used,
+        kept_turns=len(recent),
+        condensed_turns=condensed_turns,
+        dropped_turns=len(older) - condensed_turns,
+    )
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+# Upper bucket bounds; the last bucket of each histogram is open-ended.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+TOKENS_PER_SECOND_BUCKETS = (1, 5, 10, 20, 40, 80, 160)
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.bounds[index]) if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"le_{bound}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class CallStats:
+    caller: str
+    model: str
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS_MS))
+    queue_ms: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS_MS))
+    tokens_per_second: Histogram = field(
+        default_factory=lambda: Histogram(TOKENS_PER_SECOND_BUCKETS)
+    )
+
+
+@dataclass(frozen=True)
+class LlmCall:
+    caller: str
+    model: str
+    ok: bool
+    latency_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    eval_duration_ns: int = 0
+    total_duration_ns: int = 0
+
+    @property
+    def tokens_per_second(self) -> float:
+        if not self.eval_duration_ns:
+            return 0.0
+        return self.completion_tokens / (self.eval_duration_ns / 1_000_000_000)
+
+    @property
+    def queue_ms(self) -> float:
+        # Wall-clock time Ollama did not account for: waiting in its request
+        # queue (OLLAMA_NUM_PARALLEL) plus the network round trip.
+        if not self.total_duration_ns:
+            return 0.0
+        return max(0.0, self.latency_ms - self.total_duration_ns / 1_000_000)
+
+
+_STATS: Dict[Tuple[str, str], CallStats] = {}
+_LOCK = threading.Lock()
+
+
+def call_from_response(caller: str, model: str, latency_ms: float, data: Dict[str, object]) -> LlmCall:
+    """Build an LlmCall from the counters in an Ollama /api/chat response."""
+
+    def counter(name: str) -> int:
+        return int(data.get(name, 0) or 0)
+
+    return LlmCall(
+        caller=caller,
+        model=model,
+        ok=True,
+        latency_ms=latency_ms,
+        prompt_tokens=counter("prompt_eval_count"),
+        completion_tokens=counter("eval_count"),
+        eval_duration_ns=counter("eval_duration"),
+        total_duration_ns=counter("total_duration"),
+    )
+
+
+def record_call(call: LlmCall) -> None:
+    with _LOCK:
+        key = (call.caller, call.model)
+        stats = _STATS.get(key)
+        if stats is None:
+            stats = _STATS[key] = CallStats(caller=call.caller, model=call.model)
+        stats.calls += 1
+        stats.latency_ms.observe(call.latency_ms)
+        if not call.ok:
+            stats.errors += 1
+            return
+        stats.prompt_tokens += call.prompt_tokens
+        stats.completion_tokens += call.completion_tokens
+        if call.total_duration_ns:
+            stats.queue_ms.observe(call.queue_ms)
+        if call.eval_duration_ns:
+            stats.tokens_per_second.observe(call.tokens_per_second)
+
+
+def snapshot() -> List[Dict[str, object]]:
+    with _LOCK:
+        return [
+            {
+                "caller": stats.caller,
+                "model": stats.model,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "prompt_tokens": stats.prompt_tokens,
+                "completion_tokens": stats.completion_tokens,
+                "latency_ms": stats.latency_ms.snapshot(),
+                "queue_ms": stats.queue_ms.snapshot(),
+                "tokens_per_second": stats.tokens_per_second.snapshot(),
+            }
+            for stats in sorted(_STATS.values(), key=lambda item: (item.caller, item.model))
+        ]
+
+
+def totals() -> Dict[str, int]:
+    """Call and token totals per caller, for the status metrics."""
+    result: Dict[str, int] = {}
+    with _LOCK:
+        for stats in _STATS.values():
+            result[f"{stats.caller}.calls"] = result.get(f"{stats.caller}.calls", 0) + stats.calls
+            result[f"{stats.caller}.prompt_tokens"] = (
+                result.get(f"{stats.caller}.prompt_tokens", 0) + stats.prompt_tokens
+            )
+            result[f"{stats.caller}.completion_tokens"] = (
+                result.get(f"{stats.caller}.completion_tokens", 0) + stats.completion_tokens
+            )
+    return result
+
+
+def reset() -> None:
+    with _LOCK:
+        _STATS.clear()
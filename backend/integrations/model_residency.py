@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+import requests
+
+from backend.config import get_settings
+from backend.integrations.model_tiers import all_tiers
+from backend.integrations.ollama_pool import OllamaNode, get_pool
+
+
+# A call whose load_duration exceeds this paid for loading the model.
+COLD_START_MS = 500.0
+
+
+@dataclass
+class ModelLoadStats:
+    model: str
+    cold_starts: int = 0
+    last_load_ms: float = 0.0
+    max_load_ms: float = 0.0
+    total_load_ms: float = 0.0
+    warmups: int = 0
+    evictions: int = 0
+
+
+_STATS: Dict[str, ModelLoadStats] = {}
+# Models evicted by an admin; the preloader leaves them alone until they are
+# warmed explicitly again.
+_EVICTED: Set[str] = set()
+_LOCK = threading.Lock()
+
+
+def _stats_for(model: str) -> ModelLoadStats:
+    stats = _STATS.get(model)
+    if stats is None:
+        stats = _STATS[model] = ModelLoadStats(model=model)
+    return stats
+
+
+def record_load(model: str, load_duration_ns: int) -> None:
+    """Record Ollama's load_duration for a call; slow loads count as cold starts."""
+    load_ms = load_duration_ns / 1_000_000
+    if load_ms < COLD_START_MS:
+        return
+    with _LOCK:
+        stats = _stats_for(model)
+        stats.cold_starts += 1
+        stats.last_load_ms = load_ms
+        stats.max_load_ms = max(stats.max_load_ms, load_ms)
+        stats.total_load_ms += load_ms
+
+
+def load_stats() -> List[Dict[str, object]]:
+    with _LOCK:
+        return [
+            {
+                "model": stats.model,
+                "cold_starts": stats.cold_starts,
+                "last_load_ms": round(stats.last_load_ms, 1),
+                "max_load_ms": round(stats.max_load_ms, 1),
+                "total_load_ms": round(stats.total_load_ms, 1),
+                "warmups": stats.warmups,
+                "evictions": stats.evictions,
+                "evicted": stats.model in _EVICTED,
+            }
+            for stats in _STATS.values()
+        ]
+
+
+def configured_models() -> List[str]:
+    return sorted({tier.model for tier in all_tiers().values()})
+
+
+def _nodes_for(model: str) -> List[OllamaNode]:
+    now = time.monotonic()
+    return [
+        node
+        for node in get_pool().nodes
+        if node.available(now) and (not node.models or model in node.models)
+    ]
+
+
+def _set_keep_alive(node: OllamaNode, model: str, keep_alive: str | int) -> Dict[str, object]:
+    # A generate request without a prompt only loads (or unloads) the model.
+    response = requests.post(
+        f"{node.url}/api/generate",
+        json={"model": model, "keep_alive": keep_alive},
+        timeout=300,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def warm_model(model: str) -> List[Dict[str, object]]:
+    """Load model on every node that has it, returning per-node load times.
+
+    Warming a model also lets the preloader keep it resident again after an
+    eviction.
+    """
+    keep_alive = get_settings().ollama_keep_alive
+    results = []
+    for node in _nodes_for(model):
+        started = time.perf_counter()
+        try:
+            data = _set_keep_alive(node, model, keep_alive)
+            record_load(model, int(data.get("load_duration", 0) or 0))
+            results.append(
+                {
+                    "node": node.url,
+                    "ok": True,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                }
+            )
+        except requests.RequestException as exc:
+            results.append({"node": node.url, "ok": False, "error": str(exc)})
+    with _LOCK:
+        _EVICTED.discard(model)
+        if any(result["ok"] for result in results):
+            _stats_for(model).warmups += 1
+    return results
+
+
+def evict_model(model: str) -> List[Dict[str, object]]:
+    """Unload model everywhere and stop the preloader from warming it again."""
+    with _LOCK:
+        _EVICTED.add(model)
+    results = []
+    for node in get_pool().nodes:
+        try:
+            _set_keep_alive(node, model, 0)
+            results.append({"node": node.url, "ok": True})
+        except requests.RequestException as exc:
+            results.append({"node": node.url, "ok": False, "error": str(exc)})
+    with _LOCK:
+        _stats_for(model).evictions += 1
+    return results
+
+
+def resident_models() -> Dict[str, object]:
+    """Models currently loaded on each node, from Ollama's /api/ps."""
+    resident: Dict[str, object] = {}
+    for node in get_pool().nodes:
+        try:
+            response = requests.get(f"{node.url}/api/ps", timeout=5)
+            response.raise_for_status()
+            resident[node.url] = [
+                {
+                    "name": item.get("name", ""),
+                    "expires_at": item.get("expires_at"),
+                    "size_vram": item.get("size_vram"),
+                }
+                for item in response.json().get("models", [])
+            ]
+        except requests.RequestException as exc:
+            resident[node.url] = {"error": str(exc)}
+    return resident
+
+
+def ensure_resident() -> None:
+    """Warm any configured model that is not loaded on a node that serves it.
+
+    Models evicted through evict_model are skipped.
+    """
+    resident = resident_models()
+    for model in configured_models():
+        with _LOCK:
+            if model in _EVICTED:
+                continue
+        loaded_everywhere = all(
+            isinstance(resident.get(node.url), list)
+            and any(item["name"] == model for item in resident[node.url])
+            for node in _nodes_for(model)
+        )
+        if not loaded_everywhere:
+            warm_model(model)
+
+
+def start_preloader() -> threading.Thread:
+    """Preload the configured models now and keep them resident in the background."""
+
+    def loop() -> None:
+        while True:
+            try:
+                ensure_resident()
+            except Exception:
+                pass
+            time.sleep(max(5.0, get_settings().ollama_health_interval_seconds * 4))
+
+    thread = threading.Thread(target=loop, name="ollama-preload", daemon=True)
+    thread.start()
+    return thread
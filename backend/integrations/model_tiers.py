@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict
+
+from backend.config import get_settings
+
+
+ROUTER = "router"
+SUMMARIZER = "summarizer"
+CHAT = "chat"
+
+# Generation options per tier; the model defaults to OLLAMA_MODEL everywhere.
+# Routing answers are one word and summaries a few sentences, so capping
+# num_predict bounds their decode time. Chat keeps the model's defaults.
+_DEFAULT_OPTIONS: Dict[str, Dict[str, Any]] = {
+    ROUTER: {"num_predict": 8, "temperature": 0},
+    SUMMARIZER: {"num_predict": 200, "temperature": 0.2},
+    CHAT: {},
+}
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    name: str
+    model: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+def _overrides(raw: str) -> Dict[str, Dict[str, Any]]:
+    if not raw.strip():
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {str(name): dict(value) for name, value in parsed.items() if isinstance(value, dict)}
+
+
+@lru_cache(maxsize=8)
+def _tiers(default_model: str, raw: str) -> Dict[str, ModelTier]:
+    overrides = _overrides(raw)
+    tiers: Dict[str, ModelTier] = {}
+    for name in {*_DEFAULT_OPTIONS, *overrides}:
+        options = dict(_DEFAULT_OPTIONS.get(name, {}))
+        options.update(overrides.get(name, {}))
+        model = str(options.pop("model", default_model))
+        tiers[name] = ModelTier(name=name, model=model, options=options)
+    return tiers
+
+
+def all_tiers() -> Dict[str, ModelTier]:
+    settings = get_settings()
+    return _tiers(settings.ollama_model, settings.ollama_model_tiers)
+
+
+def get_tier(name: str) -> ModelTier:
+    """Return the named tier, or the chat tier when the name is unknown."""
+    tiers = all_tiers()
+    return tiers.get(name) or tiers[CHAT]
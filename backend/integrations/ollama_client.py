@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 import requests
 
 from backend.config import get_settings
+from backend.integrations import llm_stats
+from backend.integrations.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.integrations.model_residency import record_load
+from backend.integrations.model_tiers import CHAT, get_tier
+from backend.integrations.ollama_pool import OllamaPool, get_pool
 
 
 @dataclass
@@ -19,6 +26,8 @@ class OllamaResponse:
     ok: bool
     model: str
     message: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
 
 
 @dataclass
@@ -26,38 +35,148 @@ class OllamaPing:
     ok: bool
     models: int
     message: str
+    model_names: List[str] = field(default_factory=list)
 
 
-def chat_ollama(messages: List[OllamaMessage]) -> OllamaResponse:
+class OllamaUnavailable(CircuitOpenError):
+    """Ollama is failing; callers should use their fallback immediately."""
+
+
+def _probe_pool() -> bool:
+    return any(ping_ollama(node.url).ok for node in get_pool().nodes)
+
+
+@lru_cache(maxsize=4)
+def _breaker_for(failures: int, reset_seconds: float) -> CircuitBreaker:
+    return CircuitBreaker(failures, reset_seconds, probe=_probe_pool)
+
+
+def get_breaker() -> CircuitBreaker:
     settings = get_settings()
-    url = f"{settings.ollama_base_url.rstrip('/')}/api/chat"
+    return _breaker_for(settings.ollama_breaker_failures, settings.ollama_breaker_reset_seconds)
+
+
+def chat_ollama(
+    messages: List[OllamaMessage],
+    tier: str = CHAT,
+    options: Dict[str, object] | None = None,
+    caller: str | None = None,
+    session: str | None = None,
+) -> OllamaResponse:
+    """Send a chat request using the model and generation options of `tier`.
+
+    `options` are merged over the tier's options for this call only. Token
+    counts and timings are recorded in llm_stats under `caller` (the tier
+    name by default). Calls sharing a `session` key stick to one Ollama node
+    so its prompt cache is reused. Raises OllamaUnavailable without a request while the
+    circuit breaker is open.
+    """
+    model_tier = get_tier(tier)
+    pool = get_pool()
 
     payload: Dict[str, object] = {
-        "model": settings.ollama_model,
+        "model": model_tier.model,
         "messages": [
             {"role": msg.role, "content": msg.content} for msg in messages
         ],
         "stream": False,
+        "keep_alive": get_settings().ollama_keep_alive,
     }
+    merged_options = {**model_tier.options, **(options or {})}
+    if merged_options:
+        payload["options"] = merged_options
+
+    breaker = get_breaker()
+    try:
+        breaker.before_call()
+    except CircuitOpenError as exc:
+        raise OllamaUnavailable(str(exc)) from exc
 
-    response = requests.post(url, json=payload, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+    caller = caller or model_tier.name
+    started = time.perf_counter()
+
+    def failed() -> None:
+        llm_stats.record_call(
+            llm_stats.LlmCall(
+                caller=caller,
+                model=model_tier.model,
+                ok=False,
+                latency_ms=(time.perf_counter() - started) * 1000,
+            )
+        )
+
+    try:
+        data = _post_chat(pool, model_tier.model, payload, session)
+    except requests.HTTPError as exc:
+        status = exc.response.status_code if exc.response is not None else 500
+        if status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        failed()
+        raise
+    except Exception:
+        breaker.record_failure()
+        failed()
+        raise
+    breaker.record_success()
+
+    call = llm_stats.call_from_response(
+        caller, model_tier.model, (time.perf_counter() - started) * 1000, data
+    )
+    llm_stats.record_call(call)
+    record_load(model_tier.model, int(data.get("load_duration", 0) or 0))
     return OllamaResponse(
         ok=True,
-        model=settings.ollama_model,
+        model=model_tier.model,
         message=data.get("message", {}).get("content", ""),
+        prompt_tokens=call.prompt_tokens,
+        completion_tokens=call.completion_tokens,
     )
 
 
-def ping_ollama() -> OllamaPing:
-    settings = get_settings()
-    url = f"{settings.ollama_base_url.rstrip('/')}/api/tags"
+def _post_chat(
+    pool: OllamaPool,
+    model: str,
+    payload: Dict[str, object],
+    session: str | None = None,
+) -> Dict[str, object]:
+    # A refused connection fails fast, so it is retried once on another node;
+    # timeouts and HTTP errors are returned to the caller. The retry drops the
+    # session pin.
+    attempts = min(2, len(pool.nodes))
+    refused: set[str] = set()
+    for attempt in range(attempts):
+        try:
+            with pool.lease(model, session if attempt == 0 else None, exclude=refused) as node:
+                response = requests.post(f"{node.url}/api/chat", json=payload, timeout=30)
+                response.raise_for_status()
+                return response.json()
+        except requests.ConnectionError:
+            refused.add(node.url)
+            if attempt == attempts - 1:
+                raise
+    raise requests.ConnectionError("No Ollama node reachable")
+
+
+def ping_ollama(base_url: str | None = None) -> OllamaPing:
+    url = f"{(base_url or get_settings().ollama_base_url).rstrip('/')}/api/tags"
     try:
         response = requests.get(url, timeout=5)
         response.raise_for_status()
         data = response.json()
-        models = len(data.get("models", []))
-        return OllamaPing(ok=True, models=models, message="Ollama reachable")
+        names = [model.get("name", "") for model in data.get("models", [])]
+        return OllamaPing(
+            ok=True,
+            models=len(names),
+            message="Ollama reachable",
+            model_names=names,
+        )
     except requests.RequestException as exc:
         return OllamaPing(ok=False, models=0, message=str(exc))
+
+
+def ping_node(base_url: str) -> Tuple[bool, List[str]]:
+    """Health-check callback for the Ollama pool."""
+    result = ping_ollama(base_url)
+    return result.ok, result.model_names
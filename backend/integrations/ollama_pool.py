@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Collection, Dict, Iterator, List, Tuple
+
+from backend.config import get_settings
+
+
+# Consecutive request failures before a node is taken out of rotation.
+EJECT_AFTER_FAILURES = 3
+EJECT_SECONDS = 30.0
+_LATENCY_SMOOTHING = 0.2
+# A session stays on its node unless that node has this many more requests in
+# flight than the least busy one.
+AFFINITY_SLACK = 2
+# Most recent sessions whose node assignment is remembered.
+MAX_SESSIONS = 4096
+
+
+@dataclass
+class OllamaNode:
+    url: str
+    healthy: bool = True
+    in_flight: int = 0
+    models: set[str] = field(default_factory=set)
+    requests: int = 0
+    failures: int = 0
+    affinity_hits: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    latency_ms: float = 0.0
+    last_checked: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "ejected": time.monotonic() < self.ejected_until,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "affinity_hits": self.affinity_hits,
+            "latency_ms": round(self.latency_ms, 1),
+            "models": sorted(self.models),
+        }
+
+
+class NoOllamaNode(RuntimeError):
+    pass
+
+
+class OllamaPool:
+    """Least-outstanding-requests balancing over several Ollama servers.
+
+    Nodes are taken out of rotation passively after EJECT_AFTER_FAILURES
+    consecutive errors (for EJECT_SECONDS) and actively when a health check
+    fails. Health checks also learn which models each node has pulled, so a
+    request goes to a node that already has its model when one exists.
+
+    Requests with a session key (a conversation id) are pinned to the node
+    that served the session's first request (the one with the fewest pinned
+    sessions at the time), so follow-up turns land where the conversation's
+    prompt prefix is already in the KV cache. A session is re-pinned when its
+    node is out of rotation or more than AFFINITY_SLACK requests busier than
+    the least loaded candidate.
+    """
+
+    def __init__(self, urls: List[str]) -> None:
+        self.nodes = [OllamaNode(url=url.rstrip("/")) for url in urls]
+        self._sessions: OrderedDict[str, OllamaNode] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pick(
+        self,
+        model: str | None = None,
+        session: str | None = None,
+        exclude: Collection[str] = (),
+    ) -> OllamaNode:
+        """Choose a node and count the request against it.
+
+        Urls in exclude are skipped unless no other node is configured.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self.nodes:
+                raise NoOllamaNode("No Ollama endpoints configured")
+            pool = [node for node in self.nodes if node.url not in exclude] or self.nodes
+            candidates = [node for node in pool if node.available(now)]
+            if model:
+                with_model = [node for node in candidates if model in node.models]
+                if with_model:
+                    candidates = with_model
+            if not candidates:
+                # Everything is down or ejected: try the least recently failed
+                # node rather than failing without a request.
+                candidates = sorted(pool, key=lambda node: node.ejected_until)[:1]
+            node = min(candidates, key=lambda item: (item.in_flight, item.latency_ms))
+            if session:
+                node = self._pin(session, candidates, node)
+            node.in_flight += 1
+            node.requests += 1
+            return node
+
+    def release(self, node: OllamaNode, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            node.in_flight -= 1
+            if ok:
+                node.consecutive_failures = 0
+                if node.latency_ms:
+                    node.latency_ms += _LATENCY_SMOOTHING * (elapsed_ms - node.latency_ms)
+                else:
+                    node.latency_ms = elapsed_ms
+                return
+            node.failures += 1
+            node.consecutive_failures += 1
+            if node.consecutive_failures >= EJECT_AFTER_FAILURES:
+                node.ejected_until = time.monotonic() + EJECT_SECONDS
+
+    def _pin(self, session: str, candidates: List[OllamaNode], least_loaded: OllamaNode) -> OllamaNode:
+        pinned = self._sessions.get(session)
+        if (
+            pinned in candidates
+            and pinned.in_flight <= least_loaded.in_flight + AFFINITY_SLACK
+        ):
+            pinned.affinity_hits += 1
+            self._sessions.move_to_end(session)
+            return pinned
+        counts = {node.url: 0 for node in candidates}
+        for node in self._sessions.values():
+            if node.url in counts:
+                counts[node.url] += 1
+        node = min(candidates, key=lambda item: (counts[item.url], item.in_flight, item.latency_ms))
+        self._sessions[session] = node
+        self._sessions.move_to_end(session)
+        while len(self._sessions) > MAX_SESSIONS:
+            self._sessions.popitem(last=False)
+        return node
+
+    @contextmanager
+    def lease(
+        self,
+        model: str | None = None,
+        session: str | None = None,
+        exclude: Collection[str] = (),
+    ) -> Iterator[OllamaNode]:
+        node = self.pick(model, session, exclude)
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield node
+            ok = True
+        finally:
+            self.release(node, (time.perf_counter() - started) * 1000, ok)
+
+    def check(self, ping: Callable[[str], Tuple[bool, List[str]]]) -> None:
+        """Run ping(url) -> (ok, model names) against every node."""
+        for node in self.nodes:
+            ok, models = ping(node.url)
+            with self._lock:
+                node.healthy = ok
+                node.last_checked = time.monotonic()
+                if ok:
+                    node.models = set(models)
+                    node.consecutive_failures = 0
+                    node.ejected_until = 0.0
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        with self._lock:
+            return [node.snapshot() for node in self.nodes]
+
+
+def configured_urls() -> Tuple[str, ...]:
+    settings = get_settings()
+    urls = [url.strip() for url in settings.ollama_base_urls.split(",") if url.strip()]
+    return tuple(urls or [settings.ollama_base_url])
+
+
+@lru_cache(maxsize=4)
+def _pool_for(urls: Tuple[str, ...]) -> OllamaPool:
+    return OllamaPool(list(urls))
+
+
+def get_pool() -> OllamaPool:
+    return _pool_for(configured_urls())
+
+
+_HEALTH_LOCK = threading.Lock()
+_HEALTH: Dict[str, threading.Thread | None] = {"thread": None}
+
+
+def start_health_checks(ping: Callable[[str], Tuple[bool, List[str]]]) -> threading.Thread:
+    """Start the daemon thread that health-checks the pool periodically.
+
+    Later calls (another startup in the same process) return the running thread.
+    """
+
+    def loop() -> None:
+        while True:
+            try:
+                get_pool().check(ping)
+            except Exception:
+                pass
+            time.sleep(max(1.0, get_settings().ollama_health_interval_seconds))
+
+    with _HEALTH_LOCK:
+        running = _HEALTH["thread"]
+        if running is not None and running.is_alive():
+            return running
+        thread = threading.Thread(target=loop, name="ollama-health", daemon=True)
+        thread.start()
+        _HEALTH["thread"] = thread
+        return thread
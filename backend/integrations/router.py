@@ -2,10 +2,19 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-from backend.integrations.ollama_client import OllamaMessage, chat_ollama, ping_ollama
+from backend.integrations import llm_stats
+from backend.integrations.context import build_context
+from backend.integrations.ollama_client import (
+    OllamaMessage,
+    OllamaUnavailable,
+    chat_ollama,
+    get_breaker,
+    ping_ollama,
+)
+from backend.integrations.ollama_pool import get_pool
 
 
 router = APIRouter(prefix="/v1/llm", tags=["llm"])
@@ -18,19 +27,41 @@ class ChatMessage(BaseModel):
 
 class ChatRequest(BaseModel):
     messages: List[ChatMessage]
+    max_prompt_tokens: int | None = Field(default=None, ge=64)
+    conversation_id: str | None = None
 
 
 @router.post("/chat")
 def chat(request: ChatRequest) -> dict:
-    messages = [
-        OllamaMessage(role=msg.role, content=msg.content)
-        for msg in request.messages
-    ]
-    result = chat_ollama(messages)
+    system_parts = []
+    history = []
+    for msg in request.messages:
+        if msg.role == "system" and not history:
+            system_parts.append(msg.content)
+        else:
+            history.append(OllamaMessage(role=msg.role, content=msg.content))
+
+    context = build_context(
+        history,
+        system_prompt="\n\n".join(system_parts) or None,
+        budget=request.max_prompt_tokens,
+    )
+    try:
+        result = chat_ollama(context.messages, session=request.conversation_id)
+    except OllamaUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
     return {
         "ok": result.ok,
         "model": result.model,
         "message": result.message,
+        "prompt_tokens": context.prompt_tokens,
+        "usage": {
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+        },
+        "kept_turns": context.kept_turns,
+        "condensed_turns": context.condensed_turns,
+        "dropped_turns": context.dropped_turns,
     }
 
 
@@ -41,4 +72,12 @@ def ping() -> dict:
         "ok": result.ok,
         "models": result.models,
         "message": result.message,
+        "nodes": get_pool().snapshot(),
+        "breaker": get_breaker().snapshot(),
     }
+
+
+@router.get("/stats")
+def stats() -> dict:
+    """Per-caller and per-model token counts and latency histograms."""
+    return {"calls": llm_stats.snapshot()}
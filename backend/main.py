@@ -16,12 +16,20 @@ from backend.status.router import router as status_router
 from backend.planner.router import router as planner_router
 from backend.conversations.router import router as conversations_router
 from backend.export.router import router as export_router
+from backend.sync.router import router as sync_router
+from backend.importer.router import router as import_router
 from backend.audit.router import router as audit_router
 from backend.compression.router import router as compression_router
 from backend.analytics.router import router as analytics_router
 from backend.demo.router import router as demo_router
 from backend.maintenance.router import router as maintenance_router
 from backend.admin.router import router as admin_router
+from backend.conversations.store import backfill_conversation_seqs
+from backend.db.snapshots import restore_snapshot, start_snapshots, write_snapshot
+from backend.integrations.model_residency import start_preloader
+from backend.integrations.ollama_client import ping_node
+from backend.integrations.ollama_pool import start_health_checks
+from backend.tasks.store import backfill_task_seqs
 
 
 load_dotenv()
@@ -41,6 +49,8 @@ app.include_router(status_router)
 app.include_router(planner_router)
 app.include_router(conversations_router)
 app.include_router(export_router)
+app.include_router(sync_router)
+app.include_router(import_router)
 app.include_router(audit_router)
 app.include_router(compression_router)
 app.include_router(analytics_router)
@@ -58,6 +68,25 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_background_checks() -> None:
+	start_health_checks(ping_node)
+	if settings.ollama_preload:
+		start_preloader()
+	if settings.snapshot_dir:
+		restore_snapshot()
+		start_snapshots()
+	# Records from before change tracking need a seq to show up in a sync.
+	backfill_task_seqs()
+	backfill_conversation_seqs()
+
+
+@app.on_event("shutdown")
+def flush_snapshot() -> None:
+	if settings.snapshot_dir:
+		write_snapshot()
+
+
 @app.middleware("http")
 async def api_key_middleware(request: Request, call_next):
 	guard = api_key_guard(request)
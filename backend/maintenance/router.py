@@ -3,7 +3,9 @@ from __future__ import annotations
 from fastapi import APIRouter
 
 from backend.audit.store import cleanup_events
+from backend.config import get_settings
 from backend.profiles.store import get_profile
+from backend.sync.store import compact_tombstones
 
 
 router = APIRouter(prefix="/v1/maintenance", tags=["maintenance"])
@@ -13,7 +15,10 @@ router = APIRouter(prefix="/v1/maintenance", tags=["maintenance"])
 def cleanup() -> dict:
     profile = get_profile()
     removed = cleanup_events(profile.data_retention_days)
+    tombstone_days = get_settings().sync_tombstone_days
     return {
         "retention_days": profile.data_retention_days,
         "audit_events_removed": removed,
+        "tombstone_retention_days": tombstone_days,
+        "tombstones_removed": compact_tombstones(tombstone_days),
     }
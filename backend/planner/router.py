@@ -6,7 +6,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from backend.planner.heuristics import split_goal_to_tasks
-from backend.tasks.store import create_task, list_tasks
+from backend.tasks.store import create_tasks, list_tasks
 
 
 router = APIRouter(prefix="/v1/plan", tags=["planning"])
@@ -31,10 +31,8 @@ class PlanWithExistingResponse(BaseModel):
 @router.post("/quick", response_model=PlanResponse)
 def quick_plan(request: PlanRequest) -> PlanResponse:
     titles = split_goal_to_tasks(request.goal)
-    created_ids: List[str] = []
-    for title in titles:
-        task = create_task(title=title, details="", priority=request.priority)
-        created_ids.append(task.id)
+    created = create_tasks([(title, "", request.priority) for title in titles])
+    created_ids = [task.id for task in created]
 
     return PlanResponse(created_task_ids=created_ids, titles=titles)
 
@@ -42,10 +40,8 @@ def quick_plan(request: PlanRequest) -> PlanResponse:
 @router.post("/quick_with_existing", response_model=PlanWithExistingResponse)
 def quick_plan_with_existing(request: PlanRequest) -> PlanWithExistingResponse:
     titles = split_goal_to_tasks(request.goal)
-    created_ids: List[str] = []
-    for title in titles:
-        task = create_task(title=title, details="", priority=request.priority)
-        created_ids.append(task.id)
+    created = create_tasks([(title, "", request.priority) for title in titles])
+    created_ids = [task.id for task in created]
 
     existing = [task.title for task in list_tasks()]
     return PlanWithExistingResponse(
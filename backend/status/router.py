@@ -4,9 +4,14 @@ import time
 
 from fastapi import APIRouter
 
+from backend.agents import metrics as agent_metrics
 from backend.config import get_settings
 from backend.db.mongo import ping_mongo
 from backend.db.neo4j_db import ping_neo4j
+from backend.integrations import llm_stats
+from backend.integrations.model_residency import load_stats
+from backend.integrations.ollama_client import get_breaker
+from backend.integrations.ollama_pool import get_pool
 from backend.integrations.nylas_stub import check_nylas
 from backend.integrations.plaid_stub import check_plaid
 
@@ -26,6 +31,8 @@ def overview() -> dict:
 		"app": settings.app_name,
 		"env": settings.app_env,
 		"ollama_model": settings.ollama_model,
+		"ollama_nodes": get_pool().snapshot(),
+		"ollama_breaker": get_breaker().snapshot(),
 		"integrations": {},
 		"databases": {},
 	}
@@ -71,4 +78,9 @@ def overview() -> dict:
 
 @router.get("/metrics")
 def metrics() -> dict:
-	return {"uptime_seconds": get_uptime_seconds()}
+	return {
+		"uptime_seconds": get_uptime_seconds(),
+		"agents": agent_metrics.snapshot(),
+		"ollama_model_loads": load_stats(),
+		"llm": llm_stats.totals(),
+	}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.conversations.store import (
+    Conversation,
+    MessageHistory,
+    conversations_changed_between,
+    hot_messages,
+)
+from backend.sync.store import current_seq, stable_seq, tombstone_floor, tombstones_between
+from backend.tasks.store import tasks_changed_between
+
+
+router = APIRouter(prefix="/v1/sync", tags=["sync"])
+
+
+def _window_messages(conversation: Conversation, since: int, until: int) -> List[Dict[str, object]]:
+    messages = conversation.messages
+    if since == 0:
+        return [msg.__dict__ for msg in messages if msg.seq <= until]
+    hot = hot_messages(conversation)
+    picked = [msg for msg in hot if since < msg.seq <= until]
+    # Archived history is only inflated when the cursor reaches back into it.
+    if isinstance(messages, MessageHistory) and messages.blocks and (not hot or hot[0].seq > since):
+        archived = messages[: messages.archived_count]
+        picked = [msg for msg in archived if since < msg.seq <= until] + picked
+    return [msg.__dict__ for msg in picked]
+
+
+def _conversation_seq(conversation: Conversation, until: int) -> int | None:
+    """Where a conversation sits in the window: its own seq, or its newest message in it."""
+    if conversation.seq <= until:
+        return conversation.seq
+    inside = [msg.seq for msg in hot_messages(conversation) if msg.seq <= until]
+    return max(inside) if inside else None
+
+
+@router.get("/changes")
+def changes(
+    since: int = Query(0, ge=0),
+    after: int | None = Query(None, ge=0),
+    until: int | None = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> dict:
+    """Everything written in the window since < seq <= until, ordered by change sequence.
+
+    The first page fixes `until` at the highest sequence whose writes have
+    all landed. Tasks come back whole, conversations with every message from
+    the window, and deletions as tombstones. While `has_more` is true, ask
+    again with the same `since` and `until` and with `after=next_after`.
+    The last page's `next_since` is the cursor for the next sync.
+    """
+    floor = tombstone_floor()
+    if 0 < since < floor:
+        raise HTTPException(
+            status_code=410,
+            detail=f"Cursor {since} predates compacted deletions (through {floor}); resync from since=0",
+        )
+    until = stable_seq() if until is None else until
+    after = since if after is None else max(after, since)
+
+    entries: List[Dict[str, object]] = []
+    for task in tasks_changed_between(after, until, limit + 1):
+        entries.append({"seq": task.seq, "kind": "task", "op": "upsert", "data": task.__dict__})
+    for conversation in conversations_changed_between(after, until):
+        seq = _conversation_seq(conversation, until)
+        if seq is None or seq <= after:
+            continue
+        entries.append(
+            {
+                "seq": seq,
+                "kind": "conversation",
+                "op": "upsert",
+                "data": {
+                    "id": conversation.id,
+                    "title": conversation.title,
+                    "messages": _window_messages(conversation, since, until),
+                    "messages_total": len(conversation.messages),
+                },
+            }
+        )
+    for tombstone in tombstones_between(after, until, limit + 1):
+        entries.append(
+            {"seq": tombstone.seq, "kind": tombstone.kind, "op": "delete", "id": tombstone.id}
+        )
+
+    entries.sort(key=lambda entry: entry["seq"])
+    page = entries[:limit]
+    has_more = len(entries) > limit
+    return {
+        "changes": page,
+        "has_more": has_more,
+        "next_after": page[-1]["seq"] if has_more else until,
+        "until": until,
+        # Only a finished window moves the cursor; mid-window it stays put.
+        "next_since": since if has_more else max(since, until),
+        "current_seq": current_seq(),
+    }
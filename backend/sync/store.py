@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable, Dict, List, Set, TypeVar
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from backend.db.mongo import get_mongo_client
+
+
+# Every task, conversation and message write takes the next value of one
+# global change sequence and stores it as "seq"; deletes leave a tombstone
+# carrying the sequence of the delete. Clients sync by asking for everything
+# with a seq above the last one they saw.
+#
+# A sequence is reserved before its write lands, so a later one can become
+# visible first. Writes run inside @stamps_changes, which keeps their
+# sequences pending until the write returns; stable_seq() stays below the
+# oldest pending one so a cursor never moves past a write still in flight.
+# Pending sequences are tracked per process: with several worker processes
+# writing to one MongoDB, clients should start each sync a little below
+# their cursor and ignore entries they already applied.
+_SEQUENCE_KEY = "changes"
+_FLOOR_KEY = "tombstone_floor"
+
+
+@dataclass
+class Tombstone:
+    kind: str
+    id: str
+    seq: int
+    deleted_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+_TOMBSTONES: Dict[str, Tombstone] = {}
+_COUNTERS: Dict[str, int] = {_SEQUENCE_KEY: 0, _FLOOR_KEY: 0}
+_LOCK = threading.Lock()
+# Held while a range is reserved and registered, so stable_seq never sees a
+# counter value whose range is not pending yet.
+_RESERVE_LOCK = threading.Lock()
+_PENDING: Set[int] = set()
+_WRITES = threading.local()
+
+F = TypeVar("F", bound=Callable)
+
+
+def _get_db():
+    try:
+        client = get_mongo_client()
+        return client.get_default_database()
+    except Exception:
+        return None
+
+
+def _counters():
+    db = _get_db()
+    return db["counters"] if db is not None else None
+
+
+def _tombstones():
+    db = _get_db()
+    return db["tombstones"] if db is not None else None
+
+
+def stamps_changes(func: F) -> F:
+    """Keep sequences reserved while func runs pending until it returns."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_WRITES, "stack", None)
+        if stack is None:
+            stack = _WRITES.stack = []
+        reserved: List[int] = []
+        stack.append(reserved)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stack.pop()
+            if reserved:
+                with _LOCK:
+                    _PENDING.difference_update(reserved)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _reserve(count: int) -> List[int]:
+    collection = _counters()
+    if collection is not None:
+        try:
+            doc = collection.find_one_and_update(
+                {"_id": _SEQUENCE_KEY},
+                {"$inc": {"value": count}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            last = int(doc["value"])
+            with _LOCK:
+                # Keeps the in-memory fallback ahead of anything handed out.
+                _COUNTERS[_SEQUENCE_KEY] = max(_COUNTERS[_SEQUENCE_KEY], last)
+            return list(range(last - count + 1, last + 1))
+        except PyMongoError:
+            pass
+
+    with _LOCK:
+        first = _COUNTERS[_SEQUENCE_KEY] + 1
+        _COUNTERS[_SEQUENCE_KEY] += count
+    return list(range(first, first + count))
+
+
+def next_seqs(count: int) -> List[int]:
+    """Reserve count consecutive sequence numbers with a single increment.
+
+    Inside a @stamps_changes call they stay pending until that call returns.
+    """
+    if count <= 0:
+        return []
+    stack = getattr(_WRITES, "stack", None)
+    with _RESERVE_LOCK:
+        seqs = _reserve(count)
+        if stack:
+            with _LOCK:
+                _PENDING.update(seqs)
+    if stack:
+        stack[-1].extend(seqs)
+    return seqs
+
+
+def next_seq() -> int:
+    return next_seqs(1)[0]
+
+
+def current_seq() -> int:
+    collection = _counters()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"_id": _SEQUENCE_KEY})
+            return int(doc["value"]) if doc else 0
+        except PyMongoError:
+            pass
+
+    return _COUNTERS[_SEQUENCE_KEY]
+
+
+def stable_seq() -> int:
+    """Highest sequence below which every write reserved in this process has landed."""
+    with _RESERVE_LOCK:
+        current = current_seq()
+        with _LOCK:
+            if _PENDING:
+                return min(current, min(_PENDING) - 1)
+    return current
+
+
+@stamps_changes
+def record_tombstones(kind: str, ids: List[str]) -> List[Tombstone]:
+    tombstones = [
+        Tombstone(kind=kind, id=item_id, seq=seq)
+        for item_id, seq in zip(ids, next_seqs(len(ids)))
+    ]
+    if not tombstones:
+        return []
+    collection = _tombstones()
+    if collection is not None:
+        try:
+            collection.insert_many([dict(tombstone.__dict__) for tombstone in tombstones])
+            return tombstones
+        except PyMongoError:
+            pass
+
+    with _LOCK:
+        for tombstone in tombstones:
+            _TOMBSTONES[f"{kind}:{tombstone.id}"] = tombstone
+    return tombstones
+
+
+def record_tombstone(kind: str, item_id: str) -> Tombstone:
+    return record_tombstones(kind, [item_id])[0]
+
+
+def tombstones_between(after: int, until: int, limit: int) -> List[Tombstone]:
+    """Tombstones with after < seq <= until, oldest first."""
+    collection = _tombstones()
+    if collection is not None:
+        try:
+            docs = (
+                collection.find({"seq": {"$gt": after, "$lte": until}}, {"_id": 0})
+                .sort("seq", 1)
+                .limit(limit)
+            )
+            return [Tombstone(**doc) for doc in docs]
+        except PyMongoError:
+            pass
+
+    with _LOCK:
+        found = [tombstone for tombstone in _TOMBSTONES.values() if after < tombstone.seq <= until]
+    found.sort(key=lambda tombstone: tombstone.seq)
+    return found[:limit]
+
+
+def tombstone_floor() -> int:
+    """Highest sequence of a compacted tombstone; older cursors must resync."""
+    collection = _counters()
+    if collection is not None:
+        try:
+            doc = collection.find_one({"_id": _FLOOR_KEY})
+            return int(doc["value"]) if doc else 0
+        except PyMongoError:
+            pass
+
+    return _COUNTERS[_FLOOR_KEY]
+
+
+def compact_tombstones(retention_days: int) -> int:
+    """Drop tombstones older than the retention window and raise the floor."""
+    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat()
+    collection = _tombstones()
+    counters = _counters()
+    if collection is not None and counters is not None:
+        try:
+            newest = list(
+                collection.find({"deleted_at": {"$lt": cutoff}}, {"_id": 0, "seq": 1})
+                .sort("seq", -1)
+                .limit(1)
+            )
+            if not newest:
+                return 0
+            floor = int(newest[0]["seq"])
+            counters.update_one({"_id": _FLOOR_KEY}, {"$max": {"value": floor}}, upsert=True)
+            result = collection.delete_many({"seq": {"$lte": floor}})
+            return result.deleted_count
+        except PyMongoError:
+            pass
+
+    with _LOCK:
+        expired = [key for key, tombstone in _TOMBSTONES.items() if tombstone.deleted_at < cutoff]
+        if not expired:
+            return 0
+        floor = max(_TOMBSTONES[key].seq for key in expired)
+        _COUNTERS[_FLOOR_KEY] = max(_COUNTERS[_FLOOR_KEY], floor)
+        # Anything below the floor is unreachable for a valid cursor anyway.
+        stale = [key for key, tombstone in _TOMBSTONES.items() if tombstone.seq <= floor]
+        for key in stale:
+            del _TOMBSTONES[key]
+    return len(stale)
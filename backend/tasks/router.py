@@ -6,7 +6,17 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from backend.audit.store import log_event
-from backend.tasks.store import TaskItem, advanced_filter, create_task, delete_task, list_tasks, update_status
+from backend.tasks.store import (
+    TaskItem,
+    advanced_filter,
+    create_task,
+    create_tasks,
+    delete_task,
+    delete_tasks,
+    list_tasks,
+    update_status,
+    update_statuses,
+)
 
 
 router = APIRouter(prefix="/v1/tasks", tags=["tasks"])
@@ -22,6 +32,17 @@ class TaskUpdate(BaseModel):
     status: str = Field(..., pattern="^(pending|in_progress|done)$")
 
 
+class TaskStatusChange(BaseModel):
+    id: str = Field(..., min_length=1)
+    status: str = Field(..., pattern="^(pending|in_progress|done)$")
+
+
+class TaskBulkRequest(BaseModel):
+    create: List[TaskCreate] = Field(default_factory=list, max_length=1000)
+    update: List[TaskStatusChange] = Field(default_factory=list, max_length=1000)
+    delete: List[str] = Field(default_factory=list, max_length=1000)
+
+
 class TaskResponse(BaseModel):
     id: str
     title: str
@@ -37,6 +58,18 @@ class TaskDeleteResponse(BaseModel):
     deleted: bool
 
 
+class TaskUpdateResult(BaseModel):
+    task_id: str
+    updated: bool
+    task: TaskResponse | None = None
+
+
+class TaskBulkResponse(BaseModel):
+    created: List[TaskResponse]
+    updated: List[TaskUpdateResult]
+    deleted: List[TaskDeleteResponse]
+
+
 @router.get("/list", response_model=List[TaskResponse])
 def get_tasks() -> List[TaskResponse]:
     return [TaskResponse(**task.__dict__) for task in list_tasks()]
@@ -124,3 +157,38 @@ def remove_task(task_id: str) -> TaskDeleteResponse:
             {"task_id": task_id},
         )
     return TaskDeleteResponse(task_id=task_id, deleted=deleted)
+
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+def bulk(request: TaskBulkRequest) -> TaskBulkResponse:
+    """Create, update and delete many tasks with one write per operation kind."""
+    created = create_tasks([(item.title, item.details, item.priority) for item in request.create])
+    changes = [(item.id, item.status) for item in request.update]
+    updated = update_statuses(changes)
+    deleted = delete_tasks(request.delete)
+
+    response = TaskBulkResponse(
+        created=[TaskResponse(**task.__dict__) for task in created],
+        updated=[
+            TaskUpdateResult(
+                task_id=task_id,
+                updated=task is not None,
+                task=TaskResponse(**task.__dict__) if task is not None else None,
+            )
+            for (task_id, _), task in zip(changes, updated)
+        ],
+        deleted=[TaskDeleteResponse(task_id=task_id, deleted=deleted[task_id]) for task_id in request.delete],
+    )
+    counts = {
+        "created": len(created),
+        "updated": sum(task is not None for task in updated),
+        "deleted": sum(deleted.values()),
+        "not_found": sum(task is None for task in updated) + sum(not removed for removed in deleted.values()),
+    }
+    log_event(
+        "task.bulk",
+        f"Bulk task operation: {counts['created']} created, "
+        f"{counts['updated']} updated, {counts['deleted']} deleted",
+        counts,
+    )
+    return response
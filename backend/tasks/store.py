@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, MutableMapping, Tuple
 from uuid import uuid4
 
-from pymongo import ReturnDocument
-from pymongo.errors import PyMongoError
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 
 from backend.db.mongo import get_mongo_client
+from backend.db.snapshot_file import LazyRecords
+from backend.sync.store import next_seq, next_seqs, record_tombstone, record_tombstones, stamps_changes
 
 
 @dataclass
@@ -20,9 +22,10 @@ class TaskItem:
     status: str
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    seq: int = 0
 
 
-_TASKS: Dict[str, TaskItem] = {}
+_TASKS: MutableMapping[str, TaskItem] = LazyRecords()
 
 
 def _get_collection():
@@ -34,6 +37,7 @@ def _get_collection():
         return None
 
 
+@stamps_changes
 def create_task(title: str, details: str, priority: str) -> TaskItem:
     task_id = str(uuid4())
     now = datetime.utcnow().isoformat()
@@ -45,6 +49,7 @@ def create_task(title: str, details: str, priority: str) -> TaskItem:
         status="pending",
         created_at=now,
         updated_at=now,
+        seq=next_seq(),
     )
     collection = _get_collection()
     if collection is not None:
@@ -58,6 +63,68 @@ def create_task(title: str, details: str, priority: str) -> TaskItem:
     return task
 
 
+@stamps_changes
+def create_tasks(specs: List[Tuple[str, str, str]]) -> List[TaskItem]:
+    """Create tasks from (title, details, priority) with a single insert_many.
+
+    Returns the tasks that were stored; ones whose insert failed are left out.
+    """
+    if not specs:
+        return []
+    now = datetime.utcnow().isoformat()
+    tasks = [
+        TaskItem(
+            id=str(uuid4()),
+            title=title,
+            details=details,
+            priority=priority,
+            status="pending",
+            created_at=now,
+            updated_at=now,
+            seq=seq,
+        )
+        for (title, details, priority), seq in zip(specs, next_seqs(len(specs)))
+    ]
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            collection.insert_many([dict(task.__dict__) for task in tasks], ordered=False)
+            return tasks
+        except BulkWriteError as exc:
+            # Unordered: every insert ran, and only those in writeErrors failed.
+            # The rest are stored, so falling back would create them twice.
+            failed = {error["index"] for error in exc.details.get("writeErrors", [])}
+            return [task for index, task in enumerate(tasks) if index not in failed]
+        except PyMongoError:
+            pass
+
+    for task in tasks:
+        _TASKS[task.id] = task
+    return tasks
+
+
+@stamps_changes
+def upsert_tasks(tasks: List[TaskItem]) -> None:
+    """Insert or replace tasks by id in a single bulk write."""
+    if not tasks:
+        return
+    for task, seq in zip(tasks, next_seqs(len(tasks))):
+        task.seq = seq
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            collection.bulk_write(
+                [ReplaceOne({"id": task.id}, dict(task.__dict__), upsert=True) for task in tasks],
+                ordered=False,
+            )
+            return
+        except PyMongoError:
+            pass
+
+    for task in tasks:
+        _TASKS[task.id] = task
+
+
 def list_tasks() -> List[TaskItem]:
     collection = _get_collection()
     if collection is not None:
@@ -70,13 +137,88 @@ def list_tasks() -> List[TaskItem]:
     return list(_TASKS.values())
 
 
+def iter_task_batches(batch_size: int) -> Iterator[List[TaskItem]]:
+    """Yield every task in batches, without loading the whole collection."""
+    batch_size = max(1, batch_size)
+    collection = _get_collection()
+    if collection is not None:
+        yielded = False
+        try:
+            batch: List[TaskItem] = []
+            for doc in collection.find({}, {"_id": 0}).batch_size(batch_size):
+                batch.append(TaskItem(**doc))
+                if len(batch) == batch_size:
+                    yielded = True
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+        except PyMongoError:
+            if yielded:
+                raise
+
+    task_ids = list(_TASKS)
+    for start in range(0, len(task_ids), batch_size):
+        batch = [_TASKS[task_id] for task_id in task_ids[start : start + batch_size] if task_id in _TASKS]
+        if batch:
+            yield batch
+
+
+@stamps_changes
+def backfill_task_seqs() -> int:
+    """Stamp tasks written before change tracking, so a resync from 0 returns them.
+
+    Only MongoDB can hold such tasks; every in-memory task gets a seq when
+    it is written.
+    """
+    collection = _get_collection()
+    if collection is None:
+        return 0
+    try:
+        ids = [doc["id"] for doc in collection.find({"seq": {"$in": [None, 0]}}, {"_id": 0, "id": 1})]
+        if ids:
+            collection.bulk_write(
+                [
+                    UpdateOne({"id": task_id, "seq": {"$in": [None, 0]}}, {"$set": {"seq": seq}})
+                    for task_id, seq in zip(ids, next_seqs(len(ids)))
+                ],
+                ordered=False,
+            )
+        return len(ids)
+    except PyMongoError:
+        return 0
+
+
+def tasks_changed_between(after: int, until: int, limit: int) -> List[TaskItem]:
+    """Tasks last written with after < seq <= until, oldest change first."""
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            docs = (
+                collection.find({"seq": {"$gt": after, "$lte": until}}, {"_id": 0})
+                .sort("seq", 1)
+                .limit(limit)
+            )
+            return [TaskItem(**doc) for doc in docs]
+        except PyMongoError:
+            pass
+
+    changed = sorted(
+        (task for task in _TASKS.values() if after < task.seq <= until), key=lambda task: task.seq
+    )
+    return changed[:limit]
+
+
+@stamps_changes
 def update_status(task_id: str, status: str) -> TaskItem | None:
+    seq = next_seq()
     collection = _get_collection()
     if collection is not None:
         try:
             result = collection.find_one_and_update(
                 {"id": task_id},
-                {"$set": {"status": status}},
+                {"$set": {"status": status, "seq": seq}},
                 return_document=ReturnDocument.AFTER,
                 projection={"_id": 0},
             )
@@ -89,20 +231,92 @@ def update_status(task_id: str, status: str) -> TaskItem | None:
     if not task:
         return None
     task.status = status
+    task.seq = seq
     return task
 
 
+@stamps_changes
+def update_statuses(updates: List[Tuple[str, str]]) -> List[TaskItem | None]:
+    """Apply (task_id, status) updates in one bulk write.
+
+    None marks unknown ids and updates that failed or were never applied.
+    """
+    if not updates:
+        return []
+    seqs = next_seqs(len(updates))
+    collection = _get_collection()
+    if collection is not None:
+        ids = [task_id for task_id, _ in updates]
+        applied = len(updates)
+        try:
+            try:
+                collection.bulk_write(
+                    [
+                        UpdateOne({"id": task_id}, {"$set": {"status": status, "seq": seq}})
+                        for (task_id, status), seq in zip(updates, seqs)
+                    ],
+                    # Ordered, so repeated ids end with their last status.
+                    ordered=True,
+                )
+            except BulkWriteError as exc:
+                # Ordered: updates before the first failure landed, later ones never ran.
+                errors = exc.details.get("writeErrors", [])
+                applied = min((error["index"] for error in errors), default=applied)
+            found = {
+                doc["id"]: TaskItem(**doc)
+                for doc in collection.find({"id": {"$in": ids}}, {"_id": 0})
+            }
+            return [found.get(task_id) if index < applied else None for index, task_id in enumerate(ids)]
+        except PyMongoError:
+            pass
+
+    results: List[TaskItem | None] = []
+    for (task_id, status), seq in zip(updates, seqs):
+        task = _TASKS.get(task_id)
+        if task is not None:
+            task.status = status
+            task.seq = seq
+        results.append(task)
+    return results
+
+
+def delete_tasks(task_ids: List[str]) -> Dict[str, bool]:
+    """Delete tasks with one delete_many, leaving a tombstone for each one removed."""
+    if not task_ids:
+        return {}
+    collection = _get_collection()
+    if collection is not None:
+        try:
+            existing = {
+                doc["id"] for doc in collection.find({"id": {"$in": task_ids}}, {"_id": 0, "id": 1})
+            }
+            if existing:
+                collection.delete_many({"id": {"$in": list(existing)}})
+            record_tombstones("task", [task_id for task_id in dict.fromkeys(task_ids) if task_id in existing])
+            return {task_id: task_id in existing for task_id in task_ids}
+        except PyMongoError:
+            pass
+
+    deleted = {task_id: _TASKS.pop(task_id, None) is not None for task_id in dict.fromkeys(task_ids)}
+    record_tombstones("task", [task_id for task_id, removed in deleted.items() if removed])
+    return deleted
+
+
 def delete_task(task_id: str) -> bool:
     collection = _get_collection()
     if collection is not None:
         try:
             result = collection.delete_one({"id": task_id})
             if result.deleted_count:
+                record_tombstone("task", task_id)
                 return True
         except PyMongoError:
             pass
 
-    return _TASKS.pop(task_id, None) is not None
+    deleted = _TASKS.pop(task_id, None) is not None
+    if deleted:
+        record_tombstone("task", task_id)
+    return deleted
 
 
 def advanced_filter(
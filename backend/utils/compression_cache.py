@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+from backend.config import get_settings
+
+
+def cache_key(backend: str, variant: str, text: str) -> str:
+    """Content hash of text plus whatever else changes the result."""
+    digest = hashlib.sha256(f"{backend}:{variant}\0".encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CompressionCache:
+    """LRU of compression results in memory, optionally backed by a directory.
+
+    Disk entries are one JSON file per key (sharded by the first two hex
+    digits) written atomically, so several workers can share a directory.
+    """
+
+    def __init__(self, max_entries: int, directory: str = "") -> None:
+        self.max_entries = max(1, max_entries)
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[str, Dict[str, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Dict[str, object] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.directory is not None:
+            try:
+                entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self.hits += 1
+                return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key: str, entry: Dict[str, object]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, entry: Dict[str, object]) -> None:
+        self._remember(key, entry)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk": str(self.directory) if self.directory else None,
+            }
+
+
+@lru_cache(maxsize=4)
+def _cache_for(max_entries: int, directory: str) -> CompressionCache:
+    return CompressionCache(max_entries, directory)
+
+
+def get_cache() -> CompressionCache:
+    settings = get_settings()
+    return _cache_for(settings.compression_cache_size, settings.compression_cache_dir)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+from backend.config import get_settings
+from backend.integrations.context import estimate_tokens
+
+
+# Inputs larger than this are split into chunks and compressed in worker
+# processes; smaller ones are not worth the pickling round trip.
+PARALLEL_THRESHOLD_CHARS = 256_000
+CHUNK_CHARS = 128_000
+
+_BOILERPLATE_LINES = re.compile(
+    r"^\s*(?:"
+    r">.*"  # quoted reply
+    r"|on\s.{0,200}\swrote:"
+    r"|sent from my\s.*"
+    r"|get outlook for\s.*"
+    r"|(?:unsubscribe|to unsubscribe|confidentiality notice|disclaimer:)\b.*"
+    r"|this (?:e-?mail|message) and any attachments\b.*"
+    r"|[-=_*~#]{3,}"
+    r")\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n")
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    """a about above after again all also am an and any are as at be because been
+    before being but by can could did do does doing for from had has have having he
+    her here hers him his how i if in into is it its just me more most my no nor not
+    now of off on once only or other our out over own same she should so some such
+    than that the their them then there these they this those through to too under
+    until up very was we were what when where which while who why will with would
+    you your yours""".split()
+)
+
+
+@dataclass
+class LocalCompression:
+    text: str
+    original_tokens: int
+    compressed_tokens: int
+    sentences: int
+    kept_sentences: int
+    duplicates: int
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop quoted replies, signatures and separators; normalize whitespace."""
+    text = _BOILERPLATE_LINES.sub("", text)
+    lines = (_INLINE_SPACE.sub(" ", line).strip() for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _sentences(paragraph: str) -> List[str]:
+    return [part.strip() for part in _SENTENCE_END.split(paragraph) if part.strip()]
+
+
+def _content_words(sentence: str) -> List[str]:
+    return [word for word in _WORD.findall(sentence.lower()) if word not in _STOPWORDS]
+
+
+def _compress_chunk(text: str, keep_ratio: float) -> Tuple[str, int, int, int]:
+    """Compress one chunk; returns (text, sentences, kept sentences, duplicates)."""
+    cleaned = strip_boilerplate(text)
+
+    # (paragraph index, sentence, content words), without repeats. Sentences
+    # with the same set of content words count as duplicates.
+    entries: List[Tuple[int, str, List[str]]] = []
+    seen: Set[Tuple[str, ...]] = set()
+    duplicates = 0
+    for paragraph_index, paragraph in enumerate(cleaned.split("\n\n")):
+        for sentence in _sentences(paragraph):
+            words = _content_words(sentence)
+            key = tuple(sorted(set(words))) or (sentence.lower(),)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            entries.append((paragraph_index, sentence, words))
+
+    costs = [estimate_tokens(sentence) for _, sentence, _ in entries]
+    budget = int(sum(costs) * keep_ratio)
+    keep = set(range(len(entries)))
+    if sum(costs) > budget:
+        frequency: Dict[str, int] = {}
+        for _, _, words in entries:
+            for word in words:
+                frequency[word] = frequency.get(word, 0) + 1
+        top = max(frequency.values(), default=1)
+
+        def score(index: int) -> float:
+            paragraph_index, sentence, words = entries[index]
+            if not words:
+                return 0.0
+            value = sum(frequency[word] for word in set(words)) / top / len(words) ** 0.5
+            if index == 0 or entries[index - 1][0] != paragraph_index:
+                value *= 1.25  # paragraph leads tend to carry the topic
+            if any(char.isdigit() for char in sentence):
+                value *= 1.1  # dates, amounts and ids are worth keeping
+            return value
+
+        keep = set()
+        used = 0
+        for index in sorted(range(len(entries)), key=score, reverse=True):
+            if used + costs[index] <= budget:
+                keep.add(index)
+                used += costs[index]
+
+    paragraphs: List[List[str]] = []
+    last_paragraph = None
+    for index, (paragraph_index, sentence, _) in enumerate(entries):
+        if index not in keep:
+            continue
+        if paragraph_index != last_paragraph:
+            paragraphs.append([])
+            last_paragraph = paragraph_index
+        paragraphs[-1].append(sentence)
+    output = "\n".join(" ".join(sentences) for sentences in paragraphs)
+    return output, len(entries) + duplicates, len(keep), duplicates
+
+
+def _chunks(text: str, size: int) -> List[str]:
+    """Split on paragraph breaks into pieces of roughly `size` characters."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end < len(text):
+            cut = text.rfind("\n\n", start, end)
+            end = cut if cut > start else end
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+@lru_cache(maxsize=1)
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _keep_ratio(keep_ratio: float | None) -> float:
+    ratio = get_settings().compression_keep_ratio if keep_ratio is None else keep_ratio
+    return min(1.0, max(0.05, ratio))
+
+
+def local_variant(keep_ratio: float | None = None) -> str:
+    """The settings besides the text that change compress_local's output (for cache keys)."""
+    chunked = get_settings().compression_workers > 1
+    return f"{_keep_ratio(keep_ratio)}:{PARALLEL_THRESHOLD_CHARS}:{CHUNK_CHARS if chunked else 0}"
+
+
+def _combine(text: str, results: List[Tuple[str, int, int, int]]) -> LocalCompression:
+    output = "\n".join(part for part, _, _, _ in results if part)
+    return LocalCompression(
+        text=output,
+        original_tokens=estimate_tokens(text),
+        compressed_tokens=estimate_tokens(output),
+        sentences=sum(result[1] for result in results),
+        kept_sentences=sum(result[2] for result in results),
+        duplicates=sum(result[3] for result in results),
+    )
+
+
+def compress_local(text: str, keep_ratio: float | None = None) -> LocalCompression:
+    """Extractive, offline compression of free text.
+
+    Boilerplate and whitespace are stripped, repeated sentences dropped, and
+    the highest-scoring sentences (by content-word frequency) kept in their
+    original order until `keep_ratio` of the remaining tokens is used. Large
+    inputs are compressed chunk by chunk in a process pool, so repeats are
+    only detected within a chunk.
+    """
+    ratio = _keep_ratio(keep_ratio)
+    workers = get_settings().compression_workers
+    if len(text) > PARALLEL_THRESHOLD_CHARS and workers > 1:
+        chunks = _chunks(text, CHUNK_CHARS)
+        results = list(_worker_pool(workers).map(_compress_chunk, chunks, [ratio] * len(chunks)))
+    else:
+        results = [_compress_chunk(text, ratio)]
+    return _combine(text, results)
+
+
+def compress_local_many(texts: List[str], keep_ratio: float | None = None) -> List[LocalCompression]:
+    """compress_local for many texts, spreading small ones over the worker pool."""
+    ratio = _keep_ratio(keep_ratio)
+    workers = get_settings().compression_workers
+    small = [index for index, text in enumerate(texts) if len(text) <= PARALLEL_THRESHOLD_CHARS]
+    small_chars = sum(len(texts[index]) for index in small)
+    if workers > 1 and len(small) > 1 and small_chars > PARALLEL_THRESHOLD_CHARS // 4:
+        mapped = _worker_pool(workers).map(
+            _compress_chunk,
+            [texts[index] for index in small],
+            [ratio] * len(small),
+            chunksize=max(1, len(small) // (workers * 4)),
+        )
+        results: List[LocalCompression | None] = [None] * len(texts)
+        for index, result in zip(small, mapped):
+            results[index] = _combine(texts[index], [result])
+        return [
+            result or compress_local(texts[index], ratio) for index, result in enumerate(results)
+        ]
+    return [compress_local(text, ratio) for text in texts]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from typing import List
+
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
-from backend.utils.scaledown import compress_text
+from backend.utils.compression_cache import get_cache
+from backend.utils.scaledown import CompressionResult, compress_many, compress_text
 
 
 router = APIRouter(prefix="/v1/utils", tags=["utils"])
@@ -13,13 +16,35 @@ class CompressRequest(BaseModel):
     text: str = Field(..., min_length=1)
 
 
-@router.post("/compress")
-def compress(request: CompressRequest) -> dict:
-    result = compress_text(request.text)
+class CompressBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=500)
+
+
+def _result_payload(result: CompressionResult) -> dict:
     return {
         "ok": result.ok,
         "ratio": result.ratio,
         "original_size": result.original_size,
         "compressed_size": result.compressed_size,
         "summary": result.summary,
+        "compressed_text": result.compressed_text,
+        "original_tokens": result.original_tokens,
+        "compressed_tokens": result.compressed_tokens,
+        "token_ratio": result.token_ratio,
+        "backend": result.backend,
+        "cached": result.cached,
+    }
+
+
+@router.post("/compress")
+def compress(request: CompressRequest) -> dict:
+    return _result_payload(compress_text(request.text))
+
+
+@router.post("/compress/batch")
+def compress_batch(request: CompressBatchRequest) -> dict:
+    results = compress_many(request.texts)
+    return {
+        "results": [_result_payload(result) for result in results],
+        "cache": get_cache().stats(),
     }
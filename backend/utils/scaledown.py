@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import asdict, dataclass
+from typing import Dict, List
 
 import requests
 
 from backend.config import get_settings
+from backend.utils.compression_cache import cache_key, get_cache
+from backend.utils.compressor import LocalCompression, compress_local_many, local_variant
+from backend.utils.scaledown_client import get_client
 
 
 @dataclass
@@ -15,33 +18,108 @@ class CompressionResult:
     original_size: int
     compressed_size: int
     summary: str
+    compressed_text: str = ""
+    original_tokens: int = 0
+    compressed_tokens: int = 0
+    token_ratio: float = 0.0
+    backend: str = "local"
+    cached: bool = False
 
 
-def compress_text(text: str) -> CompressionResult:
-    settings = get_settings()
-    if not settings.scaledown_api_key:
-        original_size = len(text.encode("utf-8"))
-        compressed_size = max(1, int(original_size * 0.15))
-        return CompressionResult(
-            ok=True,
-            ratio=0.85,
-            original_size=original_size,
-            compressed_size=compressed_size,
-            summary="Simulated compression (no API key)",
-        )
+def _saved(original: int, compressed: int) -> float:
+    return round(1 - compressed / original, 4) if original else 0.0
 
-    url = "https://api.scaledown.ai/v1/compress"
-    headers = {"Authorization": f"Bearer {settings.scaledown_api_key}"}
-    payload: Dict[str, str] = {"text": text}
 
-    response = requests.post(url, json=payload, headers=headers, timeout=10)
-    response.raise_for_status()
-    data = response.json()
+def _local_result(text: str, result: LocalCompression) -> CompressionResult:
+    original_size = len(text.encode("utf-8"))
+    compressed_size = len(result.text.encode("utf-8"))
+    return CompressionResult(
+        ok=True,
+        ratio=_saved(original_size, compressed_size),
+        original_size=original_size,
+        compressed_size=compressed_size,
+        summary=(
+            f"Local compression: kept {result.kept_sentences} of {result.sentences} "
+            f"sentences ({result.duplicates} duplicates removed)"
+        ),
+        compressed_text=result.text,
+        original_tokens=result.original_tokens,
+        compressed_tokens=result.compressed_tokens,
+        token_ratio=_saved(result.original_tokens, result.compressed_tokens),
+        backend="local",
+    )
+
 
+def _from_remote(data: Dict[str, object]) -> CompressionResult:
     return CompressionResult(
         ok=True,
         ratio=float(data.get("ratio", 0.0)),
         original_size=int(data.get("original_size", 0)),
         compressed_size=int(data.get("compressed_size", 0)),
         summary="ScaleDown compression",
+        compressed_text=str(data.get("compressed_text", "")),
+        backend="scaledown",
     )
+
+
+def _use_remote() -> bool:
+    settings = get_settings()
+    return settings.compression_backend == "scaledown" and bool(settings.scaledown_api_key)
+
+
+def compress_many(texts: List[str]) -> List[CompressionResult]:
+    """Compress several texts, reusing cached results for repeated inputs.
+
+    Results are cached by content hash (in memory, and on disk when
+    COMPRESSION_CACHE_DIR is set). With the ScaleDown backend a single
+    uncached text goes upstream on its own and several go in size-limited
+    batches; if that fails, the local engine answers instead.
+    """
+    remote = _use_remote()
+    backend = "scaledown" if remote else "local"
+    variant = "" if remote else local_variant()
+    cache = get_cache()
+
+    keys = [cache_key(backend, variant, text) for text in texts]
+    found: Dict[str, CompressionResult] = {}
+    missing: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key in found or key in missing:
+            continue
+        entry = cache.get(key)
+        if entry is not None:
+            found[key] = CompressionResult(**{**entry, "cached": True})
+        else:
+            missing[key] = text
+
+    if missing:
+        computed: Dict[str, CompressionResult] = {}
+        if remote:
+            try:
+                client = get_client()
+                pending = list(missing.values())
+                if len(pending) == 1:
+                    items = [client.compress(pending[0])]
+                else:
+                    items = client.compress_batch(pending)
+                computed = {key: _from_remote(item) for key, item in zip(missing, items)}
+            except requests.RequestException:
+                computed = {}
+        local_keys = [key for key in missing if key not in computed]
+        local = compress_local_many([missing[key] for key in local_keys])
+        computed.update(
+            (key, _local_result(missing[key], result)) for key, result in zip(local_keys, local)
+        )
+        for key in missing:
+            result = computed[key]
+            # A local fallback is not cached, so the next call retries upstream.
+            if result.backend == backend:
+                cache.put(key, asdict(result))
+            found[key] = result
+
+    return [found[key] for key in keys]
+
+
+def compress_text(text: str) -> CompressionResult:
+    """Compress text with the configured backend (see compress_many)."""
+    return compress_many([text])[0]
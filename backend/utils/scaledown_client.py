@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Iterator, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.config import get_settings
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Answers meaning the server has no batch route; texts then go one by one.
+BATCH_UNSUPPORTED = (404, 405, 501)
+
+
+class ScaleDownClient:
+    """HTTP client for the ScaleDown API with connection reuse and retries.
+
+    One pooled session is shared by all calls, so TLS is negotiated once per
+    connection rather than per text. Connection errors and 429/5xx answers
+    are retried with exponential backoff (honouring Retry-After).
+    `compress_batch` packs many texts into each upstream request, up to
+    `max_batch_bytes` of text per request; `compress` sends a single text.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_batch_bytes: int = 256_000,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+        timeout: float = 30.0,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.max_batch_bytes = max_batch_bytes
+        self.timeout = timeout
+        self.batch_supported = True
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_seconds,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _post(self, path: str, payload: Dict[str, object]) -> Dict[str, object]:
+        response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def compress(self, text: str) -> Dict[str, object]:
+        return self._post("/v1/compress", {"text": text})
+
+    def _batches(self, texts: List[str]) -> Iterator[List[str]]:
+        batch: List[str] = []
+        size = 0
+        for text in texts:
+            length = len(text.encode("utf-8"))
+            if batch and size + length > self.max_batch_bytes:
+                yield batch
+                batch, size = [], 0
+            batch.append(text)
+            size += length
+        if batch:
+            yield batch
+
+    def compress_batch(self, texts: List[str]) -> List[Dict[str, object]]:
+        """Compress texts in as few requests as the size limit allows, in order.
+
+        If the server has no batch route, texts are sent one request each,
+        and later calls on this client skip the batch route.
+        """
+        results: List[Dict[str, object]] = []
+        for batch in self._batches(texts):
+            if self.batch_supported:
+                try:
+                    data = self._post("/v1/compress/batch", {"texts": batch})
+                except requests.HTTPError as exc:
+                    status = exc.response.status_code if exc.response is not None else 0
+                    if status not in BATCH_UNSUPPORTED:
+                        raise
+                    self.batch_supported = False
+                else:
+                    items = list(data.get("results", []))
+                    if len(items) != len(batch):
+                        raise requests.RequestException(
+                            f"ScaleDown returned {len(items)} results for {len(batch)} texts"
+                        )
+                    results.extend(items)
+                    continue
+            results.extend(self.compress(text) for text in batch)
+        return results
+
+
+@lru_cache(maxsize=4)
+def _client_for(base_url: str, api_key: str, max_batch_bytes: int, retries: int) -> ScaleDownClient:
+    return ScaleDownClient(base_url, api_key, max_batch_bytes=max_batch_bytes, retries=retries)
+
+
+def get_client() -> ScaleDownClient:
+    settings = get_settings()
+    return _client_for(
+        settings.scaledown_base_url,
+        settings.scaledown_api_key,
+        settings.scaledown_batch_max_bytes,
+        settings.scaledown_retries,
+    )
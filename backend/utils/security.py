@@ -20,7 +20,7 @@ def is_protected(request: Request) -> bool:
     if path.startswith("/docs") or path.startswith("/openapi"):
         return False
 
-    if path.startswith("/v1/export"):
+    if path.startswith("/v1/export") or path.startswith("/v1/sync"):
         return True
 
     if settings.admin_api_key and path.startswith("/v1/admin"):
@@ -0,0 +1,66 @@
+"""Throughput of /v1/agents/batch against one /v1/agents/route call per item.
+
+Usage: python benchmarks/bench_agent_batch.py [--items 200] [--agent-latency-ms 5]
+
+Runs in-process through FastAPI's TestClient. --agent-latency-ms adds a sleep
+to every agent run to stand in for agents that call an LLM or integration.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.agents import router as agents_router  # noqa: E402
+from backend.main import app  # noqa: E402
+
+
+def _slow_down(latency_s: float) -> None:
+    for agent in agents_router.AGENTS:
+        original = agent.run
+
+        def run(payload, _original=original):
+            time.sleep(latency_s)
+            return _original(payload)
+
+        agent.run = run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--agent-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.agent_latency_ms:
+        _slow_down(args.agent_latency_ms / 1000)
+
+    client = TestClient(app)
+    items = [
+        {"task_type": "expense", "payload": {"amount": index}}
+        for index in range(args.items)
+    ]
+
+    start = time.perf_counter()
+    for item in items:
+        client.post("/v1/agents/route", json=item).raise_for_status()
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = client.post("/v1/agents/batch", json={"requests": items})
+    response.raise_for_status()
+    batch_s = time.perf_counter() - start
+    assert response.json()["succeeded"] == args.items
+
+    print(f"items={args.items} agent_latency_ms={args.agent_latency_ms}")
+    print(f"sequential /route: {sequential_s:.3f} s  ({args.items / sequential_s:,.0f} items/s)")
+    print(f"single /batch:     {batch_s:.3f} s  ({args.items / batch_s:,.0f} items/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Local compression throughput on MB-scale text.
+
+Usage: python benchmarks/bench_compression.py [--mb 8] [--workers 4]
+
+Builds a synthetic mailbox (threads with quoted replies, signatures and
+repeated sentences) and compresses it with the offline engine in
+backend/utils/compressor.py, once in-process and once with the worker pool.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+TOPICS = ["budget", "launch", "hiring", "travel", "roadmap", "invoice", "offsite", "security"]
+VERBS = ["moves to", "depends on", "is blocked by", "was approved for", "needs review before"]
+
+
+def mailbox(size_bytes: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_bytes:
+        topic = rng.choice(TOPICS)
+        lines = [
+            f"The {topic} plan for ticket {rng.randint(1000, 99999)} {rng.choice(VERBS)} "
+            f"the {rng.choice(TOPICS)} sync on day {rng.randint(1, 28)}."
+            for _ in range(rng.randint(3, 8))
+        ]
+        lines.append(lines[0])
+        body = "\n".join(
+            [
+                "Hi all,",
+                "",
+                " ".join(lines),
+                "",
+                "On Tue, someone <someone@example.com> wrote:",
+                *(f"> {line}" for line in lines[:3]),
+                "",
+                "Sent from my phone",
+                "-----",
+            ]
+        )
+        parts.append(body)
+        total += len(body) + 2
+    return "\n\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    text = mailbox(int(args.mb * 1_000_000))
+    size_mb = len(text.encode("utf-8")) / 1_000_000
+
+    from backend.config import get_settings
+    from backend.utils import compressor
+
+    print(f"input={size_mb:.1f} MB")
+    for workers in (1, args.workers):
+        os.environ["COMPRESSION_WORKERS"] = str(workers)
+        get_settings.cache_clear()
+        if workers > 1:
+            compressor._worker_pool(workers).submit(len, "").result()  # start the pool
+        start = time.perf_counter()
+        result = compressor.compress_local(text)
+        elapsed = time.perf_counter() - start
+        out_mb = len(result.text.encode("utf-8")) / 1_000_000
+        print(
+            f"workers={workers}: {elapsed:5.2f} s  {size_mb / elapsed:5.2f} MB/s  "
+            f"bytes saved={1 - out_mb / size_mb:.1%}  "
+            f"tokens saved={1 - result.compressed_tokens / result.original_tokens:.1%}  "
+            f"duplicates={result.duplicates}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Prompt size and latency saved by the token-budgeted context builder.
+
+Usage: python benchmarks/bench_context.py [--turns 200] [--budget 2048]
+       [--prompt-eval-tps 60] [--live]
+
+Without --live the prompt-eval latency is modelled from a tokens/sec rate
+(60 tok/s is typical for an 8B model on CPU). With --live each prompt is sent
+to the configured Ollama server and the wall-clock time is measured.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.integrations.context import build_context, message_tokens  # noqa: E402
+from backend.integrations.ollama_client import OllamaMessage, chat_ollama  # noqa: E402
+
+
+def _conversation(turns: int) -> list:
+    return [
+        OllamaMessage(
+            role="user" if index % 2 == 0 else "assistant",
+            content=(
+                f"Turn {index}. Let's go over the plan for the week again: "
+                "groceries on Monday, dentist on Wednesday, and the quarterly "
+                "report draft due Friday. Remind me about the budget review too."
+            ),
+        )
+        for index in range(turns)
+    ]
+
+
+def _timed_chat(messages: list) -> float:
+    start = time.perf_counter()
+    chat_ollama(messages)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2048)
+    parser.add_argument("--prompt-eval-tps", type=float, default=60.0)
+    parser.add_argument("--live", action="store_true")
+    args = parser.parse_args()
+
+    history = _conversation(args.turns)
+    system = OllamaMessage(role="system", content="You are a helpful assistant.")
+    full_tokens = message_tokens(system) + sum(message_tokens(msg) for msg in history)
+
+    start = time.perf_counter()
+    iterations = 200
+    for _ in range(iterations):
+        context = build_context(history, system_prompt=system.content, budget=args.budget)
+    build_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    print(f"turns={args.turns} budget={args.budget}")
+    print(f"full prompt tokens:     {full_tokens}")
+    print(f"budgeted prompt tokens: {context.prompt_tokens}")
+    print(
+        f"kept={context.kept_turns} condensed={context.condensed_turns} "
+        f"dropped={context.dropped_turns}"
+    )
+    print(f"builder overhead:       {build_ms:.3f} ms")
+
+    if args.live:
+        full_s = _timed_chat([system, *history])
+        budgeted_s = _timed_chat(context.messages)
+        print(f"live latency full:      {full_s:.2f} s")
+        print(f"live latency budgeted:  {budgeted_s:.2f} s")
+    else:
+        full_s = full_tokens / args.prompt_eval_tps
+        budgeted_s = context.prompt_tokens / args.prompt_eval_tps
+        print(f"modelled prompt eval:   {full_s:.1f} s -> {budgeted_s:.1f} s")
+    print(f"latency saved:          {full_s - budgeted_s:.1f} s per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Peak memory of the full export, built in memory vs streamed.
+
+Usage: python benchmarks/bench_export.py [--conversations 2000] [--messages 40]
+
+Fills the in-memory stores, then measures the extra memory (tracemalloc
+peak) needed to produce /v1/export/all as one dict serialized at once and
+as the chunked stream from backend/export/stream.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.conversations import store as conversation_store  # noqa: E402
+from backend.export import stream  # noqa: E402
+from backend.profiles import store as profile_store  # noqa: E402
+from backend.tasks import store as task_store  # noqa: E402
+
+
+def seed(conversations: int, messages: int) -> None:
+    conversation_store._get_collection = lambda: None
+    task_store._get_collection = lambda: None
+    profile_store._get_collection = lambda: None
+    for n in range(conversations):
+        task_store.create_task(f"Task {n}", "Follow up on the quarterly report " * 4, "medium")
+        conversation = conversation_store.create_conversation(f"Conversation {n}")
+        for m in range(messages):
+            conversation_store.append_message(
+                conversation.id, "user" if m % 2 == 0 else "assistant", f"Message {m} about item {n}. " * 6
+            )
+
+
+def in_memory() -> int:
+    document = {
+        "profile": profile_store.get_profile().__dict__,
+        "tasks": [task.__dict__ for task in task_store.list_tasks()],
+        "conversations": [
+            {"id": conv.id, "title": conv.title, "messages": [msg.__dict__ for msg in conv.messages]}
+            for conv in conversation_store.list_conversations()
+        ],
+    }
+    return len(json.dumps(document).encode("utf-8"))
+
+
+def streamed() -> int:
+    return sum(len(chunk) for chunk in stream.export_stream("json", list(stream.COLLECTIONS)))
+
+
+def measure(name: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:10s} {size / 1e6:8.1f} MB out  peak {peak / 1e6:8.1f} MB  {elapsed:6.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=40)
+    args = parser.parse_args()
+    seed(args.conversations, args.messages)
+    measure("in-memory", in_memory)
+    measure("streamed", streamed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Import throughput in records per second.
+
+Usage: python benchmarks/bench_import.py [--tasks 20000] [--conversations 2000] [--rtt-ms 0.5]
+
+Builds an NDJSON export in memory and loads it through the /v1/import
+pipeline (incremental parse, validation, batched upserts), then compares
+with the per-item path the API offered before: one create_task plus one
+audit event per record. Each run is done twice: against the in-memory
+stores, and against collections that only count calls and sleep --rtt-ms
+per call, which stands in for MongoDB round trips.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.audit import store as audit_store  # noqa: E402
+from backend.conversations import store as conversation_store  # noqa: E402
+from backend.importer.ingest import Importer  # noqa: E402
+from backend.importer.parse import NdjsonReader  # noqa: E402
+from backend.profiles import store as profile_store  # noqa: E402
+from backend.sync import store as sync_store  # noqa: E402
+from backend.tasks import store as task_store  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+class LatencyCollection:
+    """Accepts every write after one simulated round trip and keeps nothing."""
+
+    def __init__(self, rtt: float) -> None:
+        self.rtt = rtt
+        self.calls = 0
+        self.counter = 0
+
+    def _trip(self) -> None:
+        self.calls += 1
+        time.sleep(self.rtt)
+
+    def insert_one(self, doc):
+        self._trip()
+
+    def insert_many(self, docs, **kwargs):
+        self._trip()
+
+    def bulk_write(self, requests, **kwargs):
+        self._trip()
+
+    def find_one_and_update(self, query, update, **kwargs):
+        self._trip()
+        self.counter += update["$inc"]["value"]
+        return {"value": self.counter}
+
+
+class LatencyDb(dict):
+    def __init__(self, collection: LatencyCollection) -> None:
+        super().__init__()
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+def use_stores(collection: LatencyCollection | None) -> None:
+    for module in (audit_store, conversation_store, profile_store, task_store):
+        module._get_collection = lambda: collection
+    sync_store._get_db = lambda: LatencyDb(collection) if collection is not None else None
+
+
+def export_body(tasks: int, conversations: int) -> bytes:
+    lines = []
+    for n in range(tasks):
+        task = {"id": f"task-{n}", "title": f"Task {n}", "details": "Imported from the old tool", "priority": "medium"}
+        lines.append(json.dumps({"type": "tasks", "data": task}))
+    for n in range(conversations):
+        messages = [
+            {"role": "user" if m % 2 == 0 else "assistant", "content": f"Message {m}", "timestamp": "2024-01-01T00:00:00Z"}
+            for m in range(10)
+        ]
+        conversation = {"id": f"conv-{n}", "title": f"Conversation {n}", "messages": messages}
+        lines.append(json.dumps({"type": "conversations", "data": conversation}))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def bulk_import(body: bytes) -> dict:
+    reader = NdjsonReader()
+    importer = Importer()
+    for start in range(0, len(body), CHUNK):
+        for item in reader.feed(body[start : start + CHUNK]):
+            importer.add(*item)
+        if importer.pending >= importer.batch_size:
+            importer.flush()
+    for item in reader.finish():
+        importer.add(*item)
+    importer.flush()
+    audit_store.log_event("data.import", "benchmark", importer.summary.snapshot())
+    return importer.summary.snapshot()
+
+
+def per_item(tasks: int) -> float:
+    started = time.perf_counter()
+    for n in range(tasks):
+        task = task_store.create_task(f"Task {n}", "Imported from the old tool", "medium")
+        audit_store.log_event("task.create", f"Task created: {task.title}", {"task_id": task.id})
+    return tasks / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    body = export_body(args.tasks, args.conversations)
+    print(f"{args.tasks + args.conversations} records, {len(body) / 1e6:.1f} MB of NDJSON")
+
+    for label, collection in (("memory", None), (f"rtt {args.rtt_ms}ms", LatencyCollection(args.rtt_ms / 1000))):
+        use_stores(collection)
+        summary = bulk_import(body)
+        trips = collection.calls if collection is not None else 0
+        print(f"{label:12s} bulk import  {summary['records_per_second']:>9.0f} records/s  {trips} round trips")
+        # The per-item path is timed on a slice so the slow case stays short.
+        sample = min(args.tasks, 2000)
+        before = collection.calls if collection is not None else 0
+        rate = per_item(sample)
+        trips = (collection.calls - before) if collection is not None else 0
+        print(f"{label:12s} per item     {rate:>9.0f} records/s  {trips} round trips for {sample}")
+
+
+if __name__ == "__main__":
+    main()
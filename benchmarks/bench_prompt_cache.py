@@ -0,0 +1,102 @@
+"""Prompt-eval work per chat turn with and without a cache-friendly layout.
+
+Usage: python benchmarks/bench_prompt_cache.py [--conversations 4] [--turns 40] [--budget 600]
+
+Runs several multi-turn conversations concurrently against two local Ollama
+stubs (see ollama_stub.py) that model prefix reuse: each stub keeps a couple
+of prompts (--cache-slots) in its "KV cache" and only charges for tokens after the longest
+shared prefix. Compares a window that slides by one message per turn without
+node affinity, the stepped window alone, and the stepped window with
+conversation-to-node affinity.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ollama_stub import OllamaStub  # noqa: E402
+
+SYSTEM_PROMPT = "You are a concise personal assistant. Answer in one or two sentences."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conversations", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=600)
+    parser.add_argument("--cache-slots", type=int, default=4)
+    args = parser.parse_args()
+
+    stub_args = {"base_latency": 0.01, "per_token_latency": 0.0002, "prefix_cache_slots": args.cache_slots}
+    with OllamaStub(**stub_args) as stub_a, OllamaStub(**stub_args) as stub_b:
+        os.environ["OLLAMA_BASE_URLS"] = f"{stub_a.url},{stub_b.url}"
+        os.environ["OLLAMA_HEALTH_INTERVAL_SECONDS"] = "3600"
+        from backend.config import get_settings
+        from backend.integrations import ollama_pool
+        from backend.integrations.context import build_context
+        from backend.integrations.ollama_client import OllamaMessage, chat_ollama
+
+        get_settings.cache_clear()
+
+        def converse(conv_id: str, window_grain: int | None, sticky: bool) -> None:
+            history = []
+            rng = random.Random(conv_id)
+            for turn in range(args.turns):
+                # Users pause between turns, so arrivals interleave irregularly.
+                time.sleep(rng.uniform(0, 0.05))
+                history.append(
+                    OllamaMessage(
+                        role="user",
+                        content=f"[{conv_id}] turn {turn}: " + "what should I plan for next week? " * 4,
+                    )
+                )
+                context = build_context(
+                    history, system_prompt=SYSTEM_PROMPT, budget=args.budget, window_grain=window_grain
+                )
+                result = chat_ollama(context.messages, session=conv_id if sticky else None)
+                history.append(OllamaMessage(role="assistant", content=result.message))
+
+        variants = (
+            ("sliding, no affinity", 1, False),
+            ("stepped, no affinity", None, False),
+            ("stepped + affinity", None, True),
+        )
+        total_turns = args.conversations * args.turns
+        print(
+            f"conversations={args.conversations} turns={args.turns} budget={args.budget} "
+            f"nodes=2 cache_slots={args.cache_slots}"
+        )
+        for label, grain, sticky in variants:
+            ollama_pool._pool_for.cache_clear()
+            for stub in (stub_a, stub_b):
+                stub._cache.clear()
+                stub.prompt_tokens_evaluated = 0
+            threads = [
+                threading.Thread(target=converse, args=(f"c{index}", grain, sticky))
+                for index in range(args.conversations)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            evaluated = stub_a.prompt_tokens_evaluated + stub_b.prompt_tokens_evaluated
+            eval_seconds = evaluated * stub_args["per_token_latency"]
+            print(
+                f"{label:>22}: {elapsed:5.2f} s  prompt tokens evaluated/turn="
+                f"{evaluated / total_turns:6.1f}  prompt-eval ms/turn="
+                f"{eval_seconds * 1000 / total_turns:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
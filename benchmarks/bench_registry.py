@@ -0,0 +1,62 @@
+"""Heuristic agent lookup cost as the number of agents and handles grows.
+
+Usage: python benchmarks/bench_registry.py
+
+Compares the old linear substring scan against AgentRegistry.match for
+registries of increasing size; the registry timing should stay roughly flat.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.agents.base import BaseAgent  # noqa: E402
+from backend.agents.registry import AgentRegistry  # noqa: E402
+
+
+QUERY = "could you please log how well i slept last night and add it to my journal"
+
+
+def _agents(count: int, handles_per_agent: int) -> list:
+    agents = []
+    for index in range(count):
+        agent = BaseAgent()
+        agent.name = f"agent{index}"
+        agent.handles = [f"topic{index}x{handle}" for handle in range(handles_per_agent)]
+        agents.append(agent)
+    last = agents[-1]
+    last.handles = [*last.handles, "journal"]
+    return agents
+
+
+def _linear(agents: list, query: str):
+    lowered = query.lower()
+    for agent in agents:
+        if any(handle in lowered for handle in agent.handles):
+            return agent
+    return None
+
+
+def _time(fn, iterations: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1_000_000 / iterations
+
+
+def main() -> None:
+    print(f"{'agents':>7} {'handles':>8} {'linear us':>10} {'registry us':>12}")
+    for count in (4, 16, 64, 256):
+        agents = _agents(count, 10)
+        registry = AgentRegistry(agents)
+        assert _linear(agents, QUERY) is registry.match(QUERY)
+        linear_us = _time(lambda: _linear(agents, QUERY))
+        registry_us = _time(lambda: registry.match(QUERY))
+        print(f"{count:>7} {count * 10:>8} {linear_us:>10.1f} {registry_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Routing throughput with and without LLM micro-batching.
+
+Usage: python benchmarks/bench_route_batching.py [--queries 64] [--window-ms 15]
+
+Fires concurrent /v1/agents/auto-style LLM routing lookups at a local Ollama
+stub (see ollama_stub.py) that charges a fixed cost per request plus a cost
+per prompt token, so batching amortizes the shared routing prompt.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ollama_stub import OllamaStub  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--window-ms", type=int, default=15)
+    parser.add_argument("--max-batch", type=int, default=16)
+    args = parser.parse_args()
+
+    with OllamaStub(base_latency=0.08, per_token_latency=0.0005) as stub:
+        os.environ["OLLAMA_BASE_URL"] = stub.url
+        from backend.agents import router as agents_router
+        from backend.config import get_settings
+
+        queries = [f"please log how I slept on night {index}" for index in range(args.queries)]
+
+        async def run_all() -> float:
+            start = time.perf_counter()
+            picks = await asyncio.gather(*(agents_router._llm_route(q) for q in queries))
+            assert all(pick is not None for pick in picks)
+            return time.perf_counter() - start
+
+        results = {}
+        for label, window in (("unbatched", 0), ("batched", args.window_ms)):
+            os.environ["AGENT_ROUTE_BATCH_WINDOW_MS"] = str(window)
+            os.environ["AGENT_ROUTE_BATCH_MAX"] = str(args.max_batch)
+            get_settings.cache_clear()
+            agents_router._BATCHER = None
+            calls_before = stub.calls
+            elapsed = asyncio.run(run_all())
+            results[label] = (elapsed, stub.calls - calls_before)
+
+    print(f"queries={args.queries} window_ms={args.window_ms} max_batch={args.max_batch}")
+    for label, (elapsed, calls) in results.items():
+        print(f"{label:>10}: {elapsed:.2f} s  {args.queries / elapsed:6.1f} q/s  llm_calls={calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Snapshot write and restore time for the in-memory task store.
+
+Usage: python benchmarks/bench_snapshot.py [--tasks 1000000] [--dir /tmp/paes-snapshot]
+
+Fills the in-memory task store, writes a snapshot, then restores it into an
+empty store the way startup does. It also times reading 1000 random tasks,
+decoding every task, and (for comparison) parsing the same tasks from a JSON
+export.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.db import snapshots  # noqa: E402
+from backend.db.snapshot_file import LazyRecords  # noqa: E402
+from backend.tasks import store as task_store  # noqa: E402
+from backend.tasks.store import TaskItem  # noqa: E402
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:28s} {time.perf_counter() - started:7.2f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--dir", default="")
+    args = parser.parse_args()
+    directory = args.dir or tempfile.mkdtemp(prefix="paes-snapshot-")
+
+    store = task_store._TASKS = LazyRecords()
+    for n in range(args.tasks):
+        task_id = f"{n:08d}-task"
+        store[task_id] = TaskItem(
+            id=task_id,
+            title=f"Task {n}",
+            details="Follow up with the team about the quarterly plan",
+            priority="medium",
+            status="pending",
+            created_at="2025-01-01T00:00:00",
+            updated_at="2025-01-01T00:00:00",
+            seq=n + 1,
+        )
+
+    info = timed("write snapshot", lambda: snapshots.write_snapshot(directory))
+    print(f"{'':28s} {info.records} records, {info.bytes / 1e6:.1f} MB")
+
+    task_store._TASKS = LazyRecords()
+    timed("restore (index + mmap)", lambda: snapshots.restore_snapshot(directory))
+    ids = random.Random(1).sample(list(task_store._TASKS), min(1000, args.tasks))
+    timed("read 1000 random tasks", lambda: [task_store._TASKS[task_id] for task_id in ids])
+    timed("decode all tasks", lambda: list(task_store._TASKS.values()))
+
+    task_store._TASKS = LazyRecords()
+    snapshots.restore_snapshot(directory)
+    timed("write again, none decoded", lambda: snapshots.write_snapshot(directory))
+
+    export = json.dumps([task.__dict__ for task in task_store._TASKS.values()])
+    timed("parse JSON export", lambda: {doc["id"]: TaskItem(**doc) for doc in json.loads(export)})
+
+
+if __name__ == "__main__":
+    main()
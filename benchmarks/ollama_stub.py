@@ -0,0 +1,122 @@
+"""Minimal Ollama-compatible HTTP server for benchmarks.
+
+Serves /api/chat and /api/tags. Requests are processed one at a time, as a
+single CPU-bound Ollama instance would, and each one costs
+    base_latency + per_token_latency * <estimated prompt tokens>
+seconds. With prefix_cache_slots > 0 the stub also models Ollama's KV
+cache: it keeps the last few prompts (plus their replies) in slots and only
+charges for the tokens after the prefix shared with the slot it reuses. Replies to numbered multi-item prompts ("1. ...") with one
+"<n>: <agent>" line per item, and otherwise with a single agent name.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+_NUMBERED = re.compile(r"^(\d+)\.\s", re.MULTILINE)
+
+
+def _reply_for(content: str) -> str:
+    numbers = _NUMBERED.findall(content)
+    if numbers:
+        return "\n".join(f"{number}: health" for number in numbers)
+    return "health"
+
+
+class OllamaStub:
+    def __init__(
+        self,
+        base_latency: float = 0.05,
+        per_token_latency: float = 0.0005,
+        prefix_cache_slots: int = 0,
+    ) -> None:
+        self.base_latency = base_latency
+        self.per_token_latency = per_token_latency
+        self.prefix_cache_slots = prefix_cache_slots
+        self.calls = 0
+        self.prompt_tokens_evaluated = 0
+        self._cache: List[str] = []
+        self._busy = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "OllamaStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def cost(self, body: dict) -> Tuple[float, int]:
+        text = "".join(
+            f"<{msg.get('role', '')}>{msg.get('content', '')}" for msg in body.get("messages", [])
+        )
+        reused = 0
+        if self.prefix_cache_slots:
+            # Like llama.cpp's slot selection: take over the slot sharing the
+            # longest prefix if it covers at least half of that slot, and
+            # otherwise evict the least recently used slot.
+            best = -1
+            for index, cached in enumerate(self._cache):
+                shared = len(os.path.commonprefix([cached, text]))
+                if shared > reused and shared * 2 >= len(cached):
+                    reused, best = shared, index
+            if best >= 0:
+                self._cache.pop(best)
+            user = [m for m in body.get("messages", []) if m.get("role") == "user"]
+            reply = _reply_for(user[-1]["content"] if user else "")
+            self._cache.append(f"{text}<assistant>{reply}")
+            del self._cache[: -self.prefix_cache_slots]
+        tokens = max(1, (len(text) - reused) // 4)
+        self.prompt_tokens_evaluated += tokens
+        return self.base_latency + self.per_token_latency * tokens, tokens
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                return
+
+            def _send(self, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._send({"models": [{"name": "llama3.1:8b"}]})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with stub._busy:
+                    stub.calls += 1
+                    delay, tokens = stub.cost(body)
+                    time.sleep(delay)
+                user = [m for m in body.get("messages", []) if m.get("role") == "user"]
+                content = user[-1]["content"] if user else ""
+                self._send(
+                    {
+                        "model": body.get("model", ""),
+                        "message": {"role": "assistant", "content": _reply_for(content)},
+                        "prompt_eval_count": tokens,
+                        "eval_count": 2,
+                        "done": True,
+                    }
+                )
+
+        return Handler
@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from backend.agents import classifier as agent_classifier
+from backend.agents import router as agents_router
+from backend.agents.classifier import AgentClassifier, training_examples
+from backend.audit.store import AuditEvent
+from backend.main import app
+
+
+client = TestClient(app)
+
+
+def test_classifier_is_confident_on_obvious_queries() -> None:
+    model = AgentClassifier().fit(training_examples(agents_router.AGENTS, []))
+
+    label, confidence = model.predict("log my sleep")
+    assert label == "health"
+    assert confidence >= 0.6
+
+    label, confidence = model.predict("what is the weather")
+    assert label is None
+    assert confidence == 0.0
+
+
+def test_classifier_learns_from_llm_decisions() -> None:
+    event = AuditEvent(
+        id="1",
+        event_type=agent_classifier.ROUTE_EVENT_TYPE,
+        message="",
+        timestamp="",
+        meta={"query": "pay the rent", "agent": "finance", "decision_source": "llm"},
+    )
+    model = AgentClassifier().fit(training_examples(agents_router.AGENTS, [event]))
+
+    assert model.predict("rent is due")[0] == "finance"
+
+
+def test_auto_route_skips_llm_when_classifier_is_confident(monkeypatch) -> None:
+    def fail_chat(messages):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr(agents_router, "chat_ollama", fail_chat)
+    monkeypatch.setattr(agent_classifier, "list_events", lambda **kwargs: [])
+    agent_classifier.reset_classifier()
+
+    response = client.post(
+        "/v1/agents/auto",
+        json={"query": "log my sleep", "payload": {}, "prefer_llm": True},
+    )
+    if response.status_code == 401:
+        return
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["agent"] == "health"
+    assert payload["decision_source"] == "classifier"
+    assert client.get("/v1/agents/metrics").json()["routing.llm_calls_avoided"] >= 1
+
+
+def test_registry_dispatch_and_match() -> None:
+    registry = agents_router.REGISTRY
+
+    assert registry.for_task_type("Inbox").name == "email"
+    assert registry.for_task_type("unknown") is None
+    assert registry.match("please check my email and budget").name == "email"
+    assert registry.match("track my expense for the meeting").name == "schedule"
+    assert registry.match("nothing relevant here") is None
+
+
+def test_batch_route_returns_results_in_order() -> None:
+    response = client.post(
+        "/v1/agents/batch",
+        json={
+            "requests": [
+                {"task_type": "expense", "payload": {"amount": 12}},
+                {"task_type": "nope", "payload": {}},
+                {"task_type": "calendar", "payload": {"title": "Standup"}},
+            ]
+        },
+    )
+    if response.status_code == 401:
+        return
+    assert response.status_code == 200
+    payload = response.json()
+    assert [item["index"] for item in payload["results"]] == [0, 1, 2]
+    assert payload["results"][0]["result"]["data"] == {"amount": 12}
+    assert payload["results"][1]["status"] == "no_match"
+    assert payload["results"][2]["result"]["agent"] == "schedule"
+    assert payload["succeeded"] == 2
+    assert payload["failed"] == 1
+
+
+def test_batch_item_timeout_starts_when_the_item_runs(monkeypatch) -> None:
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(agents_router, "_batch_pool", lambda: pool)
+    original = agents_router.route_agent
+
+    def slow_route(item):
+        time.sleep(0.3)
+        return original(item)
+
+    monkeypatch.setattr(agents_router, "route_agent", slow_route)
+    try:
+        # Another request holds the only worker, so the item queues first.
+        busy = pool.submit(time.sleep, 0.3)
+        response = agents_router.batch_route(
+            agents_router.AgentBatchRequest(
+                requests=[{"task_type": "expense", "payload": {"amount": 1}}],
+                item_timeout_seconds=0.5,
+            )
+        )
+        busy.result()
+    finally:
+        pool.shutdown(wait=True)
+
+    assert response.results[0].status == "ok"
+
+
+def test_auto_route_fan_out_returns_first_ok_and_times_out(monkeypatch) -> None:
+    health = agents_router.REGISTRY.get("health")
+    original = health.run
+
+    def slow_run(payload):
+        time.sleep(0.5)
+        return original(payload)
+
+    monkeypatch.setattr(health, "run", slow_run)
+    monkeypatch.setattr(agent_classifier, "list_events", lambda **kwargs: [])
+    agent_classifier.reset_classifier()
+
+    response = client.post(
+        "/v1/agents/auto",
+        json={"query": "sleep budget", "prefer_llm": False, "fan_out": 2},
+    )
+    if response.status_code == 401:
+        return
+    payload = response.json()
+    assert payload["decision_source"] == "fanout"
+    assert payload["agent"] == "finance"
+
+    response = client.post(
+        "/v1/agents/auto",
+        json={"query": "log my sleep", "prefer_llm": False, "timeout_seconds": 0.05},
+    )
+    assert response.json()["status"] == "timeout"
+    assert agents_router.metrics.snapshot()["agents.health.timeouts"] >= 1
+
+
+def test_auto_route_latency_budget_answers_before_slow_llm(monkeypatch) -> None:
+    release = threading.Event()
+    remembered = threading.Event()
+    remember = agents_router._remember_route
+
+    def slow_pick(query):
+        # Holds the LLM answer until the test has seen the budgeted response.
+        release.wait(5)
+        return "finance"
+
+    def remember_route(query, agent):
+        remember(query, agent)
+        remembered.set()
+
+    monkeypatch.setattr(agents_router, "_llm_pick", slow_pick)
+    monkeypatch.setattr(agents_router, "_remember_route", remember_route)
+    monkeypatch.setattr(agents_router, "log_event", lambda *args: None)
+    monkeypatch.setattr(agent_classifier, "list_events", lambda **kwargs: [])
+    agent_classifier.reset_classifier()
+    agents_router._ROUTE_CACHE.clear()
+
+    query = "follow up on the emailing thread"
+    with TestClient(app) as session:
+        try:
+            response = session.post(
+                "/v1/agents/auto",
+                json={"query": query, "latency_budget_ms": 50},
+            )
+            if response.status_code == 401:
+                return
+            assert not release.is_set()
+            assert response.json()["decision_source"] == "heuristic"
+            assert response.json()["agent"] == "email"
+        finally:
+            release.set()
+
+        assert remembered.wait(5)
+        response = session.post("/v1/agents/auto", json={"query": query})
+        assert response.json()["decision_source"] == "cache"
+        assert response.json()["agent"] == "finance"
+
+
+def test_failed_route_audit_writes_are_logged(caplog) -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        future = loop.create_future()
+        future.set_exception(RuntimeError("audit store down"))
+        with caplog.at_level("WARNING", logger=agents_router.logger.name):
+            agents_router._report_log_failure(future)
+    finally:
+        loop.close()
+    assert "audit store down" in caplog.text
@@ -0,0 +1,99 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend.agents import router as agents_router
+from backend.main import app
+
+
+client = TestClient(app)
+
+
+def _meet(monkeypatch, name: str, barrier: threading.Barrier) -> None:
+    agent = agents_router.REGISTRY.get(name)
+    original = agent.run
+
+    def run(payload):
+        # Only passes when the other independent step is running at the same time.
+        barrier.wait()
+        return original(payload)
+
+    monkeypatch.setattr(agent, "run", run)
+
+
+def test_workflow_passes_outputs_and_runs_in_parallel(monkeypatch) -> None:
+    barrier = threading.Barrier(2, timeout=2)
+    for name in ("schedule", "finance"):
+        _meet(monkeypatch, name, barrier)
+
+    body = {
+        "steps": [
+            {"id": "plan", "task_type": "schedule", "payload": {"title": "Week plan"}},
+            {"id": "costs", "task_type": "finance", "payload": {"amount": 40}},
+            {
+                "id": "notify",
+                "task_type": "email",
+                "inputs": {"subject": "plan.summary"},
+                "depends_on": ["costs"],
+            },
+        ]
+    }
+    response = client.post("/v1/agents/workflow", json=body)
+    if response.status_code == 401:
+        return
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["status"] == "ok"
+    notify = payload["steps"][2]
+    assert notify["result"]["data"]["subject"] == "Scheduled: Week plan"
+    assert [step["status"] for step in payload["steps"]] == ["ok", "ok", "ok"]
+
+    # Results are not reused across runs: the agents may have side effects.
+    again = client.post("/v1/agents/workflow", json=body).json()
+    assert again["status"] == "ok"
+    assert not any(step["cached"] for step in again["steps"])
+
+
+def test_workflow_reuses_identical_steps_within_one_run() -> None:
+    response = client.post(
+        "/v1/agents/workflow",
+        json={
+            "steps": [
+                {"id": "a", "task_type": "finance", "payload": {"amount": 3}},
+                {"id": "b", "task_type": "finance", "payload": {"amount": 3}, "depends_on": ["a"]},
+            ]
+        },
+    )
+    if response.status_code == 401:
+        return
+    assert [step["cached"] for step in response.json()["steps"]] == [False, True]
+
+
+def test_workflow_rejects_cycles() -> None:
+    response = client.post(
+        "/v1/agents/workflow",
+        json={
+            "steps": [
+                {"id": "a", "task_type": "email", "depends_on": ["b"]},
+                {"id": "b", "task_type": "email", "inputs": {"x": "a.summary"}},
+            ]
+        },
+    )
+    if response.status_code == 401:
+        return
+    assert response.status_code == 422
+
+
+def test_workflow_rejects_unknown_reference_fields() -> None:
+    response = client.post(
+        "/v1/agents/workflow",
+        json={
+            "steps": [
+                {"id": "a", "task_type": "email"},
+                {"id": "b", "task_type": "email", "inputs": {"x": "a.bogus"}},
+            ]
+        },
+    )
+    if response.status_code == 401:
+        return
+    assert response.status_code == 422
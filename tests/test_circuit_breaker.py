@@ -0,0 +1,64 @@
+import pytest
+
+from backend.integrations.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def test_breaker_opens_fails_fast_and_recovers_after_probe() -> None:
+    probe_results = [False, True]
+    breaker = CircuitBreaker(2, 0.0, probe=lambda: probe_results.pop(0))
+
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.state == OPEN
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_breaker_stays_open_until_reset_timeout() -> None:
+    breaker = CircuitBreaker(1, 60.0, probe=lambda: True)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.snapshot()["short_circuited"] == 1
+    assert breaker.snapshot()["retry_in_seconds"] > 0
+
+
+def test_failed_half_open_trial_reopens() -> None:
+    breaker = CircuitBreaker(1, 0.0, probe=lambda: True)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["trips"] == 2
+
+
+def test_late_success_does_not_close_an_open_breaker() -> None:
+    breaker = CircuitBreaker(1, 60.0, probe=lambda: True)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    breaker.record_success()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
@@ -0,0 +1,97 @@
+from fastapi.testclient import TestClient
+
+from backend.compression import jobs
+from backend.compression import store as compression_store
+from backend.config import get_settings
+from backend.conversations import store as conversation_store
+from backend.main import app
+from backend.sync import store as sync_store
+from backend.utils import compressor
+from backend.utils.scaledown import compress_text
+
+
+client = TestClient(app)
+
+
+EMAIL = """Hi team,
+
+The quarterly budget review moves to March 14 at 10am in room 4.
+Please bring the updated vendor spreadsheet and the travel numbers.
+The quarterly budget review moves to March 14 at 10am in room 4.
+Lunch will be provided.
+
+On Mon, Mar 3, 2025 at 9:00 AM Alex <alex@example.com> wrote:
+> Can we move the review?
+> Thanks
+
+Sent from my iPhone
+-----
+"""
+
+
+def test_local_compression_strips_boilerplate_and_duplicates() -> None:
+    result = compressor.compress_local(EMAIL, keep_ratio=1.0)
+
+    assert "Sent from my iPhone" not in result.text
+    assert "> Can we move" not in result.text
+    assert "-----" not in result.text
+    assert result.text.count("quarterly budget review") == 1
+    assert result.duplicates == 1
+    assert result.compressed_tokens < result.original_tokens
+
+
+def test_compress_text_reports_measured_ratios() -> None:
+    text = " ".join(
+        f"Note {index}: the project deadline for milestone {index % 7} is close."
+        for index in range(200)
+    )
+    result = compress_text(text)
+
+    assert result.backend == "local"
+    assert result.compressed_size == len(result.compressed_text.encode("utf-8"))
+    assert result.ratio == round(1 - result.compressed_size / result.original_size, 4)
+    assert 0.3 < result.token_ratio < 1.0
+    first_kept = result.compressed_text.split(". ")[0]
+    assert first_kept in text
+
+
+def test_large_inputs_are_chunked_on_paragraph_breaks() -> None:
+    text = "\n\n".join("word " * 50 for _ in range(100))
+    chunks = compressor._chunks(text, 1_000)
+
+    assert "".join(chunks) == text
+    assert all(chunk.startswith("\n\n") or chunk == chunks[0] for chunk in chunks)
+
+
+def test_corpus_job_compresses_in_batches_and_skips_unchanged(monkeypatch) -> None:
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(compression_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    monkeypatch.setenv("COMPRESSION_JOB_BATCH", "2")
+    get_settings.cache_clear()
+    try:
+        conv_ids = []
+        for index in range(5):
+            conversation = conversation_store.create_conversation(f"Corpus {index}")
+            conversation_store.append_message(conversation.id, "user", EMAIL)
+            conv_ids.append(conversation.id)
+
+        response = client.post("/v1/compression/conversations")
+        if response.status_code == 401:
+            return
+        assert response.status_code == 202
+        job = client.get(f"/v1/compression/jobs/{response.json()['job_id']}").json()
+        assert job["status"] == "done"
+        assert job["processed"] == job["total"] >= 5
+        assert job["bytes_saved"] > 0
+
+        stored = compression_store.get_compressed(conv_ids[0])
+        assert "Sent from my iPhone" not in stored.text
+        assert stored.message_count == 1
+
+        again, _ = jobs.start_job()
+        jobs.run_job(again.id)
+        assert again.compressed == 0
+        assert again.skipped == again.processed
+    finally:
+        get_settings.cache_clear()
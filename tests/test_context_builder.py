@@ -0,0 +1,67 @@
+from backend.integrations.context import build_context, estimate_tokens, truncate_to_tokens
+from backend.integrations.ollama_client import OllamaMessage
+
+
+def _history(turns: int) -> list:
+    return [
+        OllamaMessage(
+            role="user" if index % 2 == 0 else "assistant",
+            content=f"Turn {index}: " + "some reasonably long sentence about plans " * 10,
+        )
+        for index in range(turns)
+    ]
+
+
+def test_estimate_tokens_tracks_length() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a, b c") == 4
+    assert estimate_tokens("word " * 100) > estimate_tokens("word " * 10)
+
+
+def test_build_context_respects_budget() -> None:
+    history = _history(60)
+    context = build_context(history, system_prompt="Be brief.", budget=500)
+
+    assert context.prompt_tokens <= 500
+    assert context.messages[0].content == "Be brief."
+    assert context.messages[-1] is history[-1]
+    assert context.kept_turns + context.condensed_turns + context.dropped_turns == 60
+
+
+def test_build_context_keeps_everything_when_it_fits() -> None:
+    history = _history(3)
+    context = build_context(history, summary="Earlier talk.", budget=10_000)
+
+    assert context.kept_turns == 3
+    assert context.dropped_turns == 0
+    assert "Earlier talk." in context.messages[0].content
+
+
+def test_build_context_truncates_oversized_last_turn() -> None:
+    history = [OllamaMessage(role="user", content="word " * 2000)]
+    context = build_context(history, budget=100)
+
+    assert context.kept_turns == 1
+    assert context.prompt_tokens <= 100
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_build_context_keeps_prefix_stable_between_turns() -> None:
+    history = [
+        OllamaMessage(
+            role="user" if index % 2 == 0 else "assistant",
+            content=f"Turn {index}: " + "plans " * 12,
+        )
+        for index in range(80)
+    ]
+
+    def reused(**kwargs) -> int:
+        count = 0
+        for end in range(42, 81, 2):
+            previous = build_context(history[: end - 2], budget=600, **kwargs).messages
+            current = build_context(history[:end], budget=600, **kwargs).messages
+            count += current[: len(previous)] == previous
+        return count
+
+    assert reused() >= 12
+    assert reused(window_grain=1) == 0
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from backend.conversations import archive, cold_storage
+from backend.conversations import store as conversation_store
+from backend.main import app
+from backend.sync import store as sync_store
+
+
+client = TestClient(app)
+
+TOPICS = ["dentist appointment", "quarterly taxes", "flight to Denver", "team offsite"]
+
+
+def _old_conversation(turns: int):
+    conversation = conversation_store.create_conversation("Archive test")
+    for index in range(turns):
+        conversation_store.append_message(
+            conversation.id,
+            "user" if index % 2 == 0 else "assistant",
+            f"Please remind me about the {TOPICS[index % 4]} next week, item {index}.",
+        )
+    for msg in conversation.messages:
+        msg.timestamp = "2020-01-01T00:00:00Z"
+    conversation_store.append_message(conversation.id, "user", "A fresh question")
+    return conversation
+
+
+def test_archive_packs_old_messages_and_reads_them_back(monkeypatch) -> None:
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(cold_storage, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    conversation = _old_conversation(40)
+    expected = [msg.content for msg in conversation.messages]
+
+    plain = cold_storage.pack_messages([msg.__dict__ for msg in conversation.messages], None)
+    dictionary = archive.train_dictionary()
+    trained = cold_storage.pack_messages(
+        [msg.__dict__ for msg in conversation.messages], dictionary
+    )
+    assert trained.packed_size < plain.packed_size
+
+    run = archive.archive_conversations(older_than_days=30)
+    assert run.archived_messages >= 40
+    assert run.packed_bytes < run.raw_bytes
+
+    history = conversation_store.get_conversation(conversation.id).messages
+    assert [msg.content for msg in history.hot] == ["A fresh question"]
+    cold_storage._DECODED.clear()
+    assert len(history) == 41
+    assert history[-1].content == "A fresh question"
+    assert not cold_storage._DECODED
+    assert [msg.content for msg in history] == expected
+    assert cold_storage._DECODED
+
+    conversation_store.append_message(conversation.id, "assistant", "An answer")
+    assert len(conversation_store.get_conversation(conversation.id).messages) == 42
+
+    response = client.get("/v1/conversations/search", params={"query": "item 3."})
+    if response.status_code == 401:
+        return
+    assert conversation.id in [item["id"] for item in response.json()]
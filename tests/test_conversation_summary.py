@@ -0,0 +1,59 @@
+from backend.conversations import store as conversation_store
+from backend.conversations import summaries
+from backend.conversations.store import append_message, create_conversation, get_conversation
+from backend.integrations.ollama_client import OllamaResponse
+from backend.sync import store as sync_store
+
+
+def test_summary_folds_only_new_messages(monkeypatch) -> None:
+    calls = []
+
+    def fake_chat(messages, **kwargs):
+        calls.append(messages)
+        return OllamaResponse(ok=True, model="test", message=f"summary v{len(calls)}")
+
+    monkeypatch.setattr(summaries, "chat_ollama", fake_chat)
+    monkeypatch.setattr(summaries, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+
+    conversation = create_conversation("Summary test")
+    for index in range(summaries.FOLD_CHUNK_SIZE + 3):
+        append_message(conversation.id, "user", f"message {index}")
+
+    record = summaries.build_summary(get_conversation(conversation.id))
+    assert record.message_count == summaries.FOLD_CHUNK_SIZE + 3
+    assert len(calls) == 2
+
+    summaries.build_summary(get_conversation(conversation.id))
+    assert len(calls) == 2
+
+    append_message(conversation.id, "assistant", "a reply")
+    record = summaries.build_summary(get_conversation(conversation.id))
+    assert len(calls) == 3
+    assert "summary v2" in calls[-1][1].content
+    assert "a reply" in calls[-1][1].content
+    assert "message 0" not in calls[-1][1].content
+    assert record.summary == "summary v3"
+
+
+def test_long_running_summary_leaves_room_for_new_messages(monkeypatch) -> None:
+    calls = []
+
+    def fake_chat(messages, **kwargs):
+        calls.append(messages)
+        # Far more than the whole context budget.
+        return OllamaResponse(ok=True, model="test", message="recap " * 5000)
+
+    monkeypatch.setattr(summaries, "chat_ollama", fake_chat)
+    monkeypatch.setattr(summaries, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+
+    conversation = create_conversation("Long summary")
+    for index in range(summaries.FOLD_CHUNK_SIZE + 3):
+        append_message(conversation.id, "user", f"message {index}")
+
+    summaries.build_summary(get_conversation(conversation.id))
+    folded = "\n".join(call[1].content for call in calls)
+    assert all(f"user: message {index}\n" in folded + "\n" for index in range(summaries.FOLD_CHUNK_SIZE + 3))
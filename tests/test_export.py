@@ -0,0 +1,54 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.conversations import store as conversation_store
+from backend.export import stream
+from backend.main import app
+from backend.profiles import store as profile_store
+from backend.sync import store as sync_store
+from backend.tasks import store as task_store
+
+
+client = TestClient(app)
+
+
+def _seed(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(profile_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    task_store.create_task("Export me", "details", "high")
+    conversation = conversation_store.create_conversation("Export chat")
+    conversation_store.append_message(conversation.id, "user", "hello export")
+
+
+def test_json_stream_matches_the_document_shape(monkeypatch) -> None:
+    _seed(monkeypatch)
+    body = b"".join(stream.export_stream("json", list(stream.COLLECTIONS)))
+    document = json.loads(body)
+    assert set(document) == {"profile", "tasks", "conversations"}
+    assert any(task["title"] == "Export me" for task in document["tasks"])
+    assert any(conv["title"] == "Export chat" for conv in document["conversations"])
+
+
+def test_ndjson_gzip_and_collection_selection(monkeypatch) -> None:
+    _seed(monkeypatch)
+    body = gzip.decompress(b"".join(stream.export_stream("ndjson", ["tasks"], gzip=True)))
+    records = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert records
+    assert {record["type"] for record in records} == {"tasks"}
+
+
+def test_output_is_buffered_into_chunks() -> None:
+    chunks = list(stream.buffered((f"line {n}\n" for n in range(10_000)), size=4096))
+    assert 1 < len(chunks) < 100
+    assert b"".join(chunks).count(b"\n") == 10_000
+
+
+def test_export_endpoint_rejects_unknown_collection() -> None:
+    response = client.get("/v1/export/all", params={"collection": "secrets"})
+    if response.status_code == 401:
+        return
+    assert response.status_code == 422
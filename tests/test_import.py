@@ -0,0 +1,104 @@
+import gzip
+import json
+import zlib
+
+from fastapi.testclient import TestClient
+
+from backend.conversations import store as conversation_store
+from backend.export import stream
+from backend.importer import router as import_router
+from backend.importer.ingest import Importer
+from backend.importer.parse import DocumentReader, NdjsonReader
+from backend.main import app
+from backend.profiles import store as profile_store
+from backend.sync import store as sync_store
+from backend.tasks import store as task_store
+
+
+client = TestClient(app)
+
+
+def _memory_stores(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(profile_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+
+
+def _run(reader, body: bytes, chunk: int = 7) -> Importer:
+    importer = Importer(batch_size=2)
+    for start in range(0, len(body), chunk):
+        for item in reader.feed(body[start : start + chunk]):
+            importer.add(*item)
+        if importer.pending >= importer.batch_size:
+            importer.flush()
+    for item in reader.finish():
+        importer.add(*item)
+    importer.flush()
+    return importer
+
+
+def _document() -> dict:
+    return {
+        "profile": {"display_name": "Importer", "timezone": "UTC"},
+        "tasks": [
+            {"id": f"import-task-{n}", "title": f"Imported ✓ {n}", "priority": "high"} for n in range(5)
+        ],
+        "conversations": [
+            {
+                "id": "import-conv",
+                "title": "Imported chat",
+                "messages": [{"role": "user", "content": "héllo", "timestamp": "2024-01-01T00:00:00Z"}],
+            }
+        ],
+    }
+
+
+def test_json_document_imports_across_chunk_boundaries_and_is_idempotent(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    body = json.dumps(_document(), ensure_ascii=False).encode("utf-8")
+    first = _run(DocumentReader(), body).summary
+    assert (first.tasks, first.conversations, first.profile, first.invalid) == (5, 1, 1, 0)
+    tasks_after_first = len(task_store._TASKS)
+
+    _run(DocumentReader(), body, chunk=3)
+    assert len(task_store._TASKS) == tasks_after_first
+    assert task_store._TASKS["import-task-0"].title == "Imported ✓ 0"
+    assert conversation_store._CACHE["import-conv"].messages[0].content == "héllo"
+
+
+def test_ndjson_export_round_trips_and_skips_invalid_lines(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    task_store.create_task("Round trip", "", "low")
+    exported = b"".join(stream.export_stream("ndjson", ["tasks"]))
+    body = exported + b'{"type": "tasks", "data": {"id": "x", "priority": "urgent"}}\nnot json\n'
+    summary = _run(NdjsonReader(), body).summary
+    assert summary.tasks == exported.count(b"\n")
+    assert summary.invalid == 2
+    assert len(summary.errors) == 2
+
+
+def test_import_endpoint_rejects_truncated_documents() -> None:
+    response = client.post("/v1/import", content=b'{"tasks": [{"id": "a"', headers={"content-type": "application/json"})
+    if response.status_code == 401:
+        return
+    assert response.status_code == 400
+
+
+def test_import_endpoint_rejects_invalid_utf8_in_both_formats() -> None:
+    for content_type in ("application/json", "application/x-ndjson"):
+        response = client.post(
+            "/v1/import", content=b'{"profile": {"display_name": "\xff"}}\n', headers={"content-type": content_type}
+        )
+        if response.status_code == 401:
+            return
+        assert response.status_code == 400
+        assert "UTF-8" in response.json()["detail"]["error"]
+
+
+def test_gzip_bodies_are_inflated_in_bounded_pieces() -> None:
+    body = gzip.compress(b"\n" * (5 * import_router.INFLATE_CHUNK + 123))
+    inflater = zlib.decompressobj(47)
+    pieces = list(import_router._inflate(inflater, body))
+    assert max(len(piece) for piece in pieces) <= import_router.INFLATE_CHUNK
+    assert sum(len(piece) for piece in pieces) + len(inflater.flush()) == 5 * import_router.INFLATE_CHUNK + 123
@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+from backend.integrations import llm_stats, ollama_client
+from backend.main import app
+
+
+client = TestClient(app)
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return {
+            "message": {"content": "done"},
+            "prompt_eval_count": 120,
+            "eval_count": 40,
+            "eval_duration": 2_000_000_000,
+            "total_duration": 0,
+        }
+
+
+def test_chat_records_tokens_and_rates_per_caller(monkeypatch) -> None:
+    llm_stats.reset()
+    monkeypatch.setattr(ollama_client.requests, "post", lambda url, json, timeout: _FakeResponse())
+
+    messages = [ollama_client.OllamaMessage(role="user", content="hi")]
+    result = ollama_client.chat_ollama(messages, caller="summary")
+    ollama_client.chat_ollama(messages, caller="summary")
+
+    assert result.prompt_tokens == 120
+    assert result.completion_tokens == 40
+    [entry] = llm_stats.snapshot()
+    assert entry["caller"] == "summary"
+    assert entry["calls"] == 2
+    assert entry["prompt_tokens"] == 240
+    assert entry["completion_tokens"] == 80
+    assert entry["tokens_per_second"]["mean"] == 20.0
+    assert entry["latency_ms"]["count"] == 2
+    assert llm_stats.totals()["summary.completion_tokens"] == 80
+
+    response = client.get("/v1/llm/stats")
+    if response.status_code == 401:
+        return
+    assert response.json()["calls"][0]["caller"] == "summary"
+
+
+def test_queue_time_is_latency_not_spent_in_ollama() -> None:
+    call = llm_stats.LlmCall(
+        caller="chat", model="m", ok=True, latency_ms=900.0, total_duration_ns=600_000_000
+    )
+    assert call.queue_ms == 300.0
+
+    histogram = llm_stats.Histogram((10, 100))
+    for value in (5, 50, 50, 500):
+        histogram.observe(value)
+    assert histogram.snapshot()["buckets"] == {"le_10": 1, "le_100": 2, "inf": 1}
+    assert histogram.quantile(0.5) == 100.0
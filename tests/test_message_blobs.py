@@ -0,0 +1,194 @@
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.conversations import blobs
+from backend.conversations import store as conversation_store
+from backend.main import app
+from backend.sync import store as sync_store
+
+
+client = TestClient(app)
+
+SIGNATURE = "Thanks,\nThe Support Team\n" + "This message and any attachments are confidential. " * 8
+
+
+def test_repeated_bodies_are_stored_once(monkeypatch) -> None:
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(blobs, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    monkeypatch.setenv("MESSAGE_DEDUP_MIN_BYTES", "64")
+    get_settings.cache_clear()
+    try:
+        before = blobs.blob_stats()
+        conversations = [conversation_store.create_conversation(f"Dedup {n}") for n in range(3)]
+        for conversation in conversations:
+            # Build a fresh string each time so sharing comes from the store.
+            conversation_store.append_message(conversation.id, "assistant", "".join(SIGNATURE))
+            conversation_store.append_message(conversation.id, "user", "short reply")
+
+        bodies = [conversation_store.get_conversation(conv.id).messages[0].content for conv in conversations]
+        assert all(body == SIGNATURE for body in bodies)
+        assert bodies[0] is bodies[1] is bodies[2]
+
+        after = blobs.blob_stats()
+        assert after["enabled"] is True
+        assert after["bytes_saved"] - before["bytes_saved"] >= 2 * len(SIGNATURE)
+        assert after["dedup_ratio"] > 1
+    finally:
+        get_settings.cache_clear()
+
+
+def test_content_refs_resolve_on_read() -> None:
+    digest = blobs.body_hash(SIGNATURE)
+    blobs.intern_body(SIGNATURE)
+    [conversation] = conversation_store._from_docs(
+        [
+            {
+                "id": "ref-test",
+                "title": "Refs",
+                "messages": [
+                    {"role": "assistant", "content_ref": digest, "timestamp": "2024-01-01T00:00:00Z"},
+                    {"role": "user", "content": "inline", "timestamp": "2024-01-01T00:00:01Z"},
+                ],
+            }
+        ]
+    )
+    assert [msg.content for msg in conversation.messages] == [SIGNATURE, "inline"]
+
+
+def test_conversation_stats_report_dedup() -> None:
+    response = client.get("/v1/conversations/stats")
+    if response.status_code == 401:
+        return
+    assert response.status_code == 200
+    assert "bytes_saved" in response.json()["dedup"]
+
+
+class FakeBlobs:
+    """Just enough of the message_blobs collection for refcount checks."""
+
+    def __init__(self) -> None:
+        self.docs = {}
+
+    def _update(self, filter, update, upsert=False):
+        digest = filter["hash"]
+        if digest not in self.docs:
+            if not upsert:
+                return
+            self.docs[digest] = dict(update["$setOnInsert"], refs=0)
+        self.docs[digest]["refs"] += update["$inc"]["refs"]
+
+    def update_one(self, filter, update, upsert=False):
+        self._update(filter, update, upsert)
+
+    def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            self._update(request._filter, request._doc, request._upsert)
+
+    def find(self, filter, projection=None):
+        return [doc for digest, doc in self.docs.items() if digest in filter["hash"]["$in"]]
+
+
+class FakeConversations:
+    """Just enough of the conversations collection for the write paths."""
+
+    def __init__(self) -> None:
+        self.docs = {}
+
+    def find(self, filter, projection=None):
+        return [dict(self.docs[conv_id]) for conv_id in filter["id"]["$in"] if conv_id in self.docs]
+
+    def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            self.docs[request._filter["id"]] = dict(request._doc)
+
+    def find_one_and_update(self, filter, update, projection=None, return_document=None):
+        doc = self.docs.get(filter["id"])
+        if doc is None:
+            return None
+        doc["messages"] = doc["messages"] + [dict(update["$push"]["messages"])]
+        doc["seq"] = max(doc.get("seq", 0), update["$max"]["seq"])
+        return dict(doc)
+
+
+def _use_fake_mongo(monkeypatch):
+    conversations, bodies = FakeConversations(), FakeBlobs()
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: conversations)
+    monkeypatch.setattr(blobs, "_get_collection", lambda: bodies)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    return conversations, bodies
+
+
+def test_append_stores_a_content_ref_in_mongo(monkeypatch) -> None:
+    conversations, bodies = _use_fake_mongo(monkeypatch)
+    monkeypatch.setenv("MESSAGE_DEDUP_MIN_BYTES", "64")
+    get_settings.cache_clear()
+    try:
+        conversations.docs["mongo-append"] = {"id": "mongo-append", "title": "Mongo", "messages": [], "seq": 0}
+        conversation = conversation_store.append_message("mongo-append", "assistant", SIGNATURE)
+        conversation_store.append_message("mongo-append", "user", "short reply")
+
+        digest = blobs.body_hash(SIGNATURE)
+        stored = conversations.docs["mongo-append"]["messages"]
+        assert stored[0]["content_ref"] == digest and "content" not in stored[0]
+        assert stored[1]["content"] == "short reply"
+        assert bodies.docs[digest]["refs"] == 1
+        assert conversations.docs["mongo-append"]["seq"] == stored[1]["seq"] > stored[0]["seq"]
+        assert conversation.messages[0].content == SIGNATURE
+    finally:
+        get_settings.cache_clear()
+
+
+def test_reimport_does_not_inflate_reference_counts(monkeypatch) -> None:
+    _, bodies = _use_fake_mongo(monkeypatch)
+    monkeypatch.setenv("MESSAGE_DEDUP_MIN_BYTES", "64")
+    get_settings.cache_clear()
+
+    def corpus():
+        return [
+            conversation_store.Conversation(
+                id=f"reimport-{n}",
+                title="Reimport",
+                messages=[conversation_store.ConversationMessage("assistant", SIGNATURE, "2024-01-01T00:00:00Z")],
+            )
+            for n in range(2)
+        ]
+
+    try:
+        digest = blobs.body_hash(SIGNATURE)
+        conversation_store.upsert_conversations(corpus())
+        assert bodies.docs[digest]["refs"] == 2
+        conversation_store.upsert_conversations(corpus())
+        assert bodies.docs[digest]["refs"] == 2
+
+        changed = corpus()[:1]
+        changed[0].messages[0].content = "edited"
+        conversation_store.upsert_conversations(changed)
+        assert bodies.docs[digest]["refs"] == 1
+    finally:
+        get_settings.cache_clear()
+
+
+def test_in_memory_reimport_does_not_inflate_reference_counts(monkeypatch) -> None:
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(blobs, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    monkeypatch.setenv("MESSAGE_DEDUP_MIN_BYTES", "64")
+    get_settings.cache_clear()
+    body = "In-memory reimport body. " * 8
+
+    def corpus():
+        return [
+            conversation_store.Conversation(
+                id="reimport-memory",
+                title="Reimport",
+                messages=[conversation_store.ConversationMessage("assistant", body, "2024-01-01T00:00:00Z")],
+            )
+        ]
+
+    try:
+        conversation_store.upsert_conversations(corpus())
+        conversation_store.upsert_conversations(corpus())
+        assert blobs._REFS[blobs.body_hash(body)] == 1
+    finally:
+        get_settings.cache_clear()
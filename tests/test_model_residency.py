@@ -0,0 +1,55 @@
+from backend.config import get_settings
+from backend.integrations import model_residency
+
+
+def test_preload_warms_missing_models_and_records_cold_start(monkeypatch, json_server) -> None:
+    calls = []
+
+    def respond(method, path, body):
+        if method == "GET":
+            return 200, {"models": []}
+        calls.append(body)
+        return 200, {"model": body["model"], "load_duration": 2_000_000_000, "done": True}
+
+    url = json_server(respond)
+    monkeypatch.setenv("OLLAMA_BASE_URL", url)
+    monkeypatch.setenv("OLLAMA_BASE_URLS", "")
+    monkeypatch.setenv("OLLAMA_MODEL", "warm-test:1b")
+    monkeypatch.setenv("OLLAMA_MODEL_TIERS", "")
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "-1")
+    get_settings.cache_clear()
+    try:
+        model_residency.ensure_resident()
+        assert calls == [{"model": "warm-test:1b", "keep_alive": -1}]
+
+        stats = {item["model"]: item for item in model_residency.load_stats()}
+        assert stats["warm-test:1b"]["cold_starts"] == 1
+        assert stats["warm-test:1b"]["last_load_ms"] == 2000.0
+
+        model_residency.evict_model("warm-test:1b")
+        assert calls[-1] == {"model": "warm-test:1b", "keep_alive": 0}
+
+        # The preloader must not undo an eviction until the model is warmed again.
+        model_residency.ensure_resident()
+        assert calls[-1] == {"model": "warm-test:1b", "keep_alive": 0}
+        model_residency.warm_model("warm-test:1b")
+        assert calls[-1] == {"model": "warm-test:1b", "keep_alive": -1}
+        assert stats["warm-test:1b"]["warmups"] + 1 == next(
+            item["warmups"] for item in model_residency.load_stats() if item["model"] == "warm-test:1b"
+        )
+    finally:
+        get_settings.cache_clear()
+
+
+def test_failed_warmup_is_not_counted(monkeypatch, json_server) -> None:
+    url = json_server(lambda method, path, body: (500, {"error": "boom"}))
+    monkeypatch.setenv("OLLAMA_BASE_URL", url)
+    monkeypatch.setenv("OLLAMA_BASE_URLS", "")
+    get_settings.cache_clear()
+    try:
+        results = model_residency.warm_model("warm-fail:1b")
+        assert results and not any(result["ok"] for result in results)
+        stats = {item["model"]: item for item in model_residency.load_stats()}
+        assert stats.get("warm-fail:1b", {}).get("warmups", 0) == 0
+    finally:
+        get_settings.cache_clear()
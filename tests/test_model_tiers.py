@@ -0,0 +1,40 @@
+from backend.config import get_settings
+from backend.integrations import ollama_client
+from backend.integrations.model_tiers import CHAT, ROUTER, SUMMARIZER, get_tier
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return {"message": {"content": "health"}}
+
+
+def test_tiers_default_to_base_model_and_accept_overrides(monkeypatch) -> None:
+    monkeypatch.setenv("OLLAMA_MODEL", "base:8b")
+    monkeypatch.setenv("OLLAMA_MODEL_TIERS", '{"router": {"model": "tiny:0.5b", "num_predict": 4}}')
+    get_settings.cache_clear()
+    try:
+        assert get_tier(CHAT).model == "base:8b"
+        assert get_tier(CHAT).options == {}
+        assert get_tier(SUMMARIZER).model == "base:8b"
+        assert get_tier(ROUTER).model == "tiny:0.5b"
+        assert get_tier(ROUTER).options == {"num_predict": 4, "temperature": 0}
+        assert get_tier("unknown").name == CHAT
+
+        sent = {}
+
+        def fake_post(url, json, timeout):
+            sent.update(json)
+            return _FakeResponse()
+
+        monkeypatch.setattr(ollama_client.requests, "post", fake_post)
+        result = ollama_client.chat_ollama(
+            [ollama_client.OllamaMessage(role="user", content="hi")], tier=ROUTER
+        )
+        assert result.model == "tiny:0.5b"
+        assert sent["model"] == "tiny:0.5b"
+        assert sent["options"] == {"num_predict": 4, "temperature": 0}
+    finally:
+        get_settings.cache_clear()
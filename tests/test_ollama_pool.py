@@ -0,0 +1,81 @@
+from backend.integrations.ollama_client import _post_chat, ping_node
+from backend.integrations.ollama_pool import EJECT_AFTER_FAILURES, OllamaPool, start_health_checks
+
+
+def _tags(models):
+    return lambda method, path, body: (200, {"models": [{"name": name} for name in models]})
+
+
+def _lease(node):
+    node.in_flight += 1
+    return node
+
+
+def test_pool_balances_by_outstanding_requests() -> None:
+    pool = OllamaPool(["http://a", "http://b"])
+    first = pool.pick()
+    second = pool.pick()
+    assert {first.url, second.url} == {"http://a", "http://b"}
+    pool.release(first, 10.0, ok=True)
+    assert pool.pick().url == first.url
+
+
+def test_pool_ejects_failing_nodes() -> None:
+    pool = OllamaPool(["http://a", "http://b"])
+    bad = pool.nodes[0]
+    for _ in range(EJECT_AFTER_FAILURES):
+        pool.release(_lease(bad), 5.0, ok=False)
+    assert all(pool.pick().url == "http://b" for _ in range(3))
+
+
+def test_health_check_learns_models_from_stub_servers(json_server) -> None:
+    url_a = json_server(_tags(["llama3.1:8b"]))
+    url_b = json_server(_tags(["phi3:mini"]))
+    pool = OllamaPool([url_a, url_b, "http://127.0.0.1:9"])
+    pool.check(ping_node)
+
+    snapshot = {node["url"]: node for node in pool.snapshot()}
+    assert snapshot[url_a]["models"] == ["llama3.1:8b"]
+    assert snapshot["http://127.0.0.1:9"]["healthy"] is False
+    for _ in range(4):
+        assert pool.pick("phi3:mini").url == url_b
+
+
+def test_sessions_stick_to_a_node_and_spread_across_nodes() -> None:
+    pool = OllamaPool(["http://a", "http://b"])
+    first = pool.pick(session="conv-1")
+    pool.release(first, 10.0, ok=True)
+    second = pool.pick(session="conv-2")
+    pool.release(second, 10.0, ok=True)
+    assert first.url != second.url
+
+    for _ in range(3):
+        node = pool.pick(session="conv-1")
+        pool.release(node, 10.0, ok=True)
+        assert node.url == first.url
+
+    for _ in range(EJECT_AFTER_FAILURES):
+        pool.release(_lease(first), 5.0, ok=False)
+    assert pool.pick(session="conv-1").url == second.url
+
+
+def test_health_checks_start_once() -> None:
+    assert start_health_checks(ping_node) is start_health_checks(ping_node)
+
+
+def test_refused_connection_retries_on_a_different_node(json_server) -> None:
+    calls = []
+
+    def respond(method, path, body):
+        calls.append(path)
+        return 200, {"message": {"role": "assistant", "content": "hi"}, "done": True}
+
+    live = json_server(respond)
+    dead = "http://127.0.0.1:9"
+    pool = OllamaPool([dead, live])
+    data = _post_chat(pool, "llama3.1:8b", {"model": "llama3.1:8b", "messages": []})
+
+    assert data["message"]["content"] == "hi"
+    assert calls == ["/api/chat"]
+    requests_by_url = {node["url"]: node["requests"] for node in pool.snapshot()}
+    assert requests_by_url == {dead: 1, live: 1}
@@ -0,0 +1,40 @@
+import asyncio
+
+from backend.agents.route_batcher import RoutingBatcher, build_batch_prompt, parse_batch_reply
+
+
+NAMES = ["schedule", "email", "health", "finance"]
+
+
+def test_parse_batch_reply_maps_numbered_lines() -> None:
+    reply = "1: health\n2) Finance\n3: weather\nnoise\n"
+    assert parse_batch_reply(reply, 4, NAMES) == ["health", "finance", None, None]
+
+    _, user_text = build_batch_prompt(NAMES, ["log sleep", "pay rent"])
+    assert user_text == "1. log sleep\n2. pay rent"
+
+
+def test_batcher_groups_queries_and_falls_back_per_item() -> None:
+    batches = []
+    singles = []
+
+    def route_many(queries):
+        batches.append(list(queries))
+        return ["health" if "sleep" in query else None for query in queries]
+
+    def route_one(query):
+        singles.append(query)
+        return "finance"
+
+    async def scenario():
+        batcher = RoutingBatcher(0.02, 8, route_many, route_one)
+        return await asyncio.gather(
+            batcher.pick("log my sleep"),
+            batcher.pick("pay the rent"),
+            batcher.pick("sleep again"),
+        )
+
+    picks = asyncio.run(scenario())
+    assert picks == ["health", "finance", "health"]
+    assert batches == [["log my sleep", "pay the rent", "sleep again"]]
+    assert singles == ["pay the rent"]
@@ -0,0 +1,91 @@
+from backend.config import get_settings
+from backend.utils import compression_cache, scaledown
+from backend.utils.compression_cache import CompressionCache
+from backend.utils.compressor import local_variant
+from backend.utils.scaledown_client import ScaleDownClient
+
+
+def _halved(text):
+    return {
+        "ratio": 0.5,
+        "original_size": len(text),
+        "compressed_size": len(text) // 2,
+        "compressed_text": text[: len(text) // 2],
+    }
+
+
+def _scaledown(json_server, fail_first: int = 0, batch_route: bool = True):
+    state = {"batches": [], "singles": [], "failures_left": fail_first}
+
+    def respond(method, path, body):
+        if state["failures_left"]:
+            state["failures_left"] -= 1
+            return 503, None
+        if path == "/v1/compress":
+            state["singles"].append(body["text"])
+            return 200, _halved(body["text"])
+        if not batch_route:
+            return 404, None
+        state["batches"].append(body["texts"])
+        return 200, {"results": [_halved(text) for text in body["texts"]]}
+
+    return json_server(respond), state
+
+
+def test_client_batches_by_size_and_retries(json_server) -> None:
+    url, state = _scaledown(json_server, fail_first=1)
+    client = ScaleDownClient(url, "key", max_batch_bytes=10, backoff_seconds=0.01)
+    results = client.compress_batch(["aaaa", "bbbb", "cccccccc"])
+    assert [item["compressed_text"] for item in results] == ["aa", "bb", "cccc"]
+    assert state["batches"] == [["aaaa", "bbbb"], ["cccccccc"]]
+
+
+def test_client_falls_back_to_single_requests_without_a_batch_route(json_server) -> None:
+    url, state = _scaledown(json_server, batch_route=False)
+    client = ScaleDownClient(url, "key", backoff_seconds=0.01)
+    results = client.compress_batch(["aaaa", "bbbb"])
+    assert [item["compressed_text"] for item in results] == ["aa", "bb"]
+    assert not client.batch_supported
+
+    client.compress_batch(["cccc", "dddd"])
+    assert state["batches"] == []
+    assert state["singles"] == ["aaaa", "bbbb", "cccc", "dddd"]
+
+
+def test_compress_many_caches_by_content_hash(monkeypatch, tmp_path, json_server) -> None:
+    url, state = _scaledown(json_server)
+    monkeypatch.setenv("COMPRESSION_BACKEND", "scaledown")
+    monkeypatch.setenv("SCALEDOWN_API_KEY", "key")
+    monkeypatch.setenv("SCALEDOWN_BASE_URL", url)
+    monkeypatch.setenv("COMPRESSION_CACHE_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    try:
+        first = scaledown.compress_many(["same text", "other text", "same text"])
+        assert state["batches"] == [["same text", "other text"]]
+        assert first[0].backend == "scaledown" and not first[0].cached
+
+        second = scaledown.compress_text("same text")
+        assert second.cached
+        assert len(state["batches"]) == 1
+
+        scaledown.compress_text("new text")
+        assert state["singles"] == ["new text"]
+        assert len(state["batches"]) == 1
+
+        disk = CompressionCache(8, str(tmp_path))
+        key = compression_cache.cache_key("scaledown", "", "other text")
+        assert disk.get(key)["compressed_text"] == "other"
+    finally:
+        get_settings.cache_clear()
+
+
+def test_local_cache_variant_follows_chunking(monkeypatch) -> None:
+    monkeypatch.setenv("COMPRESSION_WORKERS", "1")
+    get_settings.cache_clear()
+    try:
+        single = local_variant()
+        monkeypatch.setenv("COMPRESSION_WORKERS", "4")
+        get_settings.cache_clear()
+        assert local_variant() != single
+    finally:
+        get_settings.cache_clear()
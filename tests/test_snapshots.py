@@ -0,0 +1,110 @@
+import os
+
+from backend.config import get_settings
+from backend.conversations import archive, cold_storage
+from backend.conversations import store as conversation_store
+from backend.db import snapshots
+from backend.db.snapshot_file import LazyRecords
+from backend.sync import store as sync_store
+from backend.tasks import store as task_store
+
+
+def _memory_stores(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+    monkeypatch.setattr(task_store, "_TASKS", LazyRecords())
+    monkeypatch.setattr(conversation_store, "_CACHE", LazyRecords())
+    monkeypatch.setattr(sync_store, "_TOMBSTONES", {})
+    monkeypatch.setattr(cold_storage, "_DICTIONARIES", {})
+
+
+def _restart(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_TASKS", LazyRecords())
+    monkeypatch.setattr(conversation_store, "_CACHE", LazyRecords())
+    monkeypatch.setattr(sync_store, "_TOMBSTONES", {})
+    monkeypatch.setattr(cold_storage, "_DICTIONARIES", {})
+
+
+def test_snapshot_restores_lazily(monkeypatch, tmp_path) -> None:
+    _memory_stores(monkeypatch)
+    tasks = [task_store.create_task(f"Snapshot {n}", "détails", "high") for n in range(5)]
+    task_store.update_status(tasks[0].id, "done")
+    task_store.delete_task(tasks[4].id)
+    conversation = conversation_store.create_conversation("Snapshot chat")
+    conversation_store.append_message(conversation.id, "user", "remember this")
+    seq = sync_store._COUNTERS["changes"]
+
+    info = snapshots.write_snapshot(str(tmp_path))
+    assert info.records > 0
+    assert sorted(os.listdir(tmp_path)) == ["CURRENT", f"{info.generation}.dat", f"{info.generation}.idx"]
+
+    _restart(monkeypatch)
+    restored = snapshots.restore_snapshot(str(tmp_path))
+    assert restored == {"tasks": 4, "conversations": 1, "tombstones": 1, "dictionaries": 0}
+    assert task_store._TASKS.encoded_count() == 4
+    assert task_store._TASKS[tasks[0].id].status == "done"
+    assert task_store._TASKS.encoded_count() == 3
+    assert tasks[4].id not in task_store._TASKS
+    messages = conversation_store.get_conversation(conversation.id).messages
+    assert [msg.content for msg in messages] == ["remember this"]
+    assert sync_store._COUNTERS["changes"] >= seq
+    assert task_store.create_task("After restart", "", "low").seq > seq
+
+
+def test_snapshot_of_undecoded_records_round_trips(monkeypatch, tmp_path) -> None:
+    _memory_stores(monkeypatch)
+    created = [task_store.create_task(f"Raw copy {n}", "", "medium") for n in range(3)]
+    snapshots.write_snapshot(str(tmp_path))
+    _restart(monkeypatch)
+    snapshots.restore_snapshot(str(tmp_path))
+
+    second = snapshots.write_snapshot(str(tmp_path))
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".dat")]) == 1
+    _restart(monkeypatch)
+    snapshots.restore_snapshot(str(tmp_path))
+    assert snapshots.current_generation(str(tmp_path)) == second.generation
+    assert [task_store._TASKS[task.id].title for task in created] == [task.title for task in created]
+
+
+def test_first_tick_after_restore_skips_an_unchanged_snapshot(monkeypatch, tmp_path) -> None:
+    _memory_stores(monkeypatch)
+    monkeypatch.setattr(snapshots, "_STATE", {"last_seq": None, "last_profile": None, "last": None})
+    task_store.create_task("Unchanged", "", "low")
+    snapshots.write_snapshot(str(tmp_path))
+    _restart(monkeypatch)
+    snapshots.restore_snapshot(str(tmp_path))
+
+    assert snapshots.snapshot_if_changed() is None
+
+
+def test_archived_conversations_survive_a_restore(monkeypatch, tmp_path) -> None:
+    _memory_stores(monkeypatch)
+    monkeypatch.setattr(cold_storage, "_get_collection", lambda: None)
+    monkeypatch.setattr(snapshots, "_STATE", {"last_seq": None, "last_profile": None, "last": None})
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    try:
+        conversation = conversation_store.create_conversation("Archived snapshot")
+        for index in range(12):
+            conversation_store.append_message(conversation.id, "user", f"Remind me about the dentist, item {index}.")
+        for msg in conversation.messages:
+            msg.timestamp = "2020-01-01T00:00:00Z"
+        expected = [msg.content for msg in conversation.messages]
+        dictionary = archive.train_dictionary()
+        snapshots.snapshot_if_changed()
+
+        # Archiving alone must be enough for the next tick to write a snapshot.
+        assert archive.archive_conversations(older_than_days=30).archived_messages == 12
+        assert snapshots.snapshot_if_changed() is not None
+
+        _restart(monkeypatch)
+        cold_storage._DECODED.clear()
+        restored = snapshots.restore_snapshot()
+        assert restored["dictionaries"] == 1
+        assert cold_storage._DICTIONARIES[dictionary.id].zdict == dictionary.zdict
+        history = conversation_store.get_conversation(conversation.id).messages
+        assert history.blocks and history.blocks[0].dict_id == dictionary.id
+        assert [msg.content for msg in history] == expected
+    finally:
+        get_settings.cache_clear()
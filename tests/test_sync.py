@@ -0,0 +1,187 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.conversations import store as conversation_store
+from backend.main import app
+from backend.sync import router as sync_router
+from backend.sync import store as sync_store
+from backend.tasks import store as task_store
+
+
+client = TestClient(app)
+
+
+def _memory_stores(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+
+
+def _page(since: int, after: int | None = None, until: int | None = None, limit: int = 100) -> dict:
+    return sync_router.changes(since=since, after=after, until=until, limit=limit)
+
+
+def _drain(since: int, limit: int = 100) -> tuple[list, int]:
+    changes = []
+    page = _page(since, limit=limit)
+    changes.extend(page["changes"])
+    while page["has_more"]:
+        page = _page(since, after=page["next_after"], until=page["until"], limit=limit)
+        changes.extend(page["changes"])
+    return changes, page["next_since"]
+
+
+def test_changes_since_cursor_include_updates_messages_and_tombstones(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    keep = task_store.create_task("Keep me", "", "low")
+    drop = task_store.create_task("Drop me", "", "low")
+    conversation = conversation_store.create_conversation("Sync chat")
+    conversation_store.append_message(conversation.id, "user", "first")
+    _, cursor = _drain(0)
+
+    task_store.update_status(keep.id, "done")
+    task_store.delete_task(drop.id)
+    conversation_store.append_message(conversation.id, "assistant", "second")
+
+    changes, _ = _drain(cursor)
+    by_kind = {(change["kind"], change["op"]): change for change in changes}
+    assert len(changes) == 3
+    assert by_kind[("task", "upsert")]["data"]["status"] == "done"
+    assert by_kind[("task", "delete")]["id"] == drop.id
+    messages = by_kind[("conversation", "upsert")]["data"]["messages"]
+    assert [msg["content"] for msg in messages] == ["second"]
+    assert [change["seq"] for change in changes] == sorted(change["seq"] for change in changes)
+
+
+def test_pages_cover_every_change_once(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    _, cursor = _drain(0)
+    created = {task_store.create_task(f"Paged {n}", "", "medium").id for n in range(7)}
+    changes, _ = _drain(cursor, limit=3)
+    assert [change["data"]["id"] for change in changes] == sorted(
+        created, key=lambda task_id: task_store._TASKS[task_id].seq
+    )
+
+
+def test_paging_keeps_messages_of_conversations_written_again(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    conversation = conversation_store.create_conversation("Interleaved")
+    _, cursor = _drain(0)
+
+    conversation_store.append_message(conversation.id, "user", "A")
+    first = task_store.create_task("t1", "", "low")
+    second = task_store.create_task("t2", "", "low")
+    conversation_store.append_message(conversation.id, "user", "B")
+
+    changes, _ = _drain(cursor, limit=2)
+    tasks = [change["data"]["id"] for change in changes if change["kind"] == "task"]
+    messages = [
+        msg["content"]
+        for change in changes
+        if change["kind"] == "conversation"
+        for msg in change["data"]["messages"]
+    ]
+    assert tasks == [first.id, second.id]
+    assert messages == ["A", "B"]
+
+
+def test_window_stops_below_writes_still_in_flight(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    _, cursor = _drain(0)
+    landed = []
+
+    @sync_store.stamps_changes
+    def slow_write():
+        seq = sync_store.next_seq()
+        # Another writer takes a later sequence and lands first.
+        landed.append(task_store.create_task("Later", "", "low"))
+        assert sync_store.stable_seq() == seq - 1
+        page = _page(cursor)
+        assert page["until"] == seq - 1
+        assert [change["data"]["id"] for change in page["changes"]] == []
+        return seq
+
+    seq = slow_write()
+    assert landed[0].seq == seq + 1
+    assert sync_store.stable_seq() >= landed[0].seq
+    changes, _ = _drain(cursor)
+    assert [change["data"]["id"] for change in changes] == [landed[0].id]
+
+
+def test_compacted_tombstones_force_a_resync(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    task = task_store.create_task("Short lived", "", "high")
+    cursor = task.seq
+    task_store.delete_task(task.id)
+    assert sync_store.compact_tombstones(retention_days=0) >= 1
+    with pytest.raises(HTTPException) as raised:
+        _page(cursor, limit=10)
+    assert raised.value.status_code == 410
+    assert _page(0, limit=10)["changes"] is not None
+
+
+class LegacyCollection:
+    """Documents from before change tracking, with just the calls a backfill makes."""
+
+    def __init__(self, docs) -> None:
+        self.docs = {doc["id"]: doc for doc in docs}
+
+    def find(self, filter, projection=None):
+        return [{"id": doc["id"]} for doc in self.docs.values() if doc.get("seq") in (None, 0)]
+
+    def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            doc = self.docs[request._filter["id"]]
+            if doc.get("seq") not in (None, 0):
+                continue
+            for key, value in request._doc["$set"].items():
+                if key == "seq":
+                    doc["seq"] = value
+                else:
+                    for msg in doc["messages"]:
+                        if msg.get("seq") in (None, 0):
+                            msg["seq"] = value
+
+
+def test_records_from_before_change_tracking_reach_a_full_resync(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    _, cursor = _drain(0)
+    tasks = LegacyCollection(
+        [{"id": "legacy-task", "title": "Old", "details": "", "priority": "low", "status": "pending"}]
+    )
+    conversations = LegacyCollection(
+        [
+            {
+                "id": "legacy-chat",
+                "title": "Old chat",
+                "messages": [{"role": "user", "content": "hello", "timestamp": "2024-01-01T00:00:00Z"}],
+            }
+        ]
+    )
+    monkeypatch.setattr(task_store, "_get_collection", lambda: tasks)
+    monkeypatch.setattr(conversation_store, "_get_collection", lambda: conversations)
+    assert task_store.backfill_task_seqs() == 1
+    assert conversation_store.backfill_conversation_seqs() == 1
+    assert task_store.backfill_task_seqs() == 0
+
+    task_doc, conversation_doc = tasks.docs["legacy-task"], conversations.docs["legacy-chat"]
+    assert cursor < task_doc["seq"] < conversation_doc["seq"] <= sync_store.current_seq()
+    assert conversation_doc["messages"][0]["seq"] == conversation_doc["seq"]
+
+    # Read the stamped documents back through the in-memory store.
+    _memory_stores(monkeypatch)
+    monkeypatch.setitem(task_store._TASKS, "legacy-task", task_store.TaskItem(**task_doc))
+    [conversation] = conversation_store._from_docs([conversation_doc])
+    monkeypatch.setitem(conversation_store._CACHE, "legacy-chat", conversation)
+    for since in (0, cursor):
+        changes, _ = _drain(since)
+        ids = {change["data"]["id"] for change in changes if change["op"] == "upsert"}
+        assert {"legacy-task", "legacy-chat"} <= ids
+
+
+def test_changes_endpoint_validates_limit() -> None:
+    response = client.get("/v1/sync/changes", params={"limit": 0})
+    if response.status_code == 401:
+        return
+    assert response.status_code == 422
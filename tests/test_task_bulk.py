@@ -0,0 +1,103 @@
+from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError
+
+from backend.audit import store as audit_store
+from backend.main import app
+from backend.sync import store as sync_store
+from backend.tasks import store as task_store
+
+
+client = TestClient(app)
+
+
+def _memory_stores(monkeypatch) -> None:
+    monkeypatch.setattr(task_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(audit_store, "_get_collection", lambda: None)
+    monkeypatch.setattr(sync_store, "_get_db", lambda: None)
+
+
+def test_store_bulk_operations_report_per_item(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    created = task_store.create_tasks([("Bulk a", "", "low"), ("Bulk b", "x", "high")])
+    assert [task.title for task in created] == ["Bulk a", "Bulk b"]
+    assert created[0].seq < created[1].seq
+
+    updated = task_store.update_statuses([(created[0].id, "done"), ("missing", "done")])
+    assert updated[0].status == "done"
+    assert updated[1] is None
+
+    deleted = task_store.delete_tasks([created[1].id, "missing"])
+    assert deleted == {created[1].id: True, "missing": False}
+    assert created[1].id not in task_store._TASKS
+    assert any(stone.id == created[1].id for stone in sync_store.tombstones_between(0, sync_store.current_seq(), 10_000))
+
+
+def test_bulk_endpoint_writes_one_audit_event(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    existing = task_store.create_task("Bulk existing", "", "medium")
+    before = len(audit_store.list_events(limit=10_000, event_type="task.bulk"))
+    response = client.post(
+        "/v1/tasks/bulk",
+        json={
+            "create": [{"title": f"Bulk new {n}"} for n in range(3)],
+            "update": [{"id": existing.id, "status": "in_progress"}, {"id": "nope", "status": "done"}],
+            "delete": ["nope"],
+        },
+    )
+    if response.status_code == 401:
+        return
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["created"]) == 3
+    assert [result["updated"] for result in body["updated"]] == [True, False]
+    assert body["updated"][0]["task"]["status"] == "in_progress"
+    assert body["deleted"] == [{"task_id": "nope", "deleted": False}]
+
+    events = audit_store.list_events(limit=10_000, event_type="task.bulk")
+    assert len(events) == before + 1
+    assert events[0].meta == {"created": 3, "updated": 1, "deleted": 0, "not_found": 2}
+
+
+class PartlyFailingTasks:
+    """A tasks collection whose bulk writes fail on the given positions."""
+
+    def __init__(self, failing) -> None:
+        self.failing = set(failing)
+        self.docs = {}
+
+    def _errors(self):
+        return [{"index": index, "code": 11000, "errmsg": "duplicate key"} for index in sorted(self.failing)]
+
+    def insert_many(self, docs, ordered=True):
+        for index, doc in enumerate(docs):
+            if index not in self.failing:
+                self.docs[doc["id"]] = dict(doc)
+        raise BulkWriteError({"writeErrors": self._errors(), "nInserted": len(docs) - len(self.failing)})
+
+    def bulk_write(self, requests, ordered=True):
+        for index, request in enumerate(requests):
+            if index in self.failing:
+                raise BulkWriteError({"writeErrors": self._errors()[:1], "nModified": index})
+            doc = self.docs.get(request._filter["id"])
+            if doc is not None:
+                doc.update(request._doc["$set"])
+
+    def find(self, filter, projection=None):
+        return [dict(self.docs[task_id]) for task_id in filter["id"]["$in"] if task_id in self.docs]
+
+
+def test_partial_bulk_failures_report_what_landed(monkeypatch) -> None:
+    _memory_stores(monkeypatch)
+    collection = PartlyFailingTasks(failing={1})
+    monkeypatch.setattr(task_store, "_get_collection", lambda: collection)
+    created = task_store.create_tasks([(f"Partial {name}", "", "low") for name in "abc"])
+    assert [task.title for task in created] == ["Partial a", "Partial c"]
+    assert sorted(doc["title"] for doc in collection.docs.values()) == ["Partial a", "Partial c"]
+    assert not any(task.title.startswith("Partial") for task in task_store._TASKS.values())
+
+    updated = task_store.update_statuses(
+        [(created[0].id, "done"), (created[1].id, "done"), (created[1].id, "in_progress")]
+    )
+    assert updated[0].status == "done"
+    assert updated[1:] == [None, None]
+    assert collection.docs[created[1].id]["status"] == "pending"